@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DirectionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'direction'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,86 @@
+"""Database-driven CTA buttons for pin details, cached per pin."""
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import CTAButton
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def cache_key(category, pin_id):
+    return f"cta-buttons:{category}:{pin_id}"
+
+
+def _group(buttons):
+    """Group buttons (already in ranking order) by their category."""
+    groups = []
+    for button in buttons:
+        if not groups or groups[-1]['id'] != button.category_id:
+            groups.append({
+                'id': button.category_id,
+                'name': button.category.name,
+                'icon': button.category.icon,
+                'buttons': [],
+            })
+        groups[-1]['buttons'].append({
+            'id': button.id,
+            'text': button.text,
+            'url': button.url,
+            'color': button.btncolor,
+            'size': button.btn_size,
+        })
+    return groups
+
+
+def buttons_for_pins(pin_keys):
+    """
+    Return {(category, pin_id): groups} for many pins.
+
+    Cached pins cost nothing; all the others are loaded together with a
+    single query over the (pin_category, pin_id) index.
+    """
+    keys = {cache_key(category, pin_id): (category, pin_id) for category, pin_id in pin_keys}
+    cached = cache.get_many(keys)
+    result = {keys[key]: groups for key, groups in cached.items()}
+
+    missing = defaultdict(list)
+    for key, (category, pin_id) in keys.items():
+        if key not in cached:
+            missing[category].append(pin_id)
+    if not missing:
+        return result
+
+    condition = Q()
+    for category, pin_ids in missing.items():
+        condition |= Q(pin_category=category, pin_id__in=pin_ids)
+
+    buttons = defaultdict(list)
+    rows = (
+        CTAButton.objects
+        .filter(condition, published=True)
+        .select_related('category')
+        .order_by('pin_category', 'pin_id', 'cat_ranking', 'category_id', 'btn_ranking')
+    )
+    for button in rows:
+        buttons[(button.pin_category, button.pin_id)].append(button)
+
+    loaded = {
+        (category, pin_id): _group(buttons[(category, pin_id)])
+        for category, pin_ids in missing.items()
+        for pin_id in pin_ids
+    }
+    cache.set_many({cache_key(*pin_key): groups for pin_key, groups in loaded.items()}, CACHE_TIMEOUT)
+    result.update(loaded)
+    return result
+
+
+def buttons_for_pin(category, pin_id):
+    """Return the published CTA buttons of a pin grouped by category, in ranking order."""
+    return buttons_for_pins([(category, pin_id)])[(category, pin_id)]
+
+
+def invalidate(*pin_keys):
+    """Drop the cached buttons of the given (category, pin_id) pairs."""
+    cache.delete_many([cache_key(category, pin_id) for category, pin_id in pin_keys if pin_id is not None])
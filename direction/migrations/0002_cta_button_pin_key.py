@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:37
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+# CTAButton pin foreign keys in declaration order, with their category key.
+PIN_FIELDS = [
+    ('mainattraction', 'main-attractions'),
+    ('thingstodo', 'things-to-do'),
+    ('placestovisit', 'places-to-visit'),
+    ('placestoeat', 'places-to-eat'),
+    ('market', 'markets'),
+    ('countryinfo', 'country-info'),
+    ('destinationguide', 'destination-guides'),
+    ('placeinformation', 'place-information'),
+    ('travelhacks', 'travel-hacks'),
+    ('festival', 'festivals'),
+    ('famousphotopoint', 'famous-photo-points'),
+    ('activites', 'activities'),
+    ('hotel', 'hotels'),
+]
+
+
+def fill_pin_keys(apps, schema_editor):
+    CTAButton = apps.get_model('direction', 'CTAButton')
+    for field, category in PIN_FIELDS:
+        CTAButton.objects.filter(pin_category='', **{f'{field}__isnull': False}).update(
+            pin_category=category,
+            pin_id=F(f'{field}_id')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('direction', '0001_initial'),
+        ('pins', '0010_pin_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ctabutton',
+            name='pin_category',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='ctabutton',
+            name='pin_id',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ctabutton',
+            index=models.Index(fields=['pin_category', 'pin_id', 'published', 'cat_ranking', 'btn_ranking'], name='cta_button_pin_idx'),
+        ),
+        migrations.RunPython(fill_pin_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('direction', '0002_cta_button_pin_key'),
+        ('pins', '0018_region_pin_counts'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ctabutton',
+            name='cta_button_pin_idx',
+        ),
+        migrations.AddIndex(
+            model_name='ctabutton',
+            index=models.Index(condition=models.Q(('published', True)), fields=['pin_category', 'pin_id', 'cat_ranking', 'category', 'btn_ranking'], name='cta_button_pin_idx'),
+        ),
+    ]
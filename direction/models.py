@@ -1,5 +1,6 @@
 from django.db import models
-from pins.models import MainAttraction, ThingsToDo,PlacesToVisit,PlacesToEat,Market,CountryInfo,DestinationGuide,PlaceInformation,TravelHacks,Festivals,FamousPhotoPoint,Activities,Hotel
+from pins.models import MainAttraction, ThingsToDo,PlacesToVisit,PlacesToEat,Market,CountryInfo,DestinationGuide,PlaceInformation,TravelHacks,Festivals,FamousPhotoPoint,Activities,Hotel,CATEGORY_BY_MODEL
+from pins.versioning import pin_link_fields
  
 class CTACategory(models.Model):
     """Model for call-to-action button categories."""
@@ -117,10 +118,35 @@ class CTAButton(models.Model):
     )
  
     published = models.BooleanField(default=True)
+
+    # Denormalized from whichever pin foreign key is set, so buttons of every
+    # pin type are found through one index instead of 13.
+    pin_category = models.CharField(max_length=32, blank=True, editable=False)
+    pin_id = models.BigIntegerField(null=True, blank=True, editable=False)
  
     class Meta:
         db_table = "cta_buttons"
         ordering = ["cat_ranking", "btn_ranking"]
+        indexes = [
+            # Same column order as the ORDER BY of direction.buttons, so a pin's
+            # published buttons are read in index order without a sort
+            models.Index(
+                fields=["pin_category", "pin_id", "cat_ranking", "category", "btn_ranking"],
+                name="cta_button_pin_idx",
+                condition=models.Q(published=True)
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.pin_category, self.pin_id = "", None
+        for field in pin_link_fields(CTAButton):
+            pin_id = getattr(self, field.attname)
+            if pin_id is not None:
+                self.pin_category = CATEGORY_BY_MODEL[field.related_model]
+                self.pin_id = pin_id
+                break
+
+        super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.text}"
\ No newline at end of file
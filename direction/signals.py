@@ -0,0 +1,59 @@
+"""Keep pin versions and cached CTA buttons current when buttons change."""
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+
+from pins import versioning
+from pins.models import PIN_CATEGORIES, CATEGORY_BY_MODEL
+from . import buttons
+from .models import CTAButton, CTACategory
+
+
+def button_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # versioning.remember_links loaded the pins the stored row pointed at
+    previous = [(CATEGORY_BY_MODEL[model], pk) for model, pk in getattr(instance, '_previous_pin_links', [])]
+    buttons.invalidate((instance.pin_category, instance.pin_id), *previous)
+
+
+def button_deleted(sender, instance, **kwargs):
+    buttons.invalidate((instance.pin_category, instance.pin_id))
+
+
+def _category_pin_keys(category):
+    return set(
+        CTAButton.objects
+        .filter(category=category, pin_id__isnull=False)
+        .order_by()
+        .values_list('pin_category', 'pin_id')
+    )
+
+
+def _refresh_pins(pin_keys):
+    buttons.invalidate(*pin_keys)
+    versioning.touch_links((PIN_CATEGORIES[category], pin_id) for category, pin_id in pin_keys)
+
+
+def category_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_pins(_category_pin_keys(instance))
+
+
+def remember_category_pins(sender, instance, **kwargs):
+    """Collect the pins showing a category before its buttons are cascaded away."""
+    instance._pin_keys = _category_pin_keys(instance)
+
+
+def category_deleted(sender, instance, **kwargs):
+    _refresh_pins(getattr(instance, '_pin_keys', set()))
+
+
+pre_save.connect(versioning.remember_links, sender=CTAButton)
+post_save.connect(versioning.related_saved, sender=CTAButton)
+post_delete.connect(versioning.related_deleted, sender=CTAButton)
+
+post_save.connect(button_saved, sender=CTAButton)
+post_delete.connect(button_deleted, sender=CTAButton)
+post_save.connect(category_changed, sender=CTACategory)
+pre_delete.connect(remember_category_pins, sender=CTACategory)
+post_delete.connect(category_deleted, sender=CTACategory)
@@ -1,3 +1,52 @@
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from location.models import Country, State, City
+from pins.models import MainAttraction
+from .buttons import buttons_for_pin
+from .models import CTAButton, CTACategory
+
+
+class ButtonCacheTests(TestCase):
+    """Cached CTA buttons follow button moves and category deletes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        square = Polygon(((77, 28), (78, 28), (78, 29), (77, 29), (77, 28)), srid=4326)
+        country = Country.objects.create(name="India", geometry=square)
+        state = State.objects.create(country=country, name="Delhi", geometry=MultiPolygon(square))
+        city = City.objects.create(state=state, name="New Delhi", geometry=square)
+        cls.pins = [
+            MainAttraction.objects.create(name=name, city=city, pin=Point(77.2, 28.6, srid=4326), published=True)
+            for name in ("Red Fort", "India Gate")
+        ]
+        cls.tickets = CTACategory.objects.create(name="Tickets")
+        cls.button = CTAButton.objects.create(
+            text="Buy", url="https://example.com", mainattraction=cls.pins[0], category=cls.tickets
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_stale_instance_invalidates_stored_pin(self):
+        first, second = self.pins
+        stale = CTAButton.objects.get(pk=self.button.pk)
+        self.button.mainattraction = second
+        self.button.save()
+        self.assertEqual(len(buttons_for_pin("main-attractions", second.pk)), 1)
+
+        # The stale instance still points at the first pin; the stored row points at the second
+        stale.mainattraction = first
+        stale.save()
+
+        self.assertEqual(buttons_for_pin("main-attractions", second.pk), [])
+        self.assertEqual(len(buttons_for_pin("main-attractions", first.pk)), 1)
+
+    def test_category_delete_invalidates(self):
+        pin = self.pins[0]
+        self.assertEqual(len(buttons_for_pin("main-attractions", pin.pk)), 1)
+
+        self.tickets.delete()
+
+        self.assertEqual(buttons_for_pin("main-attractions", pin.pk), [])
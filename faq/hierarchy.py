@@ -0,0 +1,202 @@
+"""
+Hierarchical FAQ resolution.
+
+A node (a pin of any category, a special zone, a city, a state or a
+country) gets its own FAQs followed by those inherited from its special
+zones, city, state and country. The ancestors of a node are looked up
+first (one query), then the whole chain is fetched by a single query.
+
+Chains are cached under a key made of the node's ancestors and of a
+generation counter per node. Saving or deleting an FAQ bumps the counter
+of the nodes it is attached to, which retires the cached chains of
+everything below them without enumerating it; moving a pin, a city or a
+state, or reshaping a zone, changes the ancestors and so the key.
+"""
+import hashlib
+import time
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from location.models import Country, State, City, Specialzone
+from pins.models import PIN_CATEGORIES, CATEGORY_BY_MODEL, PinRegistry, PinZoneMembership
+from pins.versioning import pin_link_fields
+from .models import FAQ
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+PLACE_MODELS = {
+    'country': Country,
+    'state': State,
+    'city': City,
+    'specialzone': Specialzone,
+}
+
+# Most specific first; the level of an FAQ is the first one it matches.
+LEVELS = ['pin', 'specialzone', 'city', 'state', 'country']
+
+# FAQ foreign key name for each place kind and pin category.
+PLACE_FIELDS = {'country': 'country', 'state': 'state', 'city': 'city', 'specialzone': 'specialZone'}
+PIN_FIELDS = {CATEGORY_BY_MODEL[field.related_model]: field.name for field in pin_link_fields(FAQ)}
+
+FAQ_FIELDS = ['id', 'question', 'answer', 'date']
+
+
+def node_model(kind):
+    """Model of a node kind (pin category or place kind), or None."""
+    return PIN_CATEGORIES.get(kind) or PLACE_MODELS.get(kind)
+
+
+def generation_key(kind, node_id):
+    return f"faq-generation:{kind}:{node_id}"
+
+
+def _generations(nodes):
+    """Return {(kind, id): generation} of some nodes."""
+    keys = {node: generation_key(*node) for node in nodes}
+    found = cache.get_many(keys.values())
+    for node, key in keys.items():
+        if key not in found:
+            # Start from a fresh value, so chains cached under an evicted counter never match again
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return {node: found[key] for node, key in keys.items()}
+
+
+def _ancestors(kind, node_id):
+    """
+    Return [(level, [ids])] of a node and of its ancestors, most specific
+    first, or None if the node does not exist.
+    """
+    if kind in PIN_CATEGORIES:
+        zone_ids = (
+            PinZoneMembership.objects
+            .filter(category=kind, pin_id=node_id)
+            .order_by('zone_id')
+            .values('zone_id')
+        )
+        row = (
+            PinRegistry.objects
+            .filter(category=kind, pin_id=node_id)
+            .annotate(zone_ids=ArraySubquery(zone_ids))
+            .values_list('city_id', 'state_id', 'country_id', 'zone_ids')
+            .first()
+        )
+        if row is None:
+            return None
+        city_id, state_id, country_id, zone_ids = row
+        chain = [('pin', [node_id]), ('specialzone', zone_ids), ('city', [city_id]), ('state', [state_id]), ('country', [country_id])]
+    elif kind == 'city':
+        row = City.objects.filter(pk=node_id).values_list('state_id', 'state__country_id').first()
+        if row is None:
+            return None
+        chain = [('city', [node_id]), ('state', [row[0]]), ('country', [row[1]])]
+    elif kind == 'state':
+        row = State.objects.filter(pk=node_id).values_list('country_id', flat=True)[:1]
+        if not row:
+            return None
+        chain = [('state', [node_id]), ('country', list(row))]
+    else:
+        if not PLACE_MODELS[kind].objects.filter(pk=node_id).exists():
+            return None
+        chain = [(kind, [node_id])]
+    return [(level, [pk for pk in ids if pk is not None]) for level, ids in chain]
+
+
+def _nodes(kind, chain):
+    """The (kind, id) nodes of an ancestor chain."""
+    return [(kind if level == 'pin' else level, pk) for level, ids in chain for pk in ids]
+
+
+def cache_key(kind, node_id, chain):
+    generations = _generations(_nodes(kind, chain))
+    digest = hashlib.sha1(repr(sorted(generations.items())).encode()).hexdigest()
+    return f"faq-chain:{kind}:{node_id}:{digest}"
+
+
+def _field(kind, level):
+    return PIN_FIELDS[kind] if level == 'pin' else PLACE_FIELDS[level]
+
+
+def dedupe(rows):
+    """
+    Keep the first row of every question (rows come most specific level
+    first), comparing questions case- and whitespace-insensitively.
+    """
+    faqs = []
+    seen = set()
+    for row in rows:
+        question = ' '.join(row['question'].casefold().split())
+        if question in seen:
+            continue
+        seen.add(question)
+        faqs.append(row)
+    return faqs
+
+
+def _load(kind, chain):
+    conditions = [
+        (level, Q(**{f'{_field(kind, level)}__in': ids}))
+        for level, ids in chain if ids
+    ]
+    match = Q()
+    for _, condition in conditions:
+        match |= condition
+
+    rows = (
+        FAQ.objects
+        .filter(match)
+        .annotate(level=Case(
+            *[When(condition, then=Value(LEVELS.index(level))) for level, condition in conditions],
+            output_field=IntegerField()
+        ))
+        .order_by('level', '-date', 'id')
+        .values(*FAQ_FIELDS, 'level')
+    )
+
+    # The same question asked at several levels is only answered by the most specific one
+    faqs = dedupe(rows)
+    for row in faqs:
+        row['level'] = LEVELS[row['level']]
+    return faqs
+
+
+def resolve(kind, node_id):
+    """
+    Return the ordered, deduplicated FAQs of a node and its ancestors, or
+    None if the node does not exist.
+    """
+    chain = _ancestors(kind, node_id)
+    if chain is None:
+        return None
+    key = cache_key(kind, node_id, chain)
+    faqs = cache.get(key)
+    if faqs is None:
+        faqs = _load(kind, chain)
+        cache.set(key, faqs, CACHE_TIMEOUT)
+    return faqs
+
+
+def faq_nodes(values):
+    """Yield the (kind, id) nodes an FAQ is attached to, from attname -> value."""
+    for kind, name in [*PLACE_FIELDS.items(), *PIN_FIELDS.items()]:
+        node_id = values.get(f'{name}_id')
+        if node_id is not None:
+            yield kind, node_id
+
+
+def invalidate(nodes):
+    """
+    Retire the cached chains of the given nodes and of everything below
+    them, by bumping the nodes' generations once the transaction commits.
+    """
+    def advance():
+        for node in set(nodes):
+            key = generation_key(*node)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+    transaction.on_commit(advance)
@@ -0,0 +1,56 @@
+"""Keep pin versions and counts, city bundles and cached FAQ chains current when FAQs change."""
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from pins import bundles, counters, versioning
+from . import hierarchy
+from .models import FAQ
+
+
+def remember_nodes(sender, instance, raw=False, **kwargs):
+    """Remember the nodes the stored FAQ was attached to, in case the save moves it."""
+    instance._previous_faq_nodes = []
+    if raw or not instance.pk:
+        return
+    attnames = [field.attname for field in FAQ._meta.concrete_fields if field.is_relation]
+    previous = FAQ.objects.filter(pk=instance.pk).values(*attnames).first()
+    if previous:
+        instance._previous_faq_nodes = list(hierarchy.faq_nodes(previous))
+
+
+def faq_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    hierarchy.invalidate([
+        *hierarchy.faq_nodes(instance.__dict__),
+        *getattr(instance, '_previous_faq_nodes', [])
+    ])
+
+
+def faq_deleted(sender, instance, **kwargs):
+    hierarchy.invalidate(hierarchy.faq_nodes(instance.__dict__))
+
+
+def faq_counts_changed(sender, instance, raw=False, **kwargs):
+    """Recount the FAQs of the pins the FAQ is (or was) attached to."""
+    if raw:
+        return
+    counters.recount([
+        *versioning.linked_pins(FAQ, instance.__dict__),
+        *getattr(instance, '_previous_pin_links', [])
+    ])
+
+
+pre_save.connect(versioning.remember_links, sender=FAQ)
+post_save.connect(versioning.related_saved, sender=FAQ)
+post_delete.connect(versioning.related_deleted, sender=FAQ)
+
+pre_save.connect(bundles.remember_city, sender=FAQ)
+post_save.connect(bundles.city_related_saved, sender=FAQ)
+post_delete.connect(bundles.city_related_deleted, sender=FAQ)
+
+pre_save.connect(remember_nodes, sender=FAQ)
+post_save.connect(faq_saved, sender=FAQ)
+post_delete.connect(faq_deleted, sender=FAQ)
+
+post_save.connect(faq_counts_changed, sender=FAQ)
+post_delete.connect(faq_counts_changed, sender=FAQ)
@@ -1,3 +1,72 @@
-from django.test import TestCase
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from location.models import Country, State, City
+from pins.models import MainAttraction
+from .hierarchy import dedupe
+from .models import FAQ
+
+
+class DedupeTests(SimpleTestCase):
+    """A question repeated down the chain is kept once, from its first (most specific) row."""
+
+    def test_first_row_wins(self):
+        rows = [
+            {"id": 1, "question": "Is it open on Mondays?"},
+            {"id": 2, "question": "Entry fee?"},
+            {"id": 3, "question": "  is it OPEN on   mondays? "},
+        ]
+        self.assertEqual([row["id"] for row in dedupe(rows)], [1, 2])
+
+
+class FAQChainTests(TestCase):
+    """A pin's FAQs come first, then its city's, state's and country's, newest first within a level."""
+
+    @classmethod
+    def setUpTestData(cls):
+        square = Polygon(((77, 28), (78, 28), (78, 29), (77, 29), (77, 28)), srid=4326)
+        cls.country = Country.objects.create(name="India", geometry=square)
+        cls.state = State.objects.create(country=cls.country, name="Delhi", geometry=MultiPolygon(square))
+        cls.city = City.objects.create(state=cls.state, name="New Delhi", geometry=square)
+        cls.pin = MainAttraction.objects.create(
+            name="Red Fort",
+            city=cls.city,
+            pin=Point(77.24, 28.65, srid=4326),
+            published=True
+        )
+
+        FAQ.objects.create(question="Do I need a visa?", answer="Usually", country=cls.country)
+        FAQ.objects.create(question="Best season?", answer="Winter", state=cls.state)
+        FAQ.objects.create(question="Is it open on Mondays?", answer="No", city=cls.city)
+        FAQ.objects.create(question="Is it open on Mondays?", answer="Closed", mainattraction=cls.pin)
+        FAQ.objects.create(question="Entry fee?", answer="Yes", mainattraction=cls.pin)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_chain_order_and_dedup(self):
+        url = reverse("faqs", args=["main-attractions", self.pin.pk])
+        faqs = self.client.get(url).json()["faqs"]
+
+        self.assertEqual(
+            [(faq["level"], faq["question"]) for faq in faqs],
+            [
+                ("pin", "Entry fee?"),
+                ("pin", "Is it open on Mondays?"),
+                ("state", "Best season?"),
+                ("country", "Do I need a visa?"),
+            ]
+        )
+        self.assertEqual(faqs[1]["answer"], "Closed")
+
+    def test_faq_change_reaches_cached_chains(self):
+        url = reverse("faqs", args=["main-attractions", self.pin.pk])
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQ.objects.create(question="Is there parking?", answer="Some", country=self.country)
+
+        questions = [faq["question"] for faq in self.client.get(url).json()["faqs"]]
+        self.assertIn("Is there parking?", questions)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import get_faqs
+
+urlpatterns = [
+    path('api/faqs/<str:kind>/<int:node_id>/', get_faqs, name='faqs'),
+]
@@ -1,3 +1,26 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
 
-# Create your views here.
+from . import hierarchy
+
+
+@api_view(['GET'])
+def get_faqs(request, kind, node_id):
+    """Get the FAQs of a pin or place followed by those inherited from its ancestors.
+
+    ``kind`` is a pin category (e.g. ``main-attractions``) or one of
+    ``country``, ``state``, ``city`` and ``specialzone``.
+    """
+    if hierarchy.node_model(kind) is None:
+        return Response({'error': 'Invalid node type'}, status=400)
+
+    faqs = hierarchy.resolve(kind, node_id)
+    if faqs is None:
+        return Response({'error': 'Not found'}, status=404)
+
+    return Response({
+        'kind': kind,
+        'id': node_id,
+        'faqs': faqs,
+        'total_count': len(faqs)
+    })
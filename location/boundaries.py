@@ -0,0 +1,70 @@
+"""
+Subdivided copies of the boundary geometries.
+
+Country and state polygons can have hundreds of thousands of vertices, so
+containment checks run against the boundary_pieces table instead: every
+boundary is cut with ST_Subdivide into pieces of at most MAX_VERTICES
+vertices, each with its own entry in the GiST index.
+"""
+from django.db import connection
+from django.db.models import Exists
+
+from .models import Country, State, City, Specialzone, BoundaryPiece
+
+MAX_VERTICES = 256
+
+KIND_MODELS = {
+    'country': Country,
+    'state': State,
+    'city': City,
+    'specialzone': Specialzone,
+}
+
+KIND_BY_MODEL = {model: kind for kind, model in KIND_MODELS.items()}
+
+
+def _insert_pieces(kind, where='', params=()):
+    source = KIND_MODELS[kind]._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {BoundaryPiece._meta.db_table} (kind, owner_id, geometry) '
+            f'SELECT %s, id, ST_Subdivide(geometry, %s) FROM {source} {where}',
+            [kind, MAX_VERTICES, *params]
+        )
+
+
+def subdivide(instance):
+    """Regenerate the pieces of a single boundary."""
+    kind = KIND_BY_MODEL[instance._meta.concrete_model]
+    BoundaryPiece.objects.filter(kind=kind, owner_id=instance.pk).delete()
+    _insert_pieces(kind, 'WHERE id = %s', [instance.pk])
+
+
+def clear(instance):
+    """Remove the pieces of a deleted boundary."""
+    kind = KIND_BY_MODEL[instance._meta.concrete_model]
+    BoundaryPiece.objects.filter(kind=kind, owner_id=instance.pk).delete()
+
+
+def rebuild(kind):
+    """Regenerate the pieces of every boundary of ``kind``."""
+    BoundaryPiece.objects.filter(kind=kind).delete()
+    _insert_pieces(kind)
+
+
+def intersects(kind, owner_id, geometry):
+    """
+    Exists() condition: ``geometry`` (a value or an expression such as
+    OuterRef) intersects one of the pieces of a single boundary.
+    """
+    return Exists(BoundaryPiece.objects.filter(kind=kind, owner_id=owner_id, geometry__intersects=geometry))
+
+
+def containing(kind, geometry):
+    """Return the ids of the boundaries of ``kind`` intersecting ``geometry``, checking only small pieces."""
+    return (
+        BoundaryPiece.objects
+        .filter(kind=kind, geometry__intersects=geometry)
+        .values_list('owner_id', flat=True)
+        .distinct()
+    )
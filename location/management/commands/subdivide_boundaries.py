@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from location.models import BoundaryPiece
+from location import boundaries
+
+
+class Command(BaseCommand):
+    help = 'Regenerate the subdivided boundary pieces used for fast containment checks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            choices=list(boundaries.KIND_MODELS),
+            action='append',
+            help='Only rebuild this boundary kind (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        kinds = options['kind'] or list(boundaries.KIND_MODELS)
+
+        for kind in kinds:
+            with transaction.atomic():
+                boundaries.rebuild(kind)
+            count = BoundaryPiece.objects.filter(kind=kind).count()
+            self.stdout.write(f'{kind}: {count} pieces')
+
+        self.stdout.write(self.style.SUCCESS('Boundaries subdivided!'))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:32
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+MAX_VERTICES = 256
+
+
+def subdivide_existing(apps, schema_editor):
+    BoundaryPiece = apps.get_model('location', 'BoundaryPiece')
+    for kind, model_name in [
+        ('country', 'Country'), ('state', 'State'), ('city', 'City'), ('specialzone', 'Specialzone'),
+    ]:
+        source = apps.get_model('location', model_name)._meta.db_table
+        schema_editor.execute(
+            f'INSERT INTO {BoundaryPiece._meta.db_table} (kind, owner_id, geometry) '
+            f'SELECT %s, id, ST_Subdivide(geometry, %s) FROM {source}',
+            params=[kind, MAX_VERTICES]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoundaryPiece',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('country', 'Country'), ('state', 'State'), ('city', 'City'), ('specialzone', 'Special zone')], max_length=16)),
+                ('owner_id', models.BigIntegerField()),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(srid=4326)),
+            ],
+            options={
+                'db_table': 'boundary_pieces',
+                'indexes': [models.Index(fields=['kind', 'owner_id'], name='boundary_piece_owner_idx')],
+            },
+        ),
+        migrations.RunPython(subdivide_existing, migrations.RunPython.noop),
+    ]
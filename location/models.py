@@ -81,4 +81,26 @@ class Specialzone(models.Model):
         ordering = ["name"]
  
     def __str__(self):
-        return self.name    
\ No newline at end of file
+        return self.name
+
+class BoundaryPiece(models.Model):
+    """Small piece of a subdivided country/state/city/special zone geometry for fast containment checks."""
+    KIND_CHOICES = [
+        ("country", "Country"),
+        ("state", "State"),
+        ("city", "City"),
+        ("specialzone", "Special zone"),
+    ]
+
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    owner_id = models.BigIntegerField()
+    geometry = models.GeometryField(srid=4326)
+
+    class Meta:
+        db_table = "boundary_pieces"
+        indexes = [
+            models.Index(fields=["kind", "owner_id"], name="boundary_piece_owner_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.owner_id}"
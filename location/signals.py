@@ -0,0 +1,38 @@
+"""Keep the subdivided boundary pieces in sync with their source geometries."""
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from . import boundaries
+
+
+def remember_geometry(sender, instance, raw=False, **kwargs):
+    """Load the stored geometry so post_save only subdivides when it changed."""
+    instance._stored_geometry = None
+    if raw or not instance.pk:
+        return
+    instance._stored_geometry = (
+        sender._default_manager
+        .filter(pk=instance.pk)
+        .values_list('geometry', flat=True)
+        .first()
+    )
+
+
+def boundary_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    # Renames and is_active toggles keep their pieces
+    stored = getattr(instance, '_stored_geometry', None)
+    if created or stored is None or stored != instance.geometry:
+        boundaries.subdivide(instance)
+
+
+def boundary_deleted(sender, instance, **kwargs):
+    boundaries.clear(instance)
+
+
+# Connected before the pins app's receivers (INSTALLED_APPS order), so
+# anything reacting to a boundary change there already sees the new pieces.
+for model in boundaries.KIND_MODELS.values():
+    pre_save.connect(remember_geometry, sender=model)
+    post_save.connect(boundary_saved, sender=model)
+    post_delete.connect(boundary_deleted, sender=model)
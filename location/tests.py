@@ -1,3 +1,42 @@
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
 from django.test import TestCase
 
-# Create your tests here.
+from . import boundaries
+from .models import BoundaryPiece, City, Country, State
+
+
+class BoundaryPieceTests(TestCase):
+    """Boundary pieces are regenerated when a geometry changes, and only then."""
+
+    def setUp(self):
+        square = Polygon.from_bbox((77, 28, 78, 29))
+        country = Country.objects.create(name="India", geometry=square)
+        self.state = State.objects.create(country=country, name="Delhi", geometry=MultiPolygon(square))
+
+    def pieces(self, city):
+        return BoundaryPiece.objects.filter(kind="city", owner_id=city.pk)
+
+    def test_pieces_follow_geometry(self):
+        # About 1200 vertices, well over MAX_VERTICES
+        circle = Point(77.5, 28.5, srid=4326).buffer(0.4, quadsegs=300)
+        city = City.objects.create(state=self.state, name="New Delhi", geometry=circle)
+        self.assertGreater(self.pieces(city).count(), 1)
+        self.assertTrue(all(piece.geometry.num_points <= boundaries.MAX_VERTICES + 1 for piece in self.pieces(city)))
+        self.assertEqual(list(boundaries.containing("city", Point(77.5, 28.5, srid=4326))), [city.pk])
+
+        piece_ids = set(self.pieces(city).values_list("pk", flat=True))
+        city.name = "Delhi"
+        city.save()
+        self.assertEqual(set(self.pieces(city).values_list("pk", flat=True)), piece_ids)
+
+        corner = Polygon.from_bbox((77.9, 28.9, 78, 29))
+        corner.srid = 4326
+        city.geometry = corner
+        city.save()
+        self.assertEqual(self.pieces(city).count(), 1)
+        self.assertEqual(list(boundaries.containing("city", Point(77.5, 28.5, srid=4326))), [])
+        self.assertEqual(list(boundaries.containing("city", Point(77.95, 28.95, srid=4326))), [city.pk])
+
+        city_id = city.pk
+        city.delete()
+        self.assertFalse(BoundaryPiece.objects.filter(kind="city", owner_id=city_id).exists())
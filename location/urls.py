@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import get_boundary
+
+urlpatterns = [
+    path('api/boundaries/<str:kind>/<int:boundary_id>/', get_boundary, name='boundary'),
+]
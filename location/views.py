@@ -1,3 +1,57 @@
-from django.shortcuts import render
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
 
-# Create your views here.
+from unfotour import compression
+from unfotour.renderers import FastJSONRenderer
+from .boundaries import KIND_MODELS
+
+# Default number of decimals in boundary coordinates (about 1 m)
+DEFAULT_PRECISION = 5
+MAX_PRECISION = 8
+
+_renderer = FastJSONRenderer()
+
+
+def _boundary_feature(model, kind, boundary_id, precision):
+    """Encode a boundary as a GeoJSON Feature, with the geometry JSON produced by PostGIS."""
+    name, geometry = (
+        model.objects
+        .filter(pk=boundary_id)
+        .annotate(geojson=AsGeoJSON('geometry', precision=precision))
+        .values_list('name', 'geojson')
+        .get()
+    )
+    properties = _renderer.render({'kind': kind, 'name': name})
+    return (
+        b'{"type":"Feature","id":' + str(boundary_id).encode()
+        + b',"properties":' + properties
+        + b',"geometry":' + geometry.encode() + b'}'
+    )
+
+
+@api_view(['GET'])
+def get_boundary(request, kind, boundary_id):
+    """Get the boundary of a country, state, city or special zone as a GeoJSON Feature.
+
+    ``precision`` (0-8) sets the number of coordinate decimals. Features are
+    served from the precompressed cache, keyed by the row's ``updated_at``.
+    """
+    model = KIND_MODELS.get(kind)
+    if model is None:
+        return Response({'error': 'Invalid boundary type'}, status=400)
+
+    precision = request.GET.get('precision', str(DEFAULT_PRECISION))
+    if not precision.isdigit() or int(precision) > MAX_PRECISION:
+        return Response({'error': f'Query parameter precision must be between 0 and {MAX_PRECISION}'}, status=400)
+    precision = int(precision)
+
+    updated_at = model.objects.filter(pk=boundary_id, is_active=True).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return Response({'error': 'Not found'}, status=404)
+
+    entry = compression.cached(
+        f'precompressed:boundary:{kind}:{boundary_id}:{precision}:{updated_at.timestamp()}',
+        lambda: ('application/json', _boundary_feature(model, kind, boundary_id, precision))
+    )
+    return compression.respond(request, entry, 'boundaries')
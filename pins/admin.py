@@ -2,12 +2,15 @@ from django.contrib import admin
 from unfold.admin import ModelAdmin
 from leaflet.admin import LeafletGeoAdmin
 from django.utils.translation import gettext_lazy as _
+from django.urls import reverse
+from django.utils.html import format_html
 from django.contrib.admin import SimpleListFilter
 from taggit.models import TaggedItem
 
 
 
 from pins.models import MainAttraction ,ThingsToDo,PlacesToVisit,PlacesToEat,Market,CountryInfo,DestinationGuide,PlaceInformation,TravelHacks,Festivals, FamousPhotoPoint, Activities, Hotel,HotelCategory
+from pins.models import PIN_CATEGORIES, DuplicatePinCandidate, RegionPinCount
 
 
 class TaggitListFilter(SimpleListFilter):
@@ -21,7 +24,7 @@ class TaggitListFilter(SimpleListFilter):
 
     def queryset(self, request, queryset):
         if self.value():
-            return queryset.filter(tags__name__in=[self.value()])
+            return queryset.filter(tag_names__contains=[self.value()])
 
 
 # =========================================================
@@ -89,6 +92,61 @@ class UnfoldLeafletMixin(ModelAdmin, LeafletGeoAdmin):
 class HotelCategoryAdmin(ModelAdmin):
     search_fields = ("name",)
 
+# =========================================================
+# Duplicate pin report (filled by find_duplicate_pins)
+# =========================================================
+
+def _pin_admin_link(category, pin_id, name):
+    model = PIN_CATEGORIES[category]
+    url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_change", args=[pin_id])
+    return format_html('<a href="{}">{}</a> <small>({})</small>', url, name, category)
+
+
+@admin.register(DuplicatePinCandidate)
+class DuplicatePinCandidateAdmin(ModelAdmin):
+    """
+    Read-only report; rows are replaced on every find_duplicate_pins run
+    """
+
+    list_display = ("pin_a", "pin_b", "distance", "similarity", "detected_at")
+    list_filter = ("category_a", "category_b")
+    search_fields = ("name_a", "name_b")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description=_("pin"), ordering="name_a")
+    def pin_a(self, obj):
+        return _pin_admin_link(obj.category_a, obj.pin_id_a, obj.name_a)
+
+    @admin.display(description=_("possible duplicate"), ordering="name_b")
+    def pin_b(self, obj):
+        return _pin_admin_link(obj.category_b, obj.pin_id_b, obj.name_b)
+
+
+@admin.register(RegionPinCount)
+class RegionPinCountAdmin(ModelAdmin):
+    """
+    Read-only; maintained by signals and refresh_region_pin_counts
+    """
+
+    list_display = ("level", "region_id", "category", "published_count", "pin_count")
+    list_filter = ("level", "category")
+    search_fields = ("=region_id",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 admin.site.register(MainAttraction, UnfoldLeafletMixin)
 admin.site.register(ThingsToDo, UnfoldLeafletMixin)
 admin.site.register(PlacesToVisit, UnfoldLeafletMixin)
@@ -0,0 +1,203 @@
+"""
+Pin counts per country, state and city and category.
+
+``region_pin_counts`` holds one row per (level, region, category) with
+pins. A pin save, publish or delete applies +1/-1 deltas to the cells of
+the pin's new and old regions, in the same transaction. Each cell is
+changed with a single ``UPDATE`` (or ``INSERT ... ON CONFLICT``) adding to
+the stored value, so concurrent saves in the same cell serialize on its
+row lock instead of overwriting each other's totals. ``refresh_all``
+recomputes every cell exactly from the registry without locking readers
+out. It only writes the rows that differ, so it can run while the site is
+live. Regions without pins have no row: a missing count is zero.
+"""
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from .models import PinRegistry, RegionPinCount
+
+# Level -> registry column holding the region of a pin.
+LEVELS = {
+    'country': 'country_id',
+    'state': 'state_id',
+    'city': 'city_id',
+}
+
+UNIQUE_FIELDS = ['level', 'region_id', 'category']
+COUNT_FIELDS = ['pin_count', 'published_count']
+
+TABLE = RegionPinCount._meta.db_table
+
+
+def pin_cells(category, city_id, state_id, country_id):
+    """Return the (level, region_id, category) cells a pin is counted in."""
+    regions = {'city': city_id, 'state': state_id, 'country': country_id}
+    return {
+        (level, region_id, category)
+        for level, region_id in regions.items()
+        if region_id is not None
+    }
+
+
+def pin_deltas(category, before=None, after=None):
+    """
+    Return the {cell: [pins, published]} deltas of a pin going from ``before``
+    to ``after``, each (city_id, state_id, country_id, published) or None.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for regions, sign in ((before, -1), (after, 1)):
+        if regions is None:
+            continue
+        *region_ids, published = regions
+        for cell in pin_cells(category, *region_ids):
+            deltas[cell][0] += sign
+            deltas[cell][1] += sign * bool(published)
+    return deltas
+
+
+def row_deltas(rows, sign, deltas=None):
+    """Add the pins of a PinRegistry queryset to ``deltas`` (``sign`` -1 removes them) and return it."""
+    if deltas is None:
+        deltas = defaultdict(lambda: [0, 0])
+    grouped = (
+        rows.order_by()
+        .values('category', 'city_id', 'state_id', 'country_id')
+        .annotate(pins=Count('pk'), published=Count('pk', filter=Q(published=True)))
+        .values_list('category', 'city_id', 'state_id', 'country_id', 'pins', 'published')
+    )
+    for category, city_id, state_id, country_id, pins, published in grouped:
+        for cell in pin_cells(category, city_id, state_id, country_id):
+            deltas[cell][0] += sign * pins
+            deltas[cell][1] += sign * published
+    return deltas
+
+
+def _counts(level, filters=None):
+    """Return {(region_id, category): (pin_count, published_count)} counted from the registry."""
+    column = LEVELS[level]
+    rows = PinRegistry.objects.exclude(**{column: None})
+    if filters is not None:
+        rows = rows.filter(filters)
+    return {
+        (region_id, category): (pins, published)
+        for region_id, category, pins, published in (
+            rows.order_by()
+            .values(column, 'category')
+            .annotate(pins=Count('pk'), published=Count('pk', filter=Q(published=True)))
+            .values_list(column, 'category', 'pins', 'published')
+        )
+    }
+
+
+def _store(level, counts, stored):
+    """
+    Write the ``counts`` that differ from ``stored`` (both {(region_id, category): counts})
+    and delete the stored cells without pins. Returns (written, deleted).
+    """
+    changed = [
+        RegionPinCount(level=level, region_id=region_id, category=category,
+                       pin_count=pins, published_count=published)
+        for (region_id, category), (pins, published) in counts.items()
+        if stored.get((region_id, category)) != (pins, published)
+    ]
+    if changed:
+        RegionPinCount.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=UNIQUE_FIELDS,
+            update_fields=COUNT_FIELDS
+        )
+
+    emptied = [cell for cell in stored if cell not in counts]
+    if emptied:
+        filters = Q()
+        for region_id, category in emptied:
+            filters |= Q(region_id=region_id, category=category)
+        RegionPinCount.objects.filter(filters, level=level).delete()
+    return len(changed), len(emptied)
+
+
+def _stored(level, filters=None):
+    rows = RegionPinCount.objects.filter(level=level)
+    if filters is not None:
+        rows = rows.filter(filters)
+    return {
+        (region_id, category): (pins, published)
+        for region_id, category, pins, published in
+        rows.values_list('region_id', 'category', *COUNT_FIELDS)
+    }
+
+
+def _cell_filter(cells):
+    filters = Q()
+    for level, region_id, category in cells:
+        filters |= Q(level=level, region_id=region_id, category=category)
+    return filters
+
+
+def apply(deltas):
+    """Add {(level, region_id, category): (pins, published)} deltas to the stored cells."""
+    deltas = {cell: delta for cell, delta in sorted(deltas.items()) if any(delta)}
+    if not deltas:
+        return
+
+    values = ', '.join(['(%s, %s::bigint, %s, %s::integer, %s::integer)'] * len(deltas))
+    params = [value for cell, delta in deltas.items() for value in (*cell, *delta)]
+    with connection.cursor() as cursor:
+        # Existing cells take the delta on their current value (clamped: a drifted cell waits for refresh_all)
+        cursor.execute(
+            f'''
+            UPDATE {TABLE} AS c
+            SET pin_count = GREATEST(c.pin_count + d.pins, 0),
+                published_count = GREATEST(c.published_count + d.published, 0)
+            FROM (VALUES {values}) AS d(level, region_id, category, pins, published)
+            WHERE c.level = d.level AND c.region_id = d.region_id AND c.category = d.category
+            RETURNING c.level, c.region_id, c.category, c.pin_count
+            ''',
+            params
+        )
+        updated = cursor.fetchall()
+
+        # New cells; a concurrent insert of the same cell is added to rather than overwritten
+        found = {(level, region_id, category) for level, region_id, category, _ in updated}
+        created = [
+            (cell, delta) for cell, delta in deltas.items()
+            if cell not in found and delta[0] > 0
+        ]
+        if created:
+            cursor.execute(
+                f'''
+                INSERT INTO {TABLE} AS c (level, region_id, category, pin_count, published_count)
+                VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(created))}
+                ON CONFLICT (level, region_id, category) DO UPDATE
+                SET pin_count = c.pin_count + EXCLUDED.pin_count,
+                    published_count = c.published_count + EXCLUDED.published_count
+                ''',
+                [value for cell, (pins, published) in created for value in (*cell, pins, max(published, 0))]
+            )
+
+    emptied = [(level, region_id, category) for level, region_id, category, pins in updated if pins == 0]
+    if emptied:
+        RegionPinCount.objects.filter(_cell_filter(emptied), pin_count=0).delete()
+
+
+def refresh_all():
+    """Recompute every cell, one level per transaction. Returns {level: (written, deleted)}."""
+    result = {}
+    for level in LEVELS:
+        with transaction.atomic():
+            result[level] = _store(level, _counts(level), _stored(level))
+    return result
+
+
+def region_counts(level, region_id, published=True):
+    """Return {category: count} of a region."""
+    field = 'published_count' if published else 'pin_count'
+    return dict(
+        RegionPinCount.objects
+        .filter(level=level, region_id=region_id)
+        .exclude(**{field: 0})
+        .values_list('category', field)
+    )
@@ -0,0 +1,59 @@
+"""Consistency audit of pins against the polygon of their assigned city."""
+from django.db import connection
+
+from location.models import City
+from location import boundaries
+from .models import PIN_CATEGORIES
+
+
+def city_chunks(chunk_size):
+    """Yield lists of city ids, chunk_size at a time."""
+    ids = list(City.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(ids), chunk_size):
+        yield ids[start:start + chunk_size]
+
+
+def audit_cities(city_ids):
+    """
+    Return the pins of the given cities that lie outside their city polygon.
+
+    Each city geometry is prepared once and reused for every pin table.
+    Runs in worker threads, so the thread's database connection is closed
+    before returning.
+    """
+    try:
+        cities = {
+            pk: (name, geometry.prepared)
+            for pk, name, geometry in City.objects.filter(pk__in=city_ids).values_list('pk', 'name', 'geometry')
+        }
+
+        outside = []
+        for category, model in PIN_CATEGORIES.items():
+            rows = (
+                model.objects
+                .filter(city_id__in=city_ids)
+                .order_by()
+                .values_list('pk', 'name', 'city_id', 'pin')
+                .iterator(chunk_size=2000)
+            )
+            for pk, name, city_id, point in rows:
+                city_name, prepared = cities[city_id]
+                if point is None or not prepared.covers(point):
+                    outside.append({
+                        'category': category,
+                        'pin_id': pk,
+                        'name': name,
+                        'city_id': city_id,
+                        'city_name': city_name,
+                        'longitude': point.x if point else None,
+                        'latitude': point.y if point else None,
+                    })
+        return outside
+    finally:
+        connection.close()
+
+
+def containing_city(point):
+    """Return the id of the single city containing ``point``, or None if there is no clear match."""
+    matches = list(boundaries.containing('city', point)[:2])
+    return matches[0] if len(matches) == 1 else None
@@ -0,0 +1,138 @@
+"""
+Precomputed city landing page bundles.
+
+A bundle holds every published pin of a city across all categories, the
+city's FAQs and its published social posts as one gzip-compressed JSON
+blob. Changes mark the affected bundles stale in their own transaction
+(the generation counter is durable) and rebuild them once it commits; the
+endpoint keeps serving the previous blob in the meantime. A rebuild lost
+to a failure or a recycled worker leaves the bundle stale, and
+``build_city_bundles --stale-only`` (run periodically) catches it up.
+"""
+import gzip
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from faq.models import FAQ
+from location.models import City
+from social.models import SocialPost
+from social.serializers import SocialPostSerializer
+from unfotour.renderers import FastJSONRenderer
+from .models import PIN_CATEGORIES, CityBundle
+from . import listing
+
+logger = logging.getLogger(__name__)
+
+
+def build_payload(city):
+    """Return the bundle payload of a city as a dict."""
+    pins = []
+    for category, model in PIN_CATEGORIES.items():
+        queryset = model.objects.filter(city=city, published=True).order_by('name')
+        serialized = listing.serialize_pins(queryset)
+        for pin in serialized:
+            pin['category'] = category
+        pins.extend(serialized)
+
+    faqs = list(
+        FAQ.objects
+        .filter(city=city)
+        .order_by('-date')
+        .values('id', 'question', 'answer', 'date')
+    )
+
+    posts = (
+        SocialPost.objects
+        .filter(links__target_type='city', links__target_id=city.pk, published=True)
+        .select_related('platform')
+    )
+
+    return {
+        'city': {'id': city.pk, 'name': city.name},
+        'pins': pins,
+        'faqs': faqs,
+        'social_posts': SocialPostSerializer(posts, many=True).data,
+        'total_pins': len(pins),
+    }
+
+
+def build(city_id):
+    """Build and store the bundle of a city. Returns the bundle, or None if the city does not exist."""
+    city = City.objects.defer('geometry').filter(pk=city_id).first()
+    if city is None:
+        return None
+
+    bundle, _ = CityBundle.objects.get_or_create(city=city)
+    generation = bundle.generation
+
+    payload = build_payload(city)
+    payload['built_at'] = timezone.now()
+    data = gzip.compress(FastJSONRenderer().render(payload))
+
+    # Never overwrite a bundle built from newer data by a concurrent build
+    CityBundle.objects.filter(pk=city_id, built_generation__lte=generation).update(
+        data=data,
+        built_generation=generation,
+        built_at=payload['built_at']
+    )
+    return CityBundle.objects.get(pk=city_id)
+
+
+def get(city_id):
+    """
+    Return the bundle of a city, or None if the city does not exist.
+
+    A missing bundle is built inline; a stale one is served as is until
+    its rebuild lands.
+    """
+    bundle = CityBundle.objects.filter(pk=city_id).first()
+    if bundle is None or bundle.built_at is None:
+        return build(city_id)
+    return bundle
+
+
+def mark_stale(city_ids):
+    """Mark the bundles of the given cities stale and rebuild them after commit."""
+    city_ids = {city_id for city_id in city_ids if city_id is not None}
+    if not city_ids:
+        return
+    CityBundle.objects.filter(pk__in=city_ids).update(generation=F('generation') + 1)
+    transaction.on_commit(lambda: rebuild(city_ids))
+
+
+def rebuild(city_ids):
+    """Rebuild the bundles of some cities, logging (not raising) failures: the data change is already committed."""
+    for city_id in sorted(city_ids):
+        try:
+            build(city_id)
+        except Exception:
+            logger.exception('Could not build the bundle of city %s', city_id)
+
+
+# Receivers for rows shown in a city bundle through a city foreign key (FAQ).
+# Each app connects them for its own model.
+
+def remember_city(sender, instance, raw=False, **kwargs):
+    """Remember the stored city of the row, in case the save moves it."""
+    instance._previous_city_id = None
+    if raw or not instance.pk:
+        return
+    instance._previous_city_id = (
+        sender._default_manager
+        .filter(pk=instance.pk)
+        .values_list('city_id', flat=True)
+        .first()
+    )
+
+
+def city_related_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    mark_stale([instance.city_id, getattr(instance, '_previous_city_id', None)])
+
+
+def city_related_deleted(sender, instance, **kwargs):
+    mark_stale([instance.city_id])
@@ -0,0 +1,83 @@
+"""
+Denormalized social post and FAQ counts on pin rows.
+
+Counts are recomputed from their source rows (never incremented) in the
+same transaction as the change that affects them, so a count is always
+exact once committed. ``reconcile`` repairs any drift, e.g. after bulk
+updates that bypass signals, and bumps the versions of the pins it fixes.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from faq.models import FAQ
+from social.models import SocialPostLink
+from .models import PIN_MODELS, CATEGORY_BY_MODEL
+from . import registry, versioning
+from .versioning import pin_link_fields
+
+# FAQ foreign key name for each pin model.
+FAQ_FIELDS = {field.related_model: field.name for field in pin_link_fields(FAQ)}
+
+COUNT_FIELDS = ('social_post_count', 'faq_count')
+
+
+def _count(queryset, group_by):
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_by).annotate(total=Count('*')).values('total'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def social_post_count(model):
+    """Count of the published social posts linked to the outer ``model`` row."""
+    links = SocialPostLink.objects.filter(
+        target_type=CATEGORY_BY_MODEL[model],
+        target_id=OuterRef('pk'),
+        published=True
+    )
+    return _count(links, 'target_id')
+
+
+def faq_count(model):
+    """Count of the FAQs attached to the outer ``model`` row."""
+    field = FAQ_FIELDS[model]
+    return _count(FAQ.objects.filter(**{field: OuterRef('pk')}), field)
+
+
+def recount(links):
+    """Recompute the counts of every pin in an iterable of (pin model, pk) pairs."""
+    grouped = defaultdict(set)
+    for model, pk in links:
+        grouped[model].add(pk)
+    for model, pks in grouped.items():
+        model.objects.filter(pk__in=pks).update(
+            social_post_count=social_post_count(model),
+            faq_count=faq_count(model)
+        )
+        registry.copy_columns(model, COUNT_FIELDS, pks)
+
+
+def reconcile():
+    """
+    Fix every pin whose stored counts differ from its rows, bumping their
+    versions so fragments, ETags and bundles pick the fix up.
+    Returns {model: [fixed pk, ...]}.
+    """
+    fixed = {}
+    for model in PIN_MODELS:
+        posts, faqs = social_post_count(model), faq_count(model)
+        fixed[model] = list(
+            model.objects
+            .exclude(Q(social_post_count=posts) & Q(faq_count=faqs))
+            .values_list('pk', flat=True)
+        )
+        if fixed[model]:
+            model.objects.filter(pk__in=fixed[model]).update(social_post_count=posts, faq_count=faqs)
+            registry.copy_columns(model, COUNT_FIELDS, fixed[model])
+            versioning.touch(model, fixed[model])
+    return fixed
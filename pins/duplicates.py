@@ -0,0 +1,132 @@
+"""
+Spatial duplicate detection across all pin tables.
+
+Points are bucketed into a 3D grid over earth-centred coordinates whose
+cell edge equals the search distance. Two points closer than that distance
+(as a chord, which is never longer than the great-circle distance) always
+fall in the same or adjacent cells, so each cell only has to be compared
+with itself and its forward neighbours instead of every other pin.
+"""
+import math
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import product
+
+from .expressions import Latitude, Longitude
+from .models import PIN_CATEGORIES
+
+EARTH_RADIUS = 6371008.8
+
+# Half of the 26 neighbour offsets, so each pair of cells is visited once.
+FORWARD_OFFSETS = [offset for offset in product((-1, 0, 1), repeat=3) if offset > (0, 0, 0)]
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_name(name):
+    return _NON_WORD.sub(' ', name.casefold()).strip()
+
+
+def name_similarity(a, b):
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def haversine(lon1, lat1, lon2, lat2):
+    """Great-circle distance in meters between two lon/lat points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def grid_cell(lon, lat, cell_size):
+    """Return the 3D grid cell of a lon/lat point for the given cell edge in meters."""
+    phi, lam = math.radians(lat), math.radians(lon)
+    cos_phi = math.cos(phi)
+    return (
+        math.floor(EARTH_RADIUS * cos_phi * math.cos(lam) / cell_size),
+        math.floor(EARTH_RADIUS * cos_phi * math.sin(lam) / cell_size),
+        math.floor(EARTH_RADIUS * math.sin(phi) / cell_size),
+    )
+
+
+def iter_points(published_only=False, chunk_size=5000):
+    """Yield (category, pk, name, lon, lat) for every pin, coordinates extracted in the database."""
+    for category, model in PIN_CATEGORIES.items():
+        queryset = model.objects.order_by()
+        if published_only:
+            queryset = queryset.filter(published=True)
+        rows = (
+            queryset
+            .annotate(lon=Longitude('pin'), lat=Latitude('pin'))
+            .values_list('pk', 'name', 'lon', 'lat')
+            .iterator(chunk_size=chunk_size)
+        )
+        for pk, name, lon, lat in rows:
+            if lon is not None and lat is not None:
+                yield category, pk, name, lon, lat
+
+
+def build_grid(points, cell_size):
+    """Bucket points by grid cell."""
+    grid = defaultdict(list)
+    for category, pk, name, lon, lat in points:
+        grid[grid_cell(lon, lat, cell_size)].append((category, pk, name, normalize_name(name), lon, lat))
+    return grid
+
+
+def split_grid(grid, cells_per_chunk):
+    """
+    Split the grid into work units.
+
+    Each unit holds the cells it owns plus the neighbouring cells it needs
+    to read, so workers never have to share state.
+    """
+    cells = sorted(grid)
+    for start in range(0, len(cells), cells_per_chunk):
+        owned = cells[start:start + cells_per_chunk]
+        halo = {}
+        for cell in owned:
+            for dx, dy, dz in FORWARD_OFFSETS:
+                neighbour = (cell[0] + dx, cell[1] + dy, cell[2] + dz)
+                if neighbour in grid:
+                    halo[neighbour] = grid[neighbour]
+        yield {cell: grid[cell] for cell in owned}, halo
+
+
+def _compare(a, b, distance, similarity, found):
+    if a[0] == b[0] and a[1] == b[1]:
+        return
+    # Cheap upper bound first: quick_ratio never underestimates the real ratio.
+    if a[3] != b[3] and SequenceMatcher(None, a[3], b[3]).quick_ratio() < similarity:
+        return
+    meters = haversine(a[4], a[5], b[4], b[5])
+    if meters > distance:
+        return
+    score = name_similarity(a[3], b[3])
+    if score >= similarity:
+        first, second = sorted((a, b), key=lambda point: (point[0], point[1]))
+        found.append((first[0], first[1], first[2], second[0], second[1], second[2], meters, score))
+
+
+def find_in_chunk(args):
+    """Worker entry point: compare the owned cells of one work unit."""
+    (owned, halo), distance, similarity = args
+    found = []
+    for cell, points in owned.items():
+        for i, a in enumerate(points):
+            for b in points[i + 1:]:
+                _compare(a, b, distance, similarity, found)
+
+        for dx, dy, dz in FORWARD_OFFSETS:
+            neighbour = halo.get((cell[0] + dx, cell[1] + dy, cell[2] + dz))
+            if not neighbour:
+                continue
+            for a in points:
+                for b in neighbour:
+                    _compare(a, b, distance, similarity, found)
+    return found
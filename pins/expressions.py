@@ -0,0 +1,14 @@
+"""Database expressions shared by the pin queries."""
+from django.db.models import FloatField, Func
+
+
+class Longitude(Func):
+    """X coordinate of a point column, extracted in the database."""
+    function = 'ST_X'
+    output_field = FloatField()
+
+
+class Latitude(Func):
+    """Y coordinate of a point column, extracted in the database."""
+    function = 'ST_Y'
+    output_field = FloatField()
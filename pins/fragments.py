@@ -0,0 +1,137 @@
+"""
+Pre-rendered list fragments.
+
+Each registry row keeps the encoded JSON of its pin's list representation
+together with the pin version it was rendered from. Anything that changes
+the representation (a pin save, its tags, its city name, its post or FAQ
+counts) bumps the version, so a fragment is stale exactly when the two
+differ.
+
+A saved pin re-renders its own fragment in its transaction; bulk version
+bumps (``versioning.touch``/``touch_city``) re-render theirs right after
+commit with ``render_after_commit``. List endpoints only render the
+stragglers left stale in between.
+"""
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+from unfotour.renderers import FastJSONRenderer
+from .models import PIN_CATEGORIES, PinRegistry
+from . import listing
+
+_renderer = FastJSONRenderer()
+
+# Registry columns read to serve stored fragments.
+FRAGMENT_COLUMNS = ('category', 'pin_id', 'version', 'fragment_version', 'fragment')
+
+BATCH_SIZE = 1000
+
+
+class RawJSON(bytes):
+    """Already encoded JSON, embedded as is by ``json_object``."""
+
+
+def json_array(chunks):
+    return RawJSON(b'[' + b','.join(chunks) + b']')
+
+
+def json_object(**fields):
+    """Encode a JSON object whose RawJSON values are copied verbatim."""
+    members = [
+        _renderer.render(key) + b':' + (value if isinstance(value, RawJSON) else _renderer.render(value))
+        for key, value in fields.items()
+    ]
+    return b'{' + b','.join(members) + b'}'
+
+
+def _store(category, rendered, versions):
+    """Store {pin_id: fragment} rendered from {pin_id: version} in one UPDATE."""
+    rows = [(pin_id, versions[pin_id], fragment) for pin_id, fragment in rendered.items() if pin_id in versions]
+    if not rows:
+        return
+    table = PinRegistry._meta.db_table
+    values = ', '.join(['(%s::bigint, %s::integer, %s::bytea)'] * len(rows))
+    with connection.cursor() as cursor:
+        # Skip the rows whose pin changed again in the meantime
+        cursor.execute(
+            f'UPDATE {table} AS r SET fragment = v.fragment, fragment_version = v.version '
+            f'FROM (VALUES {values}) AS v (pin_id, version, fragment) '
+            f'WHERE r.category = %s AND r.pin_id = v.pin_id AND r.version = v.version',
+            [value for row in rows for value in row] + [category]
+        )
+
+
+def render(category, pin_ids):
+    """Render and store the fragments of some pins of a category. Returns {pin_id: bytes}."""
+    versions = dict(
+        PinRegistry.objects
+        .filter(category=category, pin_id__in=pin_ids)
+        .values_list('pin_id', 'version')
+    )
+    rendered = {}
+    for pin in listing.serialize_pins(PIN_CATEGORIES[category].objects.filter(pk__in=pin_ids)):
+        pin['category'] = category
+        rendered[pin['id']] = _renderer.render(pin)
+    _store(category, rendered, versions)
+    return rendered
+
+
+def render_stale(rows):
+    """Render the missing or stale fragments of a PinRegistry queryset, in batches."""
+    stale = defaultdict(list)
+    for category, pin_id in rows.exclude(fragment_version=F('version')).values_list('category', 'pin_id'):
+        stale[category].append(pin_id)
+    for category, pin_ids in stale.items():
+        for start in range(0, len(pin_ids), BATCH_SIZE):
+            render(category, pin_ids[start:start + BATCH_SIZE])
+
+
+def render_after_commit(rows):
+    """Re-render the stale fragments of a PinRegistry queryset once the transaction commits."""
+    transaction.on_commit(lambda: render_stale(rows))
+
+
+def _collect(rows):
+    """
+    Return {(category, pin_id): bytes} from registry rows, rendering the
+    fragments still missing or stale (normally already done after commit).
+    """
+    found, stale = {}, defaultdict(list)
+    for category, pin_id, version, fragment_version, fragment in rows:
+        if fragment is not None and fragment_version == version:
+            found[(category, pin_id)] = bytes(fragment)
+        else:
+            stale[category].append(pin_id)
+
+    for category, pin_ids in stale.items():
+        for pin_id, fragment in render(category, pin_ids).items():
+            found[(category, pin_id)] = fragment
+    return found
+
+
+def for_registry(queryset):
+    """Return the fragments of a PinRegistry queryset, in queryset order, with a single query."""
+    rows = list(queryset.values_list(*FRAGMENT_COLUMNS))
+    found = _collect(rows)
+    return [found[row[:2]] for row in rows if row[:2] in found]
+
+
+def for_pins(pins):
+    """Return the fragments of (category, pin_id) pairs, in the given order."""
+    pin_ids = defaultdict(list)
+    for category, pin_id in pins:
+        pin_ids[category].append(pin_id)
+    if not pin_ids:
+        return []
+
+    filters = Q()
+    for category, ids in pin_ids.items():
+        filters |= Q(category=category, pin_id__in=ids)
+    found = _collect(
+        PinRegistry.objects
+        .filter(filters)
+        .values_list(*FRAGMENT_COLUMNS)
+    )
+    return [found[pin] for pin in pins if pin in found]
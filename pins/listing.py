@@ -0,0 +1,65 @@
+"""
+Fast list serialization for pins.
+
+Builds exactly the JSON of PinSerializer (same keys, order and value
+representations) straight from ``.values()`` rows: coordinates are
+extracted by ST_X/ST_Y, tag names come from the denormalized array
+column and the city name from a join, so no model instance or DRF field runs per row.
+"""
+from django.db.models import F
+from rest_framework import serializers
+
+from .expressions import Latitude, Longitude
+
+VALUE_FIELDS = [
+    'id', 'name', 'city_name', 'latitude', 'longitude', 'description', 'header_image',
+    'icon', 'rating', 'link', 'tag_names', 'social_post_count', 'faq_count',
+]
+
+_rating = serializers.DecimalField(max_digits=4, decimal_places=2)
+
+
+def list_values(queryset):
+    """Annotate a pin queryset with everything the list payload needs and return its values."""
+    return (
+        queryset
+        .annotate(
+            city_name=F('city__name'),
+            latitude=Latitude('pin'),
+            longitude=Longitude('pin'),
+        )
+        .values(*VALUE_FIELDS)
+    )
+
+
+def serialize_rows(rows, model):
+    """Turn ``list_values`` rows of ``model`` into PinSerializer-shaped dicts."""
+    type_name = model._meta.model_name
+    rating = _rating.to_representation
+    return [
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'type': type_name,
+            'city_name': row['city_name'],
+            'latitude': row['latitude'],
+            'longitude': row['longitude'],
+            'description': row['description'],
+            'header_image': row['header_image'],
+            'icon': row['icon'],
+            'rating': None if row['rating'] is None else rating(row['rating']),
+            'link': row['link'],
+            'tags': row['tag_names'],
+            'social_post_count': row['social_post_count'],
+            'faq_count': row['faq_count'],
+        }
+        for row in rows
+    ]
+
+
+def serialize_pins(queryset, limit=None):
+    """Serialize a pin queryset for list payloads, optionally keeping only the first ``limit`` rows."""
+    rows = list_values(queryset)
+    if limit is not None:
+        rows = rows[:limit]
+    return serialize_rows(rows, queryset.model)
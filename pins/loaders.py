@@ -0,0 +1,107 @@
+"""
+Round-trip-minimized loaders for pin detail payloads.
+
+The pin row, its city and creator (joins), its tag names (array subquery)
+and its published social posts with platform and tags (JSON aggregation
+subquery over the social post link index) are all fetched by a single SQL
+statement.
+"""
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import JSONField, OuterRef, Subquery
+from django.db.models.functions import JSONObject
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from taggit.models import TaggedItem
+
+from social.models import SocialPostLink
+from .models import CATEGORY_BY_MODEL
+
+# Key order of SocialPostSerializer / PostPlatformSerializer (jsonb does not keep it).
+POST_FIELDS = ['id', 'name', 'platform', 'link', 'description', 'tags', 'created_at', 'updated_at']
+PLATFORM_FIELDS = ['id', 'name', 'code', 'website']
+
+_datetime_field = serializers.DateTimeField()
+
+
+def tag_names(model, outer='pk'):
+    """Array subquery of the tag names of the ``model`` row whose pk is the outer ``outer`` column."""
+    return ArraySubquery(
+        TaggedItem.objects
+        .filter(
+            content_type__app_label=model._meta.app_label,
+            content_type__model=model._meta.model_name,
+            object_id=OuterRef(outer)
+        )
+        .order_by('tag__name')
+        .values('tag__name')
+    )
+
+
+def social_posts(target_type):
+    """JSON array subquery of the published social posts linked to the outer row of ``target_type``."""
+    posts = (
+        SocialPostLink.objects
+        .filter(target_type=target_type, target_id=OuterRef('pk'), published=True)
+        .order_by()
+        .values('target_id')
+        .annotate(data=JSONBAgg(
+            JSONObject(
+                id='post__id',
+                name='post__name',
+                platform=JSONObject(
+                    id='post__platform__id',
+                    name='post__platform__name',
+                    code='post__platform__code',
+                    website='post__platform__website',
+                ),
+                link='post__link',
+                description='post__description',
+                tags='post__tag_names',
+                created_at='post__created_at',
+                updated_at='post__updated_at',
+            ),
+            order_by='-created_at'
+        ))
+        .values('data')
+    )
+    return Subquery(posts, output_field=JSONField())
+
+
+def format_social_posts(data):
+    """Shape aggregated social posts exactly like SocialPostSerializer output."""
+    posts = []
+    for post in data or []:
+        platform = post['platform']
+        post['platform'] = (
+            {key: platform[key] for key in PLATFORM_FIELDS}
+            if platform['id'] is not None else None
+        )
+        for key in ('created_at', 'updated_at'):
+            post[key] = _datetime_field.to_representation(parse_datetime(post[key]))
+        posts.append({key: post[key] for key in POST_FIELDS})
+    return posts
+
+
+def pin_detail_queryset(model):
+    """Queryset of ``model`` carrying everything the detail serializer reads."""
+    return (
+        model.objects
+        .select_related('city', 'created_by')
+        .defer('city__geometry')
+        .annotate(social_posts_data=social_posts(CATEGORY_BY_MODEL[model]))
+    )
+
+
+def load_pin_detail(model, pin_id):
+    """Load a published pin with everything its detail payload needs in one query, or None."""
+    try:
+        return pin_detail_queryset(model).order_by().get(pk=pin_id, published=True)
+    except model.DoesNotExist:
+        return None
+
+
+def load_pin_details(model, pin_ids):
+    """Load many published pins of ``model`` with one query, as {pk: pin}."""
+    pins = pin_detail_queryset(model).order_by().filter(pk__in=pin_ids, published=True)
+    return {pin.pk: pin for pin in pins}
@@ -0,0 +1,87 @@
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from pins.models import PIN_CATEGORIES
+from pins import audit
+
+REPORT_FIELDS = [
+    'category', 'pin_id', 'name', 'city_id', 'city_name',
+    'longitude', 'latitude', 'suggested_city_id', 'fixed',
+]
+
+
+class Command(BaseCommand):
+    help = 'Report (and optionally fix) pins lying outside the polygon of their assigned city'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of worker threads'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='Cities audited per work unit'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Write the CSV report to this path instead of stdout'
+        )
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Reassign pins to the city that actually contains them when there is exactly one'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        outside = []
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for result in executor.map(audit.audit_cities, audit.city_chunks(options['chunk_size'])):
+                outside.extend(result)
+
+        fixed = 0
+        for row in outside:
+            row['suggested_city_id'] = None
+            row['fixed'] = False
+            if not options['fix'] or row['longitude'] is None:
+                continue
+
+            city_id = audit.containing_city(Point(row['longitude'], row['latitude'], srid=4326))
+            row['suggested_city_id'] = city_id
+            if city_id is None:
+                continue
+
+            # Save through the model so the derived tables stay in sync
+            pin = PIN_CATEGORIES[row['category']].objects.get(pk=row['pin_id'])
+            pin.city_id = city_id
+            pin.save()
+            row['fixed'] = True
+            fixed += 1
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+                self._write_report(f, outside)
+            self.stdout.write(f'Report written to: {options["output"]}')
+        else:
+            self._write_report(self.stdout, outside)
+
+        self.stdout.write('\nAudit Summary:')
+        self.stdout.write(f'  Pins outside their city: {len(outside)}')
+        self.stdout.write(f'  Fixed: {fixed}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Audit completed in {time.monotonic() - started:.1f}s'
+        ))
+
+    def _write_report(self, stream, rows):
+        writer = csv.DictWriter(stream, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
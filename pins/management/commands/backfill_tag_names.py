@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from pins import tagging, versioning
+from pins.models import CATEGORY_BY_MODEL
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized tag name arrays of pins and social posts from taggit'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = tagging.backfill()
+            for model, pks in fixed.items():
+                if pks and model in CATEGORY_BY_MODEL:
+                    # Pins render their tags in fragments and bundles, which touch re-renders after commit
+                    versioning.touch(model, pks)
+
+        for model, pks in fixed.items():
+            if pks:
+                self.stdout.write(f'{model._meta.verbose_name_plural}: fixed {len(pks)} rows')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Backfilled tag arrays ({sum(len(pks) for pks in fixed.values())} rows fixed)'
+        ))
@@ -0,0 +1,91 @@
+import json
+import time
+from decimal import Decimal
+
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand, CommandError
+from location.models import City
+from pins.models import PIN_CATEGORIES
+from pins.views import MODEL_MAPPING
+from pins import listing
+
+
+class Command(BaseCommand):
+    help = 'Compare the DRF list serializer with the fast list path on synthetic pins (no database needed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[1000, 10000, 100000],
+            help='Payload sizes to benchmark'
+        )
+        parser.add_argument(
+            '--category',
+            default='main-attractions',
+            help='Pin category whose serializer is benchmarked'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per size; the best one is reported'
+        )
+
+    def handle(self, *args, **options):
+        category = options['category']
+        if category not in PIN_CATEGORIES:
+            raise CommandError(f'Unknown category {category}')
+        model = PIN_CATEGORIES[category]
+        serializer = MODEL_MAPPING[category]['list_serializer']
+
+        self.stdout.write(f'{"rows":>8} {"serializer":>12} {"fast path":>12} {"speedup":>8}')
+        for size in options['rows']:
+            instances, rows = self._pins(model, size)
+
+            # Both paths must produce the same JSON
+            sample = slice(0, 100)
+            if json.dumps(serializer(instances[sample], many=True).data) != json.dumps(listing.serialize_rows(rows[sample], model)):
+                raise CommandError('Fast path output differs from the serializer output')
+
+            slow = self._best(lambda: serializer(instances, many=True).data, options['repeat'])
+            fast = self._best(lambda: listing.serialize_rows(rows, model), options['repeat'])
+            self.stdout.write(f'{size:>8} {slow * 1000:>10.1f}ms {fast * 1000:>10.1f}ms {slow / fast:>7.1f}x')
+
+    def _best(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def _pins(self, model, size):
+        """Build matching unsaved instances (as the serializer sees them) and value rows."""
+        city = City(pk=1, name='Benchmark City')
+        instances, rows = [], []
+        for i in range(size):
+            lon, lat = 77 + i % 1000 / 1000, 28 + i // 1000 % 1000 / 1000
+            values = {
+                'id': i + 1,
+                'name': f'Pin {i}',
+                'description': 'A place worth visiting',
+                'header_image': 'https://example.com/image.jpg',
+                'icon': 'pin',
+                'rating': Decimal('4.25'),
+                'link': None,
+                'social_post_count': i % 7,
+                'faq_count': i % 3,
+            }
+            pin = model(city=city, pin=Point(lon, lat, srid=4326), **values)
+            pin.tag_names = ['heritage', f'tag{i % 10}']
+            instances.append(pin)
+            rows.append({
+                **values,
+                'city_name': city.name,
+                'latitude': lat,
+                'longitude': lon,
+                'tag_names': pin.tag_names,
+            })
+        return instances, rows
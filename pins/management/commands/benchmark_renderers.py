@@ -0,0 +1,101 @@
+import json
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from pins.models import MainAttraction
+from pins import listing
+from unfotour.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    help = 'Compare CPU time of the stock and fast JSON renderers on search and pin detail payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=2000,
+            help='Renders per payload and renderer'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        payloads = {
+            'search_pins': self._search_payload(),
+            'get_pin_by_slug': self._detail_payload(),
+            'list (1000 pins)': {'pins': self._pins(1000), 'total_count': 1000},
+        }
+
+        self.stdout.write(f'orjson: {"yes" if orjson else "no (stdlib fallback)"}')
+        self.stdout.write(f'{"payload":>18} {"JSONRenderer":>14} {"FastJSON":>12} {"speedup":>8}')
+        for name, payload in payloads.items():
+            stock, fast = JSONRenderer(), FastJSONRenderer()
+            if json.loads(stock.render(payload)) != json.loads(fast.render(payload)):
+                raise CommandError(f'Renderers disagree on the {name} payload')
+
+            stock_time = self._cpu(stock, payload, iterations)
+            fast_time = self._cpu(fast, payload, iterations)
+            self.stdout.write(
+                f'{name:>18} {stock_time * 1e6:>12.1f}us {fast_time * 1e6:>10.1f}us {stock_time / fast_time:>7.1f}x'
+            )
+
+    def _cpu(self, renderer, payload, iterations):
+        """CPU seconds per render."""
+        started = time.process_time()
+        for _ in range(iterations):
+            renderer.render(payload)
+        return (time.process_time() - started) / iterations
+
+    def _pins(self, size):
+        rows = [
+            {
+                'id': i + 1,
+                'name': f'Pin {i}',
+                'city_name': 'Benchmark City',
+                'latitude': 28 + i / 1000,
+                'longitude': 77 + i / 1000,
+                'description': 'A place worth visiting',
+                'header_image': 'https://example.com/image.jpg',
+                'icon': 'pin',
+                'rating': Decimal('4.25'),
+                'link': None,
+                'tag_names': ['heritage', f'tag{i % 10}'],
+                'social_post_count': i % 7,
+                'faq_count': i % 3,
+            }
+            for i in range(size)
+        ]
+        return listing.serialize_rows(rows, MainAttraction)
+
+    def _search_payload(self):
+        results = self._pins(20)
+        for pin in results:
+            pin['category'] = 'main-attractions'
+        return {'query': 'fort', 'results': results, 'total_found': 20}
+
+    def _detail_payload(self):
+        # Serializers already emit datetimes as strings
+        now = timezone.now().isoformat().replace('+00:00', 'Z')
+        [pin] = self._pins(1)
+        pin.update({
+            'slug': 'main-attractions-pin-0-a1b2c',
+            'created_by_name': 'admin',
+            'marker_icon': 'pin',
+            'social_posts': [
+                {
+                    'id': i,
+                    'name': f'Post {i}',
+                    'platform': {'id': 1, 'name': 'YouTube', 'code': 'YT', 'website': 'https://youtube.com'},
+                    'link': f'https://youtube.com/watch?v={i}',
+                    'description': 'Great video',
+                    'tags': ['travel', 'history'],
+                    'created_at': now,
+                    'updated_at': now,
+                }
+                for i in range(20)
+            ],
+        })
+        return {'pin': pin, 'category': 'main-attractions', 'cta_buttons': [], 'cta_categories': []}
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from location.models import City
+from pins.models import CityBundle
+from pins import bundles
+
+
+class Command(BaseCommand):
+    help = 'Build the precomputed landing page bundles of cities'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--city',
+            type=int,
+            action='append',
+            help='Only build the bundle of this city id (repeatable)'
+        )
+        parser.add_argument(
+            '--stale-only',
+            action='store_true',
+            help='Only rebuild existing bundles that are out of date'
+        )
+
+    def handle(self, *args, **options):
+        if options['stale_only']:
+            city_ids = CityBundle.objects.filter(built_generation__lt=F('generation')).values_list('pk', flat=True)
+        else:
+            city_ids = City.objects.filter(is_active=True).values_list('pk', flat=True)
+        if options['city']:
+            city_ids = city_ids.filter(pk__in=options['city'])
+
+        built = 0
+        for city_id in city_ids.order_by('pk'):
+            if bundles.build(city_id) is not None:
+                built += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Built {built} city bundles'))
@@ -0,0 +1,103 @@
+import time
+from multiprocessing import Pool
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from pins.models import DuplicatePinCandidate
+from pins import duplicates
+
+
+class Command(BaseCommand):
+    help = 'Find candidate duplicate pins (nearby and similarly named) across all pin tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--distance',
+            type=float,
+            default=50,
+            help='Maximum distance between duplicates in meters'
+        )
+        parser.add_argument(
+            '--similarity',
+            type=float,
+            default=0.8,
+            help='Minimum name similarity between 0 and 1'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of worker processes'
+        )
+        parser.add_argument(
+            '--cells-per-chunk',
+            type=int,
+            default=5000,
+            help='Grid cells handled by a single work unit'
+        )
+        parser.add_argument(
+            '--published-only',
+            action='store_true',
+            help='Only compare published pins'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Print candidates without replacing the stored report'
+        )
+
+    def handle(self, *args, **options):
+        distance = options['distance']
+        similarity = options['similarity']
+        started = time.monotonic()
+
+        grid = duplicates.build_grid(
+            duplicates.iter_points(published_only=options['published_only']),
+            cell_size=distance
+        )
+        total = sum(len(points) for points in grid.values())
+        self.stdout.write(f'Loaded {total} pins into {len(grid)} grid cells')
+
+        work = (
+            (chunk, distance, similarity)
+            for chunk in duplicates.split_grid(grid, options['cells_per_chunk'])
+        )
+
+        # Workers are pure Python; do not let them inherit open database connections.
+        connections.close_all()
+
+        found = []
+        if options['workers'] > 1:
+            with Pool(options['workers']) as pool:
+                for result in pool.imap_unordered(duplicates.find_in_chunk, work):
+                    found.extend(result)
+        else:
+            for unit in work:
+                found.extend(duplicates.find_in_chunk(unit))
+
+        self.stdout.write(f'Found {len(found)} candidate pairs')
+
+        if options['dry_run']:
+            for category_a, pin_id_a, name_a, category_b, pin_id_b, name_b, meters, score in found:
+                self.stdout.write(
+                    f'{category_a}:{pin_id_a} "{name_a}" ~ {category_b}:{pin_id_b} "{name_b}" '
+                    f'({meters:.1f} m, {score:.2f})'
+                )
+        else:
+            with transaction.atomic():
+                DuplicatePinCandidate.objects.all().delete()
+                DuplicatePinCandidate.objects.bulk_create(
+                    (
+                        DuplicatePinCandidate(
+                            category_a=category_a, pin_id_a=pin_id_a, name_a=name_a,
+                            category_b=category_b, pin_id_b=pin_id_b, name_b=name_b,
+                            distance=meters, similarity=score
+                        )
+                        for category_a, pin_id_a, name_a, category_b, pin_id_b, name_b, meters, score in found
+                    ),
+                    batch_size=1000
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Duplicate scan completed in {time.monotonic() - started:.1f}s'
+        ))
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from pins import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        'Partition the pin registry by country or geohash prefix online: copy it into a new '
+        'partitioned table while capturing concurrent changes, then swap the tables. '
+        'PostgreSQL only enforces unique indexes per partition, so global slug uniqueness moves '
+        'to the pin_registry_slugs table maintained by a trigger (one extra index write per slug '
+        'change); the command refuses to run while duplicate slugs exist'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scheme', choices=partitioning.SCHEMES, help='Partition key to convert to')
+        parser.add_argument(
+            '--precision',
+            type=int,
+            choices=(1, 2),
+            default=1,
+            help='Geohash prefix length of the geohash partitions (32 or 1024 partitions)'
+        )
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows copied per statement')
+        parser.add_argument('--keep-old', action='store_true', help='Keep the previous table as pin_registry_old')
+        parser.add_argument('--show', action='store_true', help='Only print the current partition key')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning needs PostgreSQL')
+
+        current = partitioning.current_scheme()
+        if options['show'] or not options['scheme']:
+            self.stdout.write(f'{partitioning.TABLE}: {current or "not partitioned"}')
+            return
+
+        try:
+            partitioning.repartition(
+                options['scheme'],
+                precision=options['precision'],
+                batch_size=options['batch_size'],
+                keep_old=options['keep_old'],
+                log=self.stdout.write,
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(self.style.SUCCESS(f'{partitioning.TABLE}: {partitioning.current_scheme()}'))
+        if getattr(settings, 'PIN_REGISTRY_PARTITIONING', None) != options['scheme']:
+            self.stdout.write(self.style.WARNING(
+                f"Set PIN_REGISTRY_PARTITIONING = '{options['scheme']}' in settings so registry writes "
+                'move pins between partitions'
+            ))
@@ -0,0 +1,296 @@
+import json
+import re
+
+from django.contrib.gis.geos import Polygon
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from pins import listing, loaders, registry, zones
+from pins.fragments import FRAGMENT_COLUMNS
+from pins.models import PIN_CATEGORIES, PinRegistry, PinZoneMembership
+from location.models import Specialzone
+
+# Leading identifier of a filter operand: "(category)::text", "published", "pin_registry.city_id"
+_COLUMN = r'\(*(?:\w+\.)?"?(\w+)"?\)*(?:::[\w ]+(?:\[\])?)?'
+
+EQUALITY = re.compile(_COLUMN + r'\s*=\s*(?!ANY)')
+IN_LIST = re.compile(_COLUMN + r'\s*=\s*ANY\b')
+TEXT_SEARCH = re.compile(r'upper\(+(?:\w+\.)?"?(\w+)"?\)*(?:::text)?\)*\s*~~')
+CONTAINMENT = re.compile(_COLUMN + r'\s*@>')
+SPATIAL = re.compile(r'st_(?:within|intersects|contains|coveredby|covers|dwithin)\(+(?:\w+\.)?"?(\w+)"?', re.I)
+BOOLEAN = re.compile(r'(?:^|[(\s])(?:\w+\.)?(published|is_active)(?=$|[)\s])')
+
+
+def _walk(node, parents=()):
+    yield node, parents
+    for child in node.get('Plans', []):
+        yield from _walk(child, (*parents, node))
+
+
+def _scan_below(node):
+    """The first scan node (with a relation) under ``node``."""
+    for child, _ in _walk(node):
+        if 'Relation Name' in child:
+            return child
+
+
+def _conditions(node):
+    return ' AND '.join(node[key] for key in ('Index Cond', 'Filter', 'Recheck Cond') if key in node)
+
+
+def _index_sql(relation, columns, predicate=None, method=None):
+    using = f' USING {method}' if method else ''
+    where = f' WHERE {predicate}' if predicate else ''
+    return f'CREATE INDEX CONCURRENTLY ON {relation}{using} ({", ".join(columns)}){where};'
+
+
+def _sort_key(key, relation):
+    """Turn an EXPLAIN sort key into an index column, or None for expressions."""
+    key = re.sub(rf'^{re.escape(relation)}\.', '', key)
+    if '(' in key:
+        return None
+    return key
+
+
+def suggest(node, sort_node=None):
+    """Index suggestions for a scan node (and the sort sitting above it), as (reason, sql) pairs."""
+    relation = node.get('Relation Name')
+    if relation is None:
+        return []
+
+    conditions = _conditions(node)
+    predicate = ' AND '.join(sorted(set(BOOLEAN.findall(conditions)))) or None
+    equality = []
+    for column in EQUALITY.findall(conditions) + IN_LIST.findall(conditions):
+        if column not in equality:
+            equality.append(column)
+
+    suggestions = []
+    if sort_node is not None:
+        keys = [_sort_key(key, relation) for key in sort_node.get('Sort Key', [])]
+        if keys and None not in keys:
+            suggestions.append((
+                'sort: index in query order',
+                _index_sql(relation, [*equality, *keys], predicate)
+            ))
+    elif equality:
+        suggestions.append(('filter: equality columns', _index_sql(relation, equality, predicate)))
+
+    for column in TEXT_SEARCH.findall(conditions):
+        suggestions.append((
+            'filter: substring match (needs the pg_trgm extension)',
+            _index_sql(relation, [f'upper({column}) gin_trgm_ops'], predicate, 'gin')
+        ))
+    for column in CONTAINMENT.findall(conditions):
+        suggestions.append(('filter: array containment', _index_sql(relation, [column], predicate, 'gin')))
+    for column in SPATIAL.findall(conditions):
+        suggestions.append(('filter: spatial predicate', _index_sql(relation, [column], predicate, 'gist')))
+    return suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay the pin read queries with EXPLAIN (ANALYZE, BUFFERS), flag sequential scans, '
+        'sorts and high buffer reads, suggest indexes and print the report as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument('--query', action='append', dest='queries', help='Only replay the named queries')
+        parser.add_argument(
+            '--seq-scan-rows',
+            type=int,
+            default=1000,
+            help='Flag sequential scans reading at least this many rows'
+        )
+        parser.add_argument(
+            '--buffer-threshold',
+            type=int,
+            default=1000,
+            help='Flag queries touching at least this many shared buffers (8 kB blocks)'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('EXPLAIN (ANALYZE, BUFFERS) needs PostgreSQL')
+
+        queries = self._queries()
+        if options['queries']:
+            unknown = set(options['queries']) - set(queries)
+            if unknown:
+                raise CommandError(f'Unknown queries: {", ".join(sorted(unknown))} (known: {", ".join(queries)})')
+            queries = {name: queries[name] for name in options['queries']}
+
+        results = [
+            self._report(name, description, queryset, options)
+            for name, (description, queryset) in queries.items()
+        ]
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'database': {'vendor': connection.vendor, 'version': connection.pg_version},
+            'thresholds': {
+                'seq_scan_rows': options['seq_scan_rows'],
+                'buffer_blocks': options['buffer_threshold'],
+            },
+            'summary': {
+                'queries': len(results),
+                'seq_scans': sum(len(result['seq_scans']) for result in results),
+                'sorts': sum(len(result['sorts']) for result in results),
+                'high_buffers': sum(result['high_buffers'] for result in results),
+            },
+            'queries': results,
+        }
+
+        output = json.dumps(report, indent=2, default=str)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f'Wrote {len(results)} query reports to {options["output"]}'))
+        else:
+            self.stdout.write(output)
+
+    def _queries(self):
+        """{name: (description, queryset)} of the read shapes of pins.views, built from sample rows."""
+        sample = PinRegistry.objects.filter(published=True).order_by('pk').first()
+        if sample is None:
+            raise CommandError('No published pins to replay the queries against')
+
+        model = PIN_CATEGORIES[sample.category]
+        published = Q(published=True)
+        x, y = sample.point.x, sample.point.y
+        bbox = Polygon.from_bbox((x - 0.5, y - 0.5, x + 0.5, y + 0.5))
+        bbox.srid = 4326
+        term = sample.name[:4] or 'a'
+
+        queries = {
+            'all_pins': (
+                'GET /api/all/',
+                registry.listing(published).values_list(*FRAGMENT_COLUMNS)
+            ),
+            'all_pins_bbox': (
+                'GET /api/all/?bbox=...',
+                registry.listing(published & Q(point__within=bbox)).values_list(*FRAGMENT_COLUMNS)
+            ),
+            'pins_by_type': (
+                f'GET /api/pins/{sample.category}/',
+                registry.listing(published, category=sample.category).values_list(*FRAGMENT_COLUMNS)
+            ),
+            'pins_by_type_bbox': (
+                f'GET /api/pins/{sample.category}/?bbox=...',
+                registry.listing(published & Q(point__within=bbox), category=sample.category)
+                .values_list(*FRAGMENT_COLUMNS)
+            ),
+            'search': (
+                f'GET /api/search/?q={term}',
+                registry.search(Q(name__icontains=term) & published)
+            ),
+            'search_country': (
+                f'GET /api/search/?q={term}&country={sample.country_id}',
+                registry.search(Q(name__icontains=term, country_id=sample.country_id) & published)
+            ),
+            'pin_by_slug': (
+                f'GET /api/pin/{sample.slug}/ (registry lookup)',
+                PinRegistry.objects.filter(slug=sample.slug, published=True)
+                .values('category', 'pin_id', 'version', 'updated_at').order_by('pk')[:1]
+            ),
+            'pin_detail': (
+                f'GET /api/pin/{sample.slug}/ (pin with city, tags and social posts)',
+                loaders.pin_detail_queryset(model).order_by().filter(pk=sample.pin_id, published=True)
+            ),
+            'category_table_list': (
+                f'{model._meta.db_table} published pins in Meta.ordering order (admin, fragments)',
+                model.objects.filter(published=True).values('pk')
+            ),
+            'city_bundle_pins': (
+                f'City bundle build for city {sample.city_id}',
+                listing.list_values(model.objects.filter(city_id=sample.city_id, published=True).order_by('name'))
+            ),
+        }
+        if sample.tag_names:
+            queries['all_pins_tag'] = (
+                f'GET /api/all/?tag={sample.tag_names[0]}',
+                registry.listing(published & Q(tag_names__contains=[sample.tag_names[0]]))
+                .values_list(*FRAGMENT_COLUMNS)
+            )
+
+        zone_id = PinZoneMembership.objects.values_list('zone_id', flat=True).first()
+        if zone_id is not None:
+            queries['zone_pins'] = (
+                f'GET /api/zones/{zone_id}/pins/',
+                zones.zone_pins(Specialzone(pk=zone_id)).values_list(*FRAGMENT_COLUMNS)
+            )
+        return queries
+
+    def _explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return sql, params, plan[0]
+
+    def _report(self, name, description, queryset, options):
+        sql, params, explained = self._explain(queryset)
+        root = explained['Plan']
+
+        seq_scans, sorts, suggestions = [], [], {}
+        for node, parents in _walk(root):
+            node_type = node['Node Type']
+            if node_type == 'Seq Scan':
+                loops = node.get('Actual Loops', 1)
+                rows_read = (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * loops
+                if rows_read >= options['seq_scan_rows']:
+                    seq_scans.append({
+                        'relation': node['Relation Name'],
+                        'rows_read': rows_read,
+                        'rows_removed_by_filter': node.get('Rows Removed by Filter', 0) * loops,
+                        'filter': node.get('Filter'),
+                    })
+                    # A sort directly above the scan is reported with the sort
+                    if not (parents and parents[-1]['Node Type'] in ('Sort', 'Incremental Sort')):
+                        for reason, index_sql in suggest(node):
+                            suggestions.setdefault(index_sql, {'relation': node['Relation Name'], 'reason': reason})
+            elif node_type in ('Sort', 'Incremental Sort'):
+                scan = _scan_below(node)
+                sorts.append({
+                    'relation': scan and scan['Relation Name'],
+                    'keys': node.get('Sort Key', []),
+                    'method': node.get('Sort Method'),
+                    'space_kb': node.get('Sort Space Used'),
+                    'space_type': node.get('Sort Space Type'),
+                    'rows': node.get('Actual Rows'),
+                })
+                if scan is not None:
+                    for reason, index_sql in suggest(scan, node):
+                        suggestions.setdefault(index_sql, {'relation': scan['Relation Name'], 'reason': reason})
+
+        buffers = {
+            'shared_hit': root.get('Shared Hit Blocks', 0),
+            'shared_read': root.get('Shared Read Blocks', 0),
+            'temp_read': root.get('Temp Read Blocks', 0),
+            'temp_written': root.get('Temp Written Blocks', 0),
+        }
+        touched = buffers['shared_hit'] + buffers['shared_read']
+
+        return {
+            'name': name,
+            'description': description,
+            'sql': sql,
+            'params': [str(param) for param in params],
+            'planning_ms': explained.get('Planning Time'),
+            'execution_ms': explained.get('Execution Time'),
+            'rows': root.get('Actual Rows'),
+            'buffers': buffers,
+            'high_buffers': touched >= options['buffer_threshold'],
+            'indexes_used': sorted({
+                node['Index Name'] for node, _ in _walk(root) if 'Index Name' in node
+            }),
+            'seq_scans': seq_scans,
+            'sorts': sorts,
+            'suggestions': [
+                {'sql': index_sql, **details} for index_sql, details in suggestions.items()
+            ],
+        }
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from unfotour import compression
+
+NAMESPACES = ('pins', 'bundles', 'boundaries')
+
+
+class Command(BaseCommand):
+    help = 'Report the bytes saved by the precompressed response cache'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'namespace':<12} {'responses':>10} {'identity':>14} {'sent':>14} {'saved':>14} {'ratio':>7}")
+        for namespace in NAMESPACES:
+            stats = compression.stats(namespace)
+            ratio = stats['sent_bytes'] / stats['identity_bytes'] if stats['identity_bytes'] else 1.0
+            self.stdout.write(
+                f"{namespace:<12} {stats['responses']:>10} {stats['identity_bytes']:>14} "
+                f"{stats['sent_bytes']:>14} {stats['saved_bytes']:>14} {ratio:>7.1%}"
+            )
+        if compression.brotli is None:
+            self.stdout.write(self.style.WARNING('brotli is not installed: only gzip variants are stored'))
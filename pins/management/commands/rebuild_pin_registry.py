@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from pins import aggregates, registry
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the global pin registry (slug lookups and cross-category reads) in place, '
+        'upserting every pin and deleting the rows of removed pins (safe to run on a live database)'
+    )
+
+    def handle(self, *args, **options):
+        upserted, deleted = registry.rebuild()
+        aggregates.refresh_all()
+
+        self.stdout.write(f'Registered {upserted} pins, removed {deleted} stale rows')
+        self.stdout.write(self.style.SUCCESS('Pin registry rebuilt!'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from location.models import Specialzone
+from pins.models import PinZoneMembership
+from pins import zones
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the pin <-> special zone membership table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--zone',
+            type=int,
+            action='append',
+            help='Only rebuild the given zone id (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        queryset = Specialzone.objects.all()
+        if options['zone']:
+            queryset = queryset.filter(pk__in=options['zone'])
+
+        with transaction.atomic():
+            if not options['zone']:
+                deleted, _ = PinZoneMembership.objects.all().delete()
+                self.stdout.write(f'Cleared {deleted} memberships')
+
+            for zone in queryset.iterator():
+                zones.sync_zone(zone)
+                count = PinZoneMembership.objects.filter(zone=zone).count()
+                self.stdout.write(f'{zone.name}: {count} pins')
+
+        self.stdout.write(self.style.SUCCESS('Zone membership rebuilt!'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from pins import counters
+
+
+class Command(BaseCommand):
+    help = 'Recount social posts and FAQs on every pin and fix any drift (run nightly)'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = counters.reconcile()
+
+        for model, pks in fixed.items():
+            if pks:
+                self.stdout.write(f'{model._meta.verbose_name_plural}: fixed {len(pks)} pins')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled pin counts ({sum(len(pks) for pks in fixed.values())} pins fixed)'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from pins import aggregates
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the pin counts per country, state and city and category from the registry, '
+        'writing only the rows that changed (safe to run on a live database)'
+    )
+
+    def handle(self, *args, **options):
+        result = aggregates.refresh_all()
+
+        for level, (written, deleted) in result.items():
+            self.stdout.write(f'{level}: {written} counts written, {deleted} removed')
+
+        self.stdout.write(self.style.SUCCESS('Region pin counts refreshed!'))
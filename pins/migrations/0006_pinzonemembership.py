@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0001_initial'),
+        ('pins', '0005_activities_marker_icon_countryinfo_marker_icon_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PinZoneMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=32)),
+                ('pin_id', models.BigIntegerField()),
+                ('zone', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pin_memberships', to='location.specialzone')),
+            ],
+            options={
+                'db_table': 'pin_zone_memberships',
+                'indexes': [models.Index(fields=['category', 'pin_id'], name='pin_zone_pin_idx')],
+                'constraints': [models.UniqueConstraint(fields=('zone', 'category', 'pin_id'), name='unique_pin_per_zone')],
+            },
+        ),
+    ]
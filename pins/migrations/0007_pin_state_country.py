@@ -0,0 +1,271 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+PIN_MODEL_NAMES = [
+    'MainAttraction', 'ThingsToDo', 'PlacesToVisit', 'PlacesToEat', 'Market', 'CountryInfo',
+    'DestinationGuide', 'PlaceInformation', 'TravelHacks', 'Festivals', 'FamousPhotoPoint',
+    'Activities', 'Hotel',
+]
+
+
+def backfill_regions(apps, schema_editor):
+    City = apps.get_model('location', 'City')
+    cities = City.objects.filter(pk=OuterRef('city_id'))
+    for model_name in PIN_MODEL_NAMES:
+        apps.get_model('pins', model_name).objects.update(
+            state_id=Subquery(cities.values('state_id')[:1]),
+            country_id=Subquery(cities.values('state__country_id')[:1]),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0001_initial'),
+        ('pins', '0006_pinzonemembership'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activities',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='activities',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='countryinfo',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='countryinfo',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='destinationguide',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='destinationguide',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='famousphotopoint',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='famousphotopoint',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='festivals',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='festivals',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='mainattraction',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='mainattraction',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='placeinformation',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='placeinformation',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='placestoeat',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='placestoeat',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='placestovisit',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='placestovisit',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='thingstodo',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='thingstodo',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='travelhacks',
+            name='country',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='travelhacks',
+            name='state',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.RunPython(backfill_regions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='activities',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='activity_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activities',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='activity_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='countryinfo',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='ctryinfo_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='countryinfo',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='ctryinfo_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='destinationguide',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='destguide_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='destinationguide',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='destguide_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='famousphotopoint',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='photopoint_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='famousphotopoint',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='photopoint_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='festivals',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='festival_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='festivals',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='festival_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='hotel_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='hotel_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainattraction',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='mainattr_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainattraction',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='mainattr_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='market',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='market_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='market',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='market_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placeinformation',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='placeinfo_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placeinformation',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='placeinfo_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placestoeat',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='pteat_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placestoeat',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='pteat_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placestovisit',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='ptvisit_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='placestovisit',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='ptvisit_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thingstodo',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='thingstodo_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thingstodo',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='thingstodo_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='travelhacks',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='travelhack_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='travelhacks',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='travelhack_state_rank_idx'),
+        ),
+    ]
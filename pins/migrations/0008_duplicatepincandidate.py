@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0007_pin_state_country'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicatePinCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_a', models.CharField(max_length=32)),
+                ('pin_id_a', models.BigIntegerField()),
+                ('name_a', models.CharField(max_length=255)),
+                ('category_b', models.CharField(max_length=32)),
+                ('pin_id_b', models.BigIntegerField()),
+                ('name_b', models.CharField(max_length=255)),
+                ('distance', models.FloatField(help_text='Distance in meters')),
+                ('similarity', models.FloatField(help_text='Name similarity between 0 and 1')),
+                ('detected_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'duplicate_pin_candidates',
+                'ordering': ['distance', '-similarity'],
+                'constraints': [models.UniqueConstraint(fields=('category_a', 'pin_id_a', 'category_b', 'pin_id_b'), name='unique_duplicate_pin_pair')],
+            },
+        ),
+    ]
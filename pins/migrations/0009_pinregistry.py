@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:32
+
+import uuid
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+PIN_CATEGORIES = {
+    'main-attractions': 'MainAttraction',
+    'things-to-do': 'ThingsToDo',
+    'places-to-visit': 'PlacesToVisit',
+    'places-to-eat': 'PlacesToEat',
+    'markets': 'Market',
+    'country-info': 'CountryInfo',
+    'destination-guides': 'DestinationGuide',
+    'place-information': 'PlaceInformation',
+    'travel-hacks': 'TravelHacks',
+    'festivals': 'Festivals',
+    'famous-photo-points': 'FamousPhotoPoint',
+    'activities': 'Activities',
+    'hotels': 'Hotel',
+}
+
+
+def rename_duplicate_slugs(apps, schema_editor):
+    """
+    Pin slugs were only unique per city: give every blank slug and every
+    repeat of a slug (after its first holder, in category then pk order) a
+    fresh random suffix, so the registry's unique slug index can be built.
+    """
+    seen = set()
+    for category, model_name in PIN_CATEGORIES.items():
+        model = apps.get_model('pins', model_name)
+        for pk, slug, name in model.objects.order_by('pk').values_list('pk', 'slug', 'name').iterator(chunk_size=1000):
+            if slug and slug not in seen:
+                seen.add(slug)
+                continue
+            base = slug[:249] if slug else f"{model_name.lower()}-{slugify(name)[:200]}"
+            new_slug = f"{base}-{uuid.uuid4().hex[:5]}"
+            while new_slug in seen:
+                new_slug = f"{base}-{uuid.uuid4().hex[:5]}"
+            seen.add(new_slug)
+            model.objects.filter(pk=pk).update(slug=new_slug)
+            print(f"\n  Renamed {category} {pk} slug {slug!r} to {new_slug!r} (duplicate)", end="")
+
+
+def populate_registry(apps, schema_editor):
+    PinRegistry = apps.get_model('pins', 'PinRegistry')
+    for category, model_name in PIN_CATEGORIES.items():
+        rows = apps.get_model('pins', model_name).objects.order_by().values_list(
+            'pk', 'slug', 'city_id', 'pin', 'published'
+        )
+        PinRegistry.objects.bulk_create(
+            (
+                PinRegistry(category=category, pin_id=pk, slug=slug, city_id=city_id, point=point, published=published)
+                for pk, slug, city_id, point, published in rows.iterator(chunk_size=1000)
+            ),
+            batch_size=1000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0002_boundarypiece'),
+        ('pins', '0008_duplicatepincandidate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PinRegistry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=255, unique=True)),
+                ('category', models.CharField(max_length=32)),
+                ('pin_id', models.BigIntegerField()),
+                ('point', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                ('published', models.BooleanField(default=False)),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.city')),
+            ],
+            options={
+                'db_table': 'pin_registry',
+                'constraints': [models.UniqueConstraint(fields=('category', 'pin_id'), name='unique_registry_pin')],
+            },
+        ),
+        migrations.RunPython(rename_duplicate_slugs, migrations.RunPython.noop),
+        migrations.RunPython(populate_registry, migrations.RunPython.noop),
+    ]
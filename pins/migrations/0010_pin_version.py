@@ -0,0 +1,181 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:34
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+PIN_CATEGORIES = {
+    'main-attractions': 'MainAttraction',
+    'things-to-do': 'ThingsToDo',
+    'places-to-visit': 'PlacesToVisit',
+    'places-to-eat': 'PlacesToEat',
+    'markets': 'Market',
+    'country-info': 'CountryInfo',
+    'destination-guides': 'DestinationGuide',
+    'place-information': 'PlaceInformation',
+    'travel-hacks': 'TravelHacks',
+    'festivals': 'Festivals',
+    'famous-photo-points': 'FamousPhotoPoint',
+    'activities': 'Activities',
+    'hotels': 'Hotel',
+}
+
+
+def copy_updated_at(apps, schema_editor):
+    PinRegistry = apps.get_model('pins', 'PinRegistry')
+    for category, model_name in PIN_CATEGORIES.items():
+        pins = apps.get_model('pins', model_name).objects.filter(pk=OuterRef('pin_id'))
+        PinRegistry.objects.filter(category=category).update(
+            updated_at=Subquery(pins.values('updated_at')[:1])
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0009_pinregistry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activities',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='activities',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='countryinfo',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='countryinfo',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='destinationguide',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='destinationguide',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='famousphotopoint',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='famousphotopoint',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='festivals',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='festivals',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='mainattraction',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='mainattraction',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='placeinformation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='placeinformation',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='placestoeat',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='placestoeat',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='placestovisit',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='placestovisit',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='thingstodo',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='thingstodo',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='travelhacks',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='travelhacks',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(copy_updated_at, migrations.RunPython.noop),
+    ]
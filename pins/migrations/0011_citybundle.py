@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0002_boundarypiece'),
+        ('pins', '0010_pin_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CityBundle',
+            fields=[
+                ('city', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='location.city')),
+                ('data', models.BinaryField(default=bytes)),
+                ('generation', models.PositiveIntegerField(default=1)),
+                ('built_generation', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'city_bundles',
+            },
+        ),
+    ]
@@ -0,0 +1,188 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:46
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# category -> (pin model, FAQ foreign key name)
+PIN_CATEGORIES = {
+    'main-attractions': ('MainAttraction', 'mainattraction'),
+    'things-to-do': ('ThingsToDo', 'thingsToDo'),
+    'places-to-visit': ('PlacesToVisit', 'placestovisit'),
+    'places-to-eat': ('PlacesToEat', 'placesToEat'),
+    'markets': ('Market', 'market'),
+    'country-info': ('CountryInfo', 'countryinfo'),
+    'destination-guides': ('DestinationGuide', 'DestinationGuide'),
+    'place-information': ('PlaceInformation', 'placeinformation'),
+    'travel-hacks': ('TravelHacks', 'travelhacks'),
+    'festivals': ('Festivals', 'Festivals'),
+    'famous-photo-points': ('FamousPhotoPoint', 'famousphotopoint'),
+    'activities': ('Activities', 'activites'),
+    'hotels': ('Hotel', 'hotel'),
+}
+
+
+def _count(queryset, group_by):
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values(group_by).annotate(total=Count('*')).values('total'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def fill_counts(apps, schema_editor):
+    SocialPostLink = apps.get_model('social', 'SocialPostLink')
+    FAQ = apps.get_model('faq', 'FAQ')
+    for category, (model_name, faq_field) in PIN_CATEGORIES.items():
+        links = SocialPostLink.objects.filter(target_type=category, target_id=OuterRef('pk'), published=True)
+        faqs = FAQ.objects.filter(**{faq_field: OuterRef('pk')})
+        apps.get_model('pins', model_name).objects.update(
+            social_post_count=_count(links, 'target_id'),
+            faq_count=_count(faqs, faq_field)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0011_citybundle'),
+        ('faq', '0001_initial'),
+        ('social', '0003_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activities',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='activities',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='countryinfo',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='countryinfo',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='destinationguide',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='destinationguide',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='famousphotopoint',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='famousphotopoint',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='festivals',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='festivals',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='mainattraction',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='mainattraction',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='placeinformation',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='placeinformation',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='placestoeat',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='placestoeat',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='placestovisit',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='placestovisit',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='thingstodo',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='thingstodo',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='travelhacks',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='travelhacks',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
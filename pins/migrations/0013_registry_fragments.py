@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0012_pin_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pinregistry',
+            name='fragment',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='fragment_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
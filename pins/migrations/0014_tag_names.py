@@ -0,0 +1,162 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:54
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import migrations, models
+from django.db.models import OuterRef
+
+
+PIN_MODELS = [
+    'MainAttraction', 'ThingsToDo', 'PlacesToVisit', 'PlacesToEat', 'Market', 'CountryInfo',
+    'DestinationGuide', 'PlaceInformation', 'TravelHacks', 'Festivals', 'FamousPhotoPoint',
+    'Activities', 'Hotel',
+]
+
+
+def _tag_names(TaggedItem, app_label, model_name):
+    return ArraySubquery(
+        TaggedItem.objects
+        .filter(content_type__app_label=app_label, content_type__model=model_name, object_id=OuterRef('pk'))
+        .order_by('tag__name')
+        .values('tag__name')
+    )
+
+
+def fill_tag_names(apps, schema_editor):
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    for model_name in PIN_MODELS:
+        model = apps.get_model('pins', model_name)
+        model.objects.update(tag_names=_tag_names(TaggedItem, 'pins', model_name.lower()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0002_boundarypiece'),
+        ('pins', '0013_registry_fragments'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activities',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='countryinfo',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='destinationguide',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='famousphotopoint',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='festivals',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='mainattraction',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='market',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='placeinformation',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='placestoeat',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='placestovisit',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='thingstodo',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='travelhacks',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.RunPython(fill_tag_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='activities',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='activity_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='countryinfo',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='ctryinfo_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='destinationguide',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='destguide_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='famousphotopoint',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='photopoint_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='festivals',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='festival_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='hotel_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='mainattraction',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='mainattr_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='market',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='market_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='placeinformation',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='placeinfo_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='placestoeat',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='pteat_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='placestovisit',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='ptvisit_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='thingstodo',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='thingstodo_tags_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='travelhacks',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='travelhack_tags_gin'),
+        ),
+    ]
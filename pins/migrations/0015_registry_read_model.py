@@ -0,0 +1,126 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:00
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+PIN_CATEGORIES = {
+    'main-attractions': 'MainAttraction',
+    'things-to-do': 'ThingsToDo',
+    'places-to-visit': 'PlacesToVisit',
+    'places-to-eat': 'PlacesToEat',
+    'markets': 'Market',
+    'country-info': 'CountryInfo',
+    'destination-guides': 'DestinationGuide',
+    'place-information': 'PlaceInformation',
+    'travel-hacks': 'TravelHacks',
+    'festivals': 'Festivals',
+    'famous-photo-points': 'FamousPhotoPoint',
+    'activities': 'Activities',
+    'hotels': 'Hotel',
+}
+
+COPIED_FIELDS = [
+    'name', 'state_id', 'country_id', 'description', 'header_image', 'icon', 'marker_icon',
+    'link', 'rating', 'tag_names', 'social_post_count', 'faq_count',
+]
+
+
+def fill_registry(apps, schema_editor):
+    PinRegistry = apps.get_model('pins', 'PinRegistry')
+    for category, model_name in PIN_CATEGORIES.items():
+        source = apps.get_model('pins', model_name).objects.filter(pk=OuterRef('pin_id')).order_by()
+        PinRegistry.objects.filter(category=category).update(**{
+            field: Subquery(source.values(field)[:1]) for field in COPIED_FIELDS
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0002_boundarypiece'),
+        ('pins', '0014_tag_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pinregistry',
+            name='country',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.country'),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='description',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='faq_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='header_image',
+            field=models.URLField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='icon',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='link',
+            field=models.URLField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='marker_icon',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='name',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='rating',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='social_post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='state',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='location.state'),
+        ),
+        migrations.AddField(
+            model_name='pinregistry',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, size=None),
+        ),
+        migrations.RunPython(fill_registry, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='pinregistry',
+            index=models.Index(models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='registry_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pinregistry',
+            index=models.Index(models.F('country'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='registry_country_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pinregistry',
+            index=models.Index(models.F('state'), models.F('published'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), name='registry_state_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pinregistry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='registry_tags_gin'),
+        ),
+    ]
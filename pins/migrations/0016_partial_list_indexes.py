@@ -0,0 +1,141 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:02
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction; building
+    # concurrently keeps the pin tables writable while the indexes are built.
+    atomic = False
+
+    dependencies = [
+        ('location', '0002_boundarypiece'),
+        ('pins', '0015_registry_read_model'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='pinregistry',
+            name='registry_rank_idx',
+        ),
+        AddIndexConcurrently(
+            model_name='activities',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='activity_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='activities',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='activity_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='countryinfo',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='ctryinfo_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='countryinfo',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='ctryinfo_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='destinationguide',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='destguide_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='destinationguide',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='destguide_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='famousphotopoint',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='photopoint_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='famousphotopoint',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='photopoint_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='festivals',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='festival_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='festivals',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='festival_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='hotel',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='hotel_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='hotel',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='hotel_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='mainattraction',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='mainattr_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='mainattraction',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='mainattr_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='market',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='market_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='market',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='market_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='pinregistry',
+            index=models.Index(models.Case(models.When(category='main-attractions', then=0), models.When(category='things-to-do', then=1), models.When(category='places-to-visit', then=2), models.When(category='places-to-eat', then=3), models.When(category='markets', then=4), models.When(category='country-info', then=5), models.When(category='destination-guides', then=6), models.When(category='place-information', then=7), models.When(category='travel-hacks', then=8), models.When(category='festivals', then=9), models.When(category='famous-photo-points', then=10), models.When(category='activities', then=11), models.When(category='hotels', then=12)), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='registry_list_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='pinregistry',
+            index=models.Index(models.F('category'), models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='registry_category_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='pinregistry',
+            index=models.Index(condition=models.Q(('published', True)), fields=['slug'], include=('category', 'pin_id', 'version', 'updated_at'), name='registry_slug_cover_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='placeinformation',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='placeinfo_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='placeinformation',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='placeinfo_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='placestoeat',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='pteat_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='placestoeat',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='pteat_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='placestovisit',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='ptvisit_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='placestovisit',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='ptvisit_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='thingstodo',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='thingstodo_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='thingstodo',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='thingstodo_city_pub_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travelhacks',
+            index=models.Index(models.OrderBy(models.F('rating'), descending=True, nulls_last=True), models.F('name'), condition=models.Q(('published', True)), name='travelhack_pub_rank_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='travelhacks',
+            index=models.Index(condition=models.Q(('published', True)), fields=['city', 'name'], name='travelhack_city_pub_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:07
+
+from django.db import migrations, models
+from django.db.models import F, Func, Value
+
+
+def fill_geohash(apps, schema_editor):
+    PinRegistry = apps.get_model('pins', 'PinRegistry')
+    PinRegistry.objects.update(geohash=Func(F('point'), Value(12), function='ST_GeoHash'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0016_partial_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pinregistry',
+            name='geohash',
+            field=models.CharField(blank=True, db_collation='C', default='', max_length=12),
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:10
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+LEVELS = {
+    'country': 'country_id',
+    'state': 'state_id',
+    'city': 'city_id',
+}
+
+
+def fill_region_pin_counts(apps, schema_editor):
+    PinRegistry = apps.get_model('pins', 'PinRegistry')
+    RegionPinCount = apps.get_model('pins', 'RegionPinCount')
+    for level, column in LEVELS.items():
+        rows = (
+            PinRegistry.objects
+            .exclude(**{column: None})
+            .order_by()
+            .values(column, 'category')
+            .annotate(pins=Count('pk'), published=Count('pk', filter=Q(published=True)))
+        )
+        RegionPinCount.objects.bulk_create([
+            RegionPinCount(
+                level=level,
+                region_id=row[column],
+                category=row['category'],
+                pin_count=row['pins'],
+                published_count=row['published']
+            )
+            for row in rows
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0017_registry_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegionPinCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.CharField(choices=[('country', 'Country'), ('state', 'State'), ('city', 'City')], max_length=8)),
+                ('region_id', models.BigIntegerField()),
+                ('category', models.CharField(max_length=32)),
+                ('pin_count', models.PositiveIntegerField(default=0)),
+                ('published_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'region_pin_counts',
+                'ordering': ['level', 'region_id', 'category'],
+                'constraints': [models.UniqueConstraint(fields=('level', 'region_id', 'category'), name='unique_region_pin_count')],
+            },
+        ),
+        migrations.RunPython(fill_region_pin_counts, migrations.RunPython.noop),
+    ]
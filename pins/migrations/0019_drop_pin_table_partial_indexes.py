@@ -0,0 +1,121 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:37
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction; dropping
+    # concurrently keeps the pin tables writable while the indexes go away.
+    atomic = False
+
+    dependencies = [
+        ('pins', '0018_region_pin_counts'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='activities',
+            name='activity_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='activities',
+            name='activity_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='countryinfo',
+            name='ctryinfo_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='countryinfo',
+            name='ctryinfo_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='destinationguide',
+            name='destguide_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='destinationguide',
+            name='destguide_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='famousphotopoint',
+            name='photopoint_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='famousphotopoint',
+            name='photopoint_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='festivals',
+            name='festival_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='festivals',
+            name='festival_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='hotel',
+            name='hotel_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='hotel',
+            name='hotel_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='mainattraction',
+            name='mainattr_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='mainattraction',
+            name='mainattr_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='market',
+            name='market_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='market',
+            name='market_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='placeinformation',
+            name='placeinfo_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='placeinformation',
+            name='placeinfo_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='placestoeat',
+            name='pteat_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='placestoeat',
+            name='pteat_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='placestovisit',
+            name='ptvisit_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='placestovisit',
+            name='ptvisit_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='thingstodo',
+            name='thingstodo_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='thingstodo',
+            name='thingstodo_city_pub_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='travelhacks',
+            name='travelhack_pub_rank_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='travelhacks',
+            name='travelhack_city_pub_idx',
+        ),
+    ]
@@ -1,14 +1,28 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.utils.text import slugify
-from django.db.models import F
+from django.db.models import Case, F, Q, When
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from taggit.managers import TaggableManager
-from location.models import City
+from location.models import Country, State, City, Specialzone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import User
 
 
+def unique_slug(prefix, name):
+    """
+    Return ``{prefix}-{name}-{random suffix}``, drawing suffixes until no
+    registered pin of any category uses the slug (registry slugs are unique).
+    """
+    base_slug = slugify(name)[:200]
+    while True:
+        slug = f"{prefix}-{base_slug}-{uuid.uuid4().hex[:5]}"
+        if not PinRegistry.objects.filter(slug=slug).exists():
+            return slug
+
+
 
  
 class MainAttraction(models.Model):
@@ -20,6 +34,24 @@ class MainAttraction(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -50,8 +82,24 @@ class MainAttraction(models.Model):
     )
  
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -76,17 +124,31 @@ class MainAttraction(models.Model):
                 name="unique_attraction_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="mainattr_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="mainattr_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="mainattr_tags_gin"
+            ),
+        ]
 
 
 
     def save(self, *args, **kwargs):
         # Generate slug ONLY on object creation
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"mainattraction-{base_slug}-{random_suffix}"
+            self.slug = unique_slug("mainattraction", self.name)
 
-        super().save(*args, **kwargs)
+        # Atomic so the pins.signals receivers (registry, fragments) commit with the row
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
  
     def __str__(self):
@@ -102,6 +164,24 @@ class ThingsToDo(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -130,8 +210,24 @@ class ThingsToDo(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -156,13 +252,26 @@ class ThingsToDo(models.Model):
                 name="unique_things_to_do_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="thingstodo_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="thingstodo_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="thingstodo_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"thingstodo-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("thingstodo", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -178,6 +287,24 @@ class PlacesToVisit(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -206,8 +333,24 @@ class PlacesToVisit(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -232,13 +375,26 @@ class PlacesToVisit(models.Model):
                 name="unique_places_to_visit_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="ptvisit_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="ptvisit_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="ptvisit_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"placestovisit-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("placestovisit", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -255,6 +411,24 @@ class PlacesToEat(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -283,8 +457,24 @@ class PlacesToEat(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -309,13 +499,26 @@ class PlacesToEat(models.Model):
                 name="unique_places_to_eat_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="pteat_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="pteat_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="pteat_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"placestoeat-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("placestoeat", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -330,6 +533,24 @@ class Market(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -358,8 +579,24 @@ class Market(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -384,13 +621,26 @@ class Market(models.Model):
                 name="unique_market_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="market_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="market_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="market_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"market-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("market", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -404,6 +654,24 @@ class CountryInfo(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -432,8 +700,24 @@ class CountryInfo(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -458,13 +742,26 @@ class CountryInfo(models.Model):
                 name="unique_country_info_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="ctryinfo_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="ctryinfo_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="ctryinfo_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"countryinfo-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("countryinfo", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -478,6 +775,24 @@ class DestinationGuide(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
     created_by = models.ForeignKey(
     User,
     on_delete=models.SET_NULL,
@@ -506,8 +821,24 @@ class DestinationGuide(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -532,13 +863,26 @@ class DestinationGuide(models.Model):
                 name="unique_destination_guide_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="destguide_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="destguide_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="destguide_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"destinationguide-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("destinationguide", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -553,6 +897,24 @@ class PlaceInformation(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
     created_by = models.ForeignKey(
     User,
     on_delete=models.SET_NULL,
@@ -583,8 +945,24 @@ class PlaceInformation(models.Model):
     )
  
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -609,13 +987,26 @@ class PlaceInformation(models.Model):
                 name="unique_place_information_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="placeinfo_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="placeinfo_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="placeinfo_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"placeinformation-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("placeinformation", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -632,6 +1023,24 @@ class TravelHacks(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -660,8 +1069,24 @@ class TravelHacks(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -686,13 +1111,26 @@ class TravelHacks(models.Model):
                 name="unique_travel_hacks_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="travelhack_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="travelhack_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="travelhack_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"travelhacks-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("travelhacks", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -708,6 +1146,24 @@ class Festivals(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -736,8 +1192,24 @@ class Festivals(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -762,13 +1234,26 @@ class Festivals(models.Model):
                 name="unique_festival_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="festival_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="festival_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="festival_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"festivals-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("festivals", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -784,6 +1269,24 @@ class FamousPhotoPoint(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -812,8 +1315,24 @@ class FamousPhotoPoint(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -838,13 +1357,26 @@ class FamousPhotoPoint(models.Model):
                 name="unique_famous_photo_point_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="photopoint_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="photopoint_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="photopoint_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"famousphotopoint-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("famousphotopoint", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -860,6 +1392,24 @@ class Activities(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -888,8 +1438,24 @@ class Activities(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
  
     link = models.URLField(blank=True, null=True)
  
@@ -914,13 +1480,26 @@ class Activities(models.Model):
                 name="unique_activity_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="activity_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="activity_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="activity_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"activities-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("activities", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
@@ -949,6 +1528,24 @@ class Hotel(models.Model):
         City,
         on_delete=models.CASCADE
     )
+
+    # Denormalized from city so region filters need no joins; kept in sync by pins.signals.
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+"
+    )
  
     pin = gis_models.PointField(
         srid=4326
@@ -976,6 +1573,14 @@ class Hotel(models.Model):
         blank=True
     )
     tags = TaggableManager(blank=True)
+
+    # Sorted copy of the tag names, kept in sync with taggit by pins.signals (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
  
     category = models.ForeignKey(
         HotelCategory,
@@ -997,6 +1602,14 @@ class Hotel(models.Model):
     )
     link = models.URLField(blank=True, null=True)
     published = models.BooleanField(default=False)
+
+    # Bumped on every change to the pin or the rows shown with it (see pins.versioning).
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Published social posts and FAQs attached to the pin (see pins.counters).
+    social_post_count = models.PositiveIntegerField(default=0, editable=False)
+    faq_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         db_table = "hotels"
@@ -1007,15 +1620,286 @@ class Hotel(models.Model):
                 name="unique_hotel_slug_per_city"
             )
         ]
+        indexes = [
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="hotel_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="hotel_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="hotel_tags_gin"
+            ),
+        ]
  
     def save(self, *args, **kwargs):
         if not self.pk:
-            base_slug = slugify(self.name)[:200]
-            random_suffix = uuid.uuid4().hex[:5]
-            self.slug = f"hotel-{base_slug}-{random_suffix}"
-        super().save(*args, **kwargs)
+            self.slug = unique_slug("hotel", self.name)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
  
     def __str__(self):
         return f"{self.name} ({self.city.name})"
 
 
+
+
+# Public category key (as used by the API) for every pin model.
+PIN_CATEGORIES = {
+    'main-attractions': MainAttraction,
+    'things-to-do': ThingsToDo,
+    'places-to-visit': PlacesToVisit,
+    'places-to-eat': PlacesToEat,
+    'markets': Market,
+    'country-info': CountryInfo,
+    'destination-guides': DestinationGuide,
+    'place-information': PlaceInformation,
+    'travel-hacks': TravelHacks,
+    'festivals': Festivals,
+    'famous-photo-points': FamousPhotoPoint,
+    'activities': Activities,
+    'hotels': Hotel,
+}
+
+PIN_MODELS = tuple(PIN_CATEGORIES.values())
+
+CATEGORY_BY_MODEL = {model: key for key, model in PIN_CATEGORIES.items()}
+
+# Rank of each category in cross-category lists (the PIN_CATEGORIES order).
+CATEGORY_ORDER = Case(
+    *[When(category=category, then=rank) for rank, category in enumerate(PIN_CATEGORIES)]
+)
+
+
+class PinZoneMembership(models.Model):
+    """Precomputed link between a pin of any category and a special zone containing it."""
+
+    zone = models.ForeignKey(
+        Specialzone,
+        on_delete=models.CASCADE,
+        related_name="pin_memberships"
+    )
+
+    category = models.CharField(max_length=32)
+    pin_id = models.BigIntegerField()
+
+    class Meta:
+        db_table = "pin_zone_memberships"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["zone", "category", "pin_id"],
+                name="unique_pin_per_zone"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["category", "pin_id"], name="pin_zone_pin_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.category}:{self.pin_id} in {self.zone_id}"
+
+
+class DuplicatePinCandidate(models.Model):
+    """Pair of nearby, similarly named pins reported by the find_duplicate_pins command."""
+
+    category_a = models.CharField(max_length=32)
+    pin_id_a = models.BigIntegerField()
+    name_a = models.CharField(max_length=255)
+
+    category_b = models.CharField(max_length=32)
+    pin_id_b = models.BigIntegerField()
+    name_b = models.CharField(max_length=255)
+
+    distance = models.FloatField(help_text="Distance in meters")
+    similarity = models.FloatField(help_text="Name similarity between 0 and 1")
+
+    detected_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "duplicate_pin_candidates"
+        ordering = ["distance", "-similarity"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category_a", "pin_id_a", "category_b", "pin_id_b"],
+                name="unique_duplicate_pin_pair"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.name_a} / {self.name_b} ({self.distance:.0f} m)"
+
+
+class PinRegistry(models.Model):
+    """
+    Cross-category read model: one row per pin of any category with the
+    columns the 13 pin tables share, so slug lookups and list, search,
+    bbox and zone reads are single queries. Maintained by pins.signals in
+    the pin's own transaction (see pins.registry).
+    """
+
+    slug = models.SlugField(max_length=255, unique=True)
+
+    category = models.CharField(max_length=32)
+    pin_id = models.BigIntegerField()
+
+    name = models.CharField(max_length=255, default="")
+
+    city = models.ForeignKey(
+        City,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+    state = models.ForeignKey(
+        State,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+    country = models.ForeignKey(
+        Country,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+
+    point = gis_models.PointField(
+        srid=4326
+    )
+    # Geohash of the point, the partition key of the geohash scheme (see pins.partitioning)
+    geohash = models.CharField(max_length=12, blank=True, default="", db_collation="C")
+
+    description = models.TextField(blank=True)
+    header_image = models.URLField(blank=True, null=True)
+    icon = models.CharField(max_length=100, blank=True)
+    marker_icon = models.CharField(max_length=100, blank=True)
+    link = models.URLField(blank=True, null=True)
+    rating = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+
+    tag_names = ArrayField(models.CharField(max_length=100), default=list, blank=True)
+    social_post_count = models.PositiveIntegerField(default=0)
+    faq_count = models.PositiveIntegerField(default=0)
+
+    published = models.BooleanField(default=False)
+
+    version = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    # Encoded list representation of the pin, valid while fragment_version == version (see pins.fragments)
+    fragment = models.BinaryField(null=True, editable=False)
+    fragment_version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        db_table = "pin_registry"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "pin_id"],
+                name="unique_registry_pin"
+            )
+        ]
+        indexes = [
+            # Partial indexes matching the read shapes: all published pins in
+            # list order, one category's published pins, and slug lookups
+            # answered from the index alone
+            models.Index(
+                CATEGORY_ORDER, F("rating").desc(nulls_last=True), F("name"),
+                name="registry_list_idx",
+                condition=Q(published=True)
+            ),
+            models.Index(
+                F("category"), F("rating").desc(nulls_last=True), F("name"),
+                name="registry_category_rank_idx",
+                condition=Q(published=True)
+            ),
+            models.Index(
+                fields=["slug"],
+                include=["category", "pin_id", "version", "updated_at"],
+                name="registry_slug_cover_idx",
+                condition=Q(published=True)
+            ),
+            models.Index(
+                F("country"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="registry_country_rank_idx"
+            ),
+            models.Index(
+                F("state"), F("published"), F("rating").desc(nulls_last=True), F("name"),
+                name="registry_state_rank_idx"
+            ),
+            GinIndex(
+                fields=["tag_names"],
+                name="registry_tags_gin"
+            ),
+        ]
+
+    def __str__(self):
+        return self.slug
+
+
+class CityBundle(models.Model):
+    """
+    Prebuilt, gzip-compressed landing page payload of a city (see pins.bundles).
+
+    ``generation`` is bumped whenever something shown in the bundle changes;
+    the bundle is stale while ``built_generation`` lags behind it.
+    """
+
+    city = models.OneToOneField(
+        City,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+"
+    )
+
+    data = models.BinaryField(default=bytes)
+
+    generation = models.PositiveIntegerField(default=1)
+    built_generation = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "city_bundles"
+
+    def __str__(self):
+        return f"Bundle of city {self.city_id}"
+
+    @property
+    def stale(self):
+        return self.built_generation < self.generation
+
+
+class RegionPinCount(models.Model):
+    """
+    Number of pins of one category in one country, state or city (see
+    pins.aggregates). Kept up to date by pins.signals, so region pages and
+    dashboards read their counts with a single index lookup.
+    """
+
+    LEVEL_CHOICES = [
+        ("country", "Country"),
+        ("state", "State"),
+        ("city", "City"),
+    ]
+
+    level = models.CharField(max_length=8, choices=LEVEL_CHOICES)
+    region_id = models.BigIntegerField()
+    category = models.CharField(max_length=32)
+
+    pin_count = models.PositiveIntegerField(default=0)
+    published_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "region_pin_counts"
+        ordering = ["level", "region_id", "category"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["level", "region_id", "category"],
+                name="unique_region_pin_count"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.category} in {self.level} {self.region_id}: {self.published_count}"
@@ -0,0 +1,461 @@
+"""
+Optional partitioning of the pin registry (the cross-category read table).
+
+Two schemes are supported:
+
+- ``country``: LIST partitions on ``country_id``, one per country plus a
+  DEFAULT partition (pins without a country, countries added later).
+- ``geohash``: RANGE partitions on the ``geohash`` column, one per geohash
+  prefix of ``precision`` characters (32 or 1024 partitions) plus DEFAULT.
+
+Queries carrying the partition key (``country_id=...``, or the geohash
+ranges ``geohash_filter`` adds to bbox filters when
+``settings.PIN_REGISTRY_PARTITIONING == 'geohash'``) only touch the
+matching partitions, and each partition is vacuumed on its own. The
+setting must name the scheme the table is partitioned by, since registry
+writes move the row of a pin whose partition key changed (see
+``registry.sync_pin``).
+
+Only ``pin_registry`` is partitioned: the 13 pin tables, and the reads
+that still go to them (pin details, city bundles, fragment rendering),
+are unchanged.
+
+``repartition`` converts the live table (plain or already partitioned)
+online: it builds the new partitioned table next to it, copies the rows
+in batches while a trigger records the ids changed meanwhile, replays
+them, and swaps the tables under a short exclusive lock. PostgreSQL
+requires unique constraints and the primary key of a partitioned table to
+include the partition key, so they are widened with it.
+
+Slugs stay unique across partitions through ``pin_registry_slugs``, a
+plain table keyed by slug that a trigger on the registry keeps in step
+with it: a duplicate slug in any partition fails on its primary key.
+``repartition`` refuses to run while the registry holds duplicate slugs.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from location.models import Country
+from .models import PinRegistry
+
+SCHEMES = ('country', 'geohash')
+
+PARTITION_KEYS = {'country': 'country_id', 'geohash': 'geohash'}
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 12
+
+# Beyond this many cells a bbox filter is left to the spatial index alone.
+MAX_FILTER_CELLS = 32
+
+TABLE = PinRegistry._meta.db_table
+NEXT = f'{TABLE}_next'
+OLD = f'{TABLE}_old'
+CHANGES = f'{TABLE}_changes'
+CAPTURE = f'{TABLE}_capture'
+SLUGS = f'{TABLE}_slugs'
+SLUG_GUARD = f'{TABLE}_slug_guard'
+
+
+def partition_key():
+    """
+    Partition key column of the registry, as declared by
+    ``settings.PIN_REGISTRY_PARTITIONING``, or None for a plain table.
+    """
+    return PARTITION_KEYS.get(getattr(settings, 'PIN_REGISTRY_PARTITIONING', None))
+
+
+# Geohashes
+
+def encode_geohash(point, precision=GEOHASH_PRECISION):
+    """Geohash of a WGS84 point (the same value as PostGIS ST_GeoHash)."""
+    if point is None:
+        return ''
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    bits, even, value, chars = 0, True, 0, []
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, point.x) if even else (lat_range, point.y)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def _prefix_upper_bound(prefix):
+    """Smallest string above every geohash starting with ``prefix``, or None for MAXVALUE."""
+    while prefix and prefix[-1] == GEOHASH_ALPHABET[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + GEOHASH_ALPHABET[GEOHASH_ALPHABET.index(prefix[-1]) + 1]
+
+
+def _prefixes(precision):
+    prefixes = ['']
+    for _ in range(precision):
+        prefixes = [prefix + char for prefix in prefixes for char in GEOHASH_ALPHABET]
+    return prefixes
+
+
+def geohash_cells(bbox, precision):
+    """Geohash prefixes of ``precision`` characters covering a bbox polygon, or None if too many."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    lon_step, lat_step = 360 / 2 ** lon_bits, 180 / 2 ** lat_bits
+    min_x, min_y, max_x, max_y = bbox.extent
+
+    columns = int(max_x // lon_step - min_x // lon_step) + 1
+    rows = int(max_y // lat_step - min_y // lat_step) + 1
+    if columns * rows > MAX_FILTER_CELLS:
+        return None
+
+    from django.contrib.gis.geos import Point
+    cells = set()
+    for row in range(rows):
+        y = min(max_y, (min_y // lat_step + row) * lat_step + lat_step / 2)
+        for column in range(columns):
+            x = min(max_x, (min_x // lon_step + column) * lon_step + lon_step / 2)
+            cells.add(encode_geohash(Point(x, y), precision))
+    return sorted(cells)
+
+
+def geohash_filter(bbox):
+    """
+    Geohash range filter matching the partitions a bbox can touch, or None.
+
+    Only added when the registry is partitioned by geohash, where it lets
+    the planner prune every partition outside the viewport.
+    """
+    if getattr(settings, 'PIN_REGISTRY_PARTITIONING', None) != 'geohash':
+        return None
+    cells = geohash_cells(bbox, getattr(settings, 'PIN_REGISTRY_GEOHASH_PRECISION', 1))
+    if not cells:
+        return None
+    filters = Q()
+    for cell in cells:
+        upper = _prefix_upper_bound(cell)
+        filters |= Q(geohash__gte=cell, geohash__lt=upper) if upper else Q(geohash__gte=cell)
+    return filters
+
+
+# Partition layout
+
+def current_scheme():
+    """Return the partition key definition of the registry (e.g. ``LIST (country_id)``), or None."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT pg_get_partkeydef(c.oid) FROM pg_partitioned_table p '
+            'JOIN pg_class c ON c.oid = p.partrelid '
+            'WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace',
+            [TABLE]
+        )
+        row = cursor.fetchone()
+    return row and row[0]
+
+
+def partitions(scheme, precision=1):
+    """Return [(suffix, bound SQL)] of the partitions of a scheme."""
+    if scheme == 'country':
+        layout = [
+            (f'c{country_id}', f'FOR VALUES IN ({int(country_id)})')
+            for country_id in Country.objects.order_by('pk').values_list('pk', flat=True)
+        ]
+    else:
+        layout = []
+        for prefix in _prefixes(precision):
+            upper = _prefix_upper_bound(prefix)
+            upper = f"'{upper}'" if upper else 'MAXVALUE'
+            layout.append((f'g{prefix}', f"FOR VALUES FROM ('{prefix}') TO ({upper})"))
+    return [*layout, ('default', 'DEFAULT')]
+
+
+def _columns_group(definition):
+    """Return (start, end) of the first parenthesized column list of an index or constraint definition."""
+    start = definition.index('(', definition.index(' USING ') if ' USING ' in definition else 0)
+    depth = 0
+    for position in range(start, len(definition)):
+        if definition[position] == '(':
+            depth += 1
+        elif definition[position] == ')':
+            depth -= 1
+            if depth == 0:
+                return start, position
+    raise ValueError(f'Unbalanced definition: {definition}')
+
+
+def _with_key(definition, key, old_key=None):
+    """Rewrite the column list of a unique definition to end with the partition key."""
+    start, end = _columns_group(definition)
+    columns = [column.strip() for column in definition[start + 1:end].split(',')]
+    if old_key and columns[-1] == old_key and len(columns) > 1:
+        columns.pop()
+    if key not in columns:
+        columns.append(key)
+    return definition[:start + 1] + ', '.join(columns) + definition[end:]
+
+
+def _table_objects(cursor, table):
+    """Return (constraints, indexes) of a table: [(name, definition)] each, excluding the primary key (or its stand-in)."""
+    cursor.execute(
+        'SELECT conname, pg_get_constraintdef(oid), contype FROM pg_constraint '
+        'WHERE conrelid = %s::regclass AND contype IN (%s, %s) AND conname <> %s ORDER BY conname',
+        [table, 'u', 'f', f'{table}_pkey']
+    )
+    constraints = [(name, definition) for name, definition, _ in cursor.fetchall()]
+    cursor.execute(
+        'SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x '
+        'JOIN pg_class i ON i.oid = x.indexrelid '
+        'LEFT JOIN pg_constraint c ON c.conindid = x.indexrelid AND c.conrelid = x.indrelid '
+        'WHERE x.indrelid = %s::regclass AND c.oid IS NULL ORDER BY i.relname',
+        [table]
+    )
+    return constraints, cursor.fetchall()
+
+
+def _partition_names(cursor, table):
+    cursor.execute(
+        'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+        'WHERE i.inhparent = %s::regclass ORDER BY c.relname',
+        [table]
+    )
+    return [name for name, in cursor.fetchall()]
+
+
+# Online conversion
+
+def cleanup(cursor):
+    """Drop what an interrupted ``repartition`` left behind."""
+    cursor.execute(f'DROP TRIGGER IF EXISTS {CAPTURE} ON {TABLE}')
+    cursor.execute(f'DROP FUNCTION IF EXISTS {CAPTURE}()')
+    cursor.execute(f'DROP TABLE IF EXISTS {CHANGES}')
+    cursor.execute(f'DROP TABLE IF EXISTS {NEXT} CASCADE')
+
+
+def _create_next(cursor, scheme, precision, old_key):
+    key = PARTITION_KEYS[scheme]
+    strategy = 'LIST' if scheme == 'country' else 'RANGE'
+    cursor.execute(
+        f'CREATE TABLE {NEXT} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY {strategy} ({key})'
+    )
+    # Identity columns cannot be declared on partitioned tables before PostgreSQL 17
+    cursor.execute(f'CREATE SEQUENCE {NEXT}_id_seq OWNED BY {NEXT}.id')
+    cursor.execute(f"ALTER TABLE {NEXT} ALTER COLUMN id SET DEFAULT nextval('{NEXT}_id_seq')")
+    # A primary key would make the partition key NOT NULL, but pins without a
+    # country belong in the DEFAULT partition: a nullable key gets a unique
+    # constraint (under the primary key's name) instead.
+    cursor.execute(
+        'SELECT attnotnull FROM pg_attribute WHERE attrelid = %s::regclass AND attname = %s',
+        [NEXT, key]
+    )
+    constraint = 'PRIMARY KEY' if cursor.fetchone()[0] else 'UNIQUE'
+    cursor.execute(f'ALTER TABLE {NEXT} ADD CONSTRAINT {NEXT}_pkey {constraint} (id, {key})')
+    for suffix, bound in partitions(scheme, precision):
+        cursor.execute(f'CREATE TABLE {NEXT}_{suffix} PARTITION OF {NEXT} {bound}')
+
+    constraints, indexes = _table_objects(cursor, TABLE)
+    for name, definition in indexes:
+        definition = re.sub(r'^CREATE (UNIQUE )?INDEX \S+ ON (ONLY )?\S+', rf'CREATE \1INDEX {name}_next ON {NEXT}', definition)
+        if definition.startswith('CREATE UNIQUE'):
+            definition = _with_key(definition, key, old_key)
+        cursor.execute(definition)
+    return constraints
+
+
+def _add_constraints(cursor, constraints, key, old_key):
+    for name, definition in constraints:
+        if definition.startswith('UNIQUE'):
+            definition = _with_key(definition, key, old_key)
+        cursor.execute(f'ALTER TABLE {NEXT} ADD CONSTRAINT {name}_next {definition}')
+
+
+def _start_capture(cursor):
+    cursor.execute(f'CREATE TABLE {CHANGES} (id bigint PRIMARY KEY)')
+    cursor.execute(f'''
+        CREATE FUNCTION {CAPTURE}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO {CHANGES} VALUES (OLD.id) ON CONFLICT DO NOTHING;
+            ELSE
+                INSERT INTO {CHANGES} VALUES (NEW.id) ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END $$
+    ''')
+    cursor.execute(
+        f'CREATE TRIGGER {CAPTURE} AFTER INSERT OR UPDATE OR DELETE ON {TABLE} '
+        f'FOR EACH ROW EXECUTE FUNCTION {CAPTURE}()'
+    )
+
+
+def _replay(cursor, limit=None):
+    """Copy the rows changed since capture started (at most ``limit``). Returns how many."""
+    limit_sql = f'LIMIT {int(limit)}' if limit else ''
+    cursor.execute(f'DELETE FROM {CHANGES} WHERE id IN (SELECT id FROM {CHANGES} {limit_sql}) RETURNING id')
+    ids = [row[0] for row in cursor.fetchall()]
+    if ids:
+        cursor.execute(f'DELETE FROM {NEXT} WHERE id = ANY(%s)', [ids])
+        cursor.execute(f'INSERT INTO {NEXT} SELECT * FROM {TABLE} WHERE id = ANY(%s)', [ids])
+    return len(ids)
+
+
+def duplicate_slugs(cursor, limit=20):
+    """Return up to ``limit`` slugs held by more than one registry row."""
+    cursor.execute(
+        f'SELECT slug FROM {TABLE} GROUP BY slug HAVING COUNT(*) > 1 ORDER BY slug LIMIT %s',
+        [limit]
+    )
+    return [slug for slug, in cursor.fetchall()]
+
+
+def _create_slug_guard(cursor, table):
+    cursor.execute(
+        f'CREATE TRIGGER {SLUG_GUARD} AFTER INSERT OR UPDATE OF slug OR DELETE ON {table} '
+        f'FOR EACH ROW EXECUTE FUNCTION {SLUG_GUARD}()'
+    )
+
+
+def install_slug_guard(cursor):
+    """Create and fill the global slug table and its trigger on the live registry (idempotent)."""
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS {SLUGS} (slug varchar(255) PRIMARY KEY)')
+    cursor.execute(f'''
+        CREATE OR REPLACE FUNCTION {SLUG_GUARD}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.slug <> NEW.slug) THEN
+                DELETE FROM {SLUGS} WHERE slug = OLD.slug;
+            END IF;
+            IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND OLD.slug <> NEW.slug) THEN
+                INSERT INTO {SLUGS} VALUES (NEW.slug);
+            END IF;
+            RETURN NULL;
+        END $$
+    ''')
+    cursor.execute(
+        'SELECT 1 FROM pg_trigger WHERE tgrelid = %s::regclass AND tgname = %s',
+        [TABLE, SLUG_GUARD]
+    )
+    if cursor.fetchone() is None:
+        _create_slug_guard(cursor, TABLE)
+    # Rows written before the trigger existed
+    cursor.execute(f'INSERT INTO {SLUGS} SELECT slug FROM {TABLE} ON CONFLICT DO NOTHING')
+    cursor.execute(f'DELETE FROM {SLUGS} s WHERE NOT EXISTS (SELECT 1 FROM {TABLE} r WHERE r.slug = s.slug)')
+
+
+def _swap(cursor, keep_old):
+    cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+    while _replay(cursor):
+        pass
+    cursor.execute(f'DROP TRIGGER {CAPTURE} ON {TABLE}')
+    cursor.execute(f'DROP FUNCTION {CAPTURE}()')
+    cursor.execute(f'DROP TABLE {CHANGES}')
+
+    cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [TABLE, 'id'])
+    old_sequence = cursor.fetchone()[0]
+    cursor.execute(
+        f"SELECT setval('{NEXT}_id_seq', GREATEST((SELECT last_value FROM {old_sequence}), "
+        f"(SELECT COALESCE(MAX(id), 1) FROM {NEXT})))"
+    )
+
+    # Move the old table and everything named after it out of the way
+    constraints, indexes = _table_objects(cursor, TABLE)
+    old_partitions = _partition_names(cursor, TABLE)
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {OLD}')
+    for name, _ in constraints:
+        cursor.execute(f'ALTER TABLE {OLD} RENAME CONSTRAINT {name} TO {name}_old')
+    for name, _ in indexes:
+        cursor.execute(f'ALTER INDEX {name} RENAME TO {name}_old')
+    for partition in old_partitions:
+        cursor.execute(f'ALTER TABLE {partition} RENAME TO {OLD}{partition[len(TABLE):]}')
+    cursor.execute(f'ALTER TABLE {OLD} RENAME CONSTRAINT {TABLE}_pkey TO {OLD}_pkey')
+    cursor.execute(f'ALTER SEQUENCE {old_sequence} RENAME TO {OLD}_id_seq')
+
+    # ...and give the new one the original names
+    new_partitions = _partition_names(cursor, NEXT)
+    cursor.execute(f'ALTER TABLE {NEXT} RENAME TO {TABLE}')
+    for name, _ in constraints:
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME CONSTRAINT {name}_next TO {name}')
+    for name, _ in indexes:
+        cursor.execute(f'ALTER INDEX {name}_next RENAME TO {name}')
+    for partition in new_partitions:
+        cursor.execute(f'ALTER TABLE {partition} RENAME TO {TABLE}{partition[len(NEXT):]}')
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME CONSTRAINT {NEXT}_pkey TO {TABLE}_pkey')
+    cursor.execute(f'ALTER SEQUENCE {NEXT}_id_seq RENAME TO {TABLE}_id_seq')
+
+    # The slug table already matches the rows just replayed; only its trigger moves
+    cursor.execute(f'DROP TRIGGER {SLUG_GUARD} ON {OLD}')
+    _create_slug_guard(cursor, TABLE)
+
+    if not keep_old:
+        cursor.execute(f'DROP TABLE {OLD} CASCADE')
+
+
+def repartition(scheme, precision=1, batch_size=10000, keep_old=False, log=print):
+    """Convert the registry to ``scheme`` online. Must run outside a transaction."""
+    if scheme not in SCHEMES:
+        raise ValueError(f'Unknown partitioning scheme {scheme!r}')
+    if connection.in_atomic_block:
+        raise RuntimeError('repartition commits as it goes and cannot run inside a transaction')
+
+    current = current_scheme()
+    old_key = re.search(r'\((\w+)\)', current).group(1) if current else None
+    key = PARTITION_KEYS[scheme]
+
+    with connection.cursor() as cursor:
+        cleanup(cursor)
+        # Checked once the guard is in place, so no duplicate can slip in afterwards
+        with transaction.atomic():
+            install_slug_guard(cursor)
+        duplicates = duplicate_slugs(cursor)
+        if duplicates:
+            raise RuntimeError(
+                'Slugs must be unique across the registry before partitioning; duplicated: '
+                + ', '.join(duplicates)
+            )
+        if scheme == 'geohash':
+            log('Filling missing geohashes')
+            cursor.execute(
+                f"UPDATE {TABLE} SET geohash = ST_GeoHash(point, %s) WHERE geohash = ''",
+                [GEOHASH_PRECISION]
+            )
+
+        with transaction.atomic():
+            constraints = _create_next(cursor, scheme, precision, old_key)
+            _start_capture(cursor)
+        log(f'Created {NEXT} partitioned by {key}, capturing changes')
+
+        cursor.execute(f'SELECT COALESCE(MIN(id), 0), COALESCE(MAX(id), 0) FROM {TABLE}')
+        low, high = cursor.fetchone()
+        for start in range(low, high + 1, batch_size):
+            cursor.execute(
+                f'INSERT INTO {NEXT} SELECT * FROM {TABLE} WHERE id >= %s AND id < %s',
+                [start, start + batch_size]
+            )
+            log(f'Copied ids {start}..{min(start + batch_size, high + 1) - 1} of {high}')
+
+        with transaction.atomic():
+            _add_constraints(cursor, constraints, key, old_key)
+
+        # Catch up outside the lock until only a handful of changes are left
+        while True:
+            with transaction.atomic():
+                replayed = _replay(cursor, batch_size)
+            if replayed < 100:
+                break
+            log(f'Replayed {replayed} changed rows')
+
+        with transaction.atomic():
+            _swap(cursor, keep_old)
+        cursor.execute(f'ANALYZE {TABLE}')
+    log(f'{TABLE} is now partitioned by {key}' + (f' (previous table kept as {OLD})' if keep_old else ''))
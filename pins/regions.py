@@ -0,0 +1,36 @@
+"""Denormalized state/country keys on pin rows."""
+from location.models import City, State
+from .models import PIN_MODELS, PinRegistry
+from . import aggregates
+
+
+def assign_region(pin):
+    """Copy state and country from the pin's city onto the (unsaved) pin instance."""
+    region = (
+        City.objects
+        .filter(pk=pin.city_id)
+        .values_list('state_id', 'state__country_id')
+        .first()
+    )
+    pin.state_id, pin.country_id = region or (None, None)
+
+
+def city_moved(city):
+    """Propagate a city's new state (and its country) to every pin in that city."""
+    country_id = State.objects.filter(pk=city.state_id).values_list('country_id', flat=True).first()
+    pins = PinRegistry.objects.filter(city=city)
+    deltas = aggregates.row_deltas(pins, -1)
+    for model in PIN_MODELS:
+        model.objects.filter(city=city).update(state_id=city.state_id, country_id=country_id)
+    pins.update(state_id=city.state_id, country_id=country_id)
+    aggregates.apply(aggregates.row_deltas(pins, 1, deltas))
+
+
+def state_moved(state):
+    """Propagate a state's new country to every pin in that state."""
+    pins = PinRegistry.objects.filter(city__state=state)
+    deltas = aggregates.row_deltas(pins, -1)
+    for model in PIN_MODELS:
+        model.objects.filter(city__state=state).update(country_id=state.country_id)
+    pins.update(country_id=state.country_id)
+    aggregates.apply(aggregates.row_deltas(pins, 1, deltas))
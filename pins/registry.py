@@ -0,0 +1,194 @@
+"""
+Global pin registry: the cross-category read model.
+
+One row per pin of any category, keyed by slug and by (category, pin_id),
+carrying the columns shared by every pin table. Pin saves and deletes
+sync their row from pins.signals inside the pin's transaction (pin saves
+are atomic, deletes always are); bulk updates of denormalized pin columns
+(counts, tag arrays, region keys) mirror themselves with ``copy_columns``.
+Reads spanning categories query this table alone.
+"""
+from django.db.models import DecimalField, Exists, F, OuterRef, Subquery, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+from unfotour import compression
+from .models import PIN_CATEGORIES, CATEGORY_BY_MODEL, CATEGORY_ORDER, PinRegistry
+from .partitioning import encode_geohash, partition_key
+
+BATCH_SIZE = 1000
+
+# Registry column -> pin model attribute, for the columns copied verbatim.
+COPIED_FIELDS = {
+    'slug': 'slug',
+    'name': 'name',
+    'city_id': 'city_id',
+    'state_id': 'state_id',
+    'country_id': 'country_id',
+    'point': 'pin',
+    'description': 'description',
+    'header_image': 'header_image',
+    'icon': 'icon',
+    'marker_icon': 'marker_icon',
+    'link': 'link',
+    'rating': 'rating',
+    'tag_names': 'tag_names',
+    'social_post_count': 'social_post_count',
+    'faq_count': 'faq_count',
+    'published': 'published',
+    'version': 'version',
+    'updated_at': 'updated_at',
+}
+
+# Per-category list order: category, then the pin models' own ordering.
+# Matches registry_list_idx / registry_category_rank_idx, so lists never sort.
+CATEGORY_LIST_ORDER = [F('rating').desc(nulls_last=True), 'name']
+LIST_ORDER = [CATEGORY_ORDER, *CATEGORY_LIST_ORDER]
+
+
+def registry_entry(pin):
+    """Return the registry columns for a pin instance."""
+    entry = {column: getattr(pin, attribute) for column, attribute in COPIED_FIELDS.items()}
+    entry['geohash'] = encode_geohash(pin.pin)
+    return entry
+
+
+def sync_pin(pin):
+    """Create or refresh the registry row of a single pin."""
+    category = CATEGORY_BY_MODEL[pin._meta.concrete_model]
+    entry = registry_entry(pin)
+    key = partition_key()
+    if key:
+        # Partitioned, (category, pin_id) is only unique together with the
+        # partition key: a pin that changed partition gets a fresh row.
+        PinRegistry.objects.filter(category=category, pin_id=pin.pk).exclude(**{key: entry[key]}).delete()
+    PinRegistry.objects.update_or_create(category=category, pin_id=pin.pk, defaults=entry)
+    # Any registry change means the cached pin lists are out of date
+    compression.bump('pins')
+
+
+def clear_pin(pin):
+    """Remove the registry row of a deleted pin."""
+    PinRegistry.objects.filter(
+        category=CATEGORY_BY_MODEL[pin._meta.concrete_model],
+        pin_id=pin.pk
+    ).delete()
+    compression.bump('pins')
+
+
+def resolve(slug, published=True):
+    """
+    Return the category, pin_id, version and updated_at of a slug with a
+    single unique-index lookup, or None.
+    """
+    queryset = PinRegistry.objects.filter(slug=slug)
+    if published:
+        queryset = queryset.filter(published=True)
+    return queryset.values('category', 'pin_id', 'version', 'updated_at').first()
+
+
+def resolve_many(slugs, published=True):
+    """Return {slug: (category, pin_id)} for the known slugs, in one query."""
+    queryset = PinRegistry.objects.filter(slug__in=slugs)
+    if published:
+        queryset = queryset.filter(published=True)
+    return {
+        slug: (category, pin_id)
+        for slug, category, pin_id in queryset.values_list('slug', 'category', 'pin_id')
+    }
+
+
+def copy_columns(model, columns, pks=None):
+    """Copy some columns from the rows of a pin table (all of them, or ``pks``) in one UPDATE."""
+    rows = PinRegistry.objects.filter(category=CATEGORY_BY_MODEL[model])
+    if pks is not None:
+        rows = rows.filter(pin_id__in=pks)
+    source = model.objects.filter(pk=OuterRef('pin_id')).order_by()
+    rows.update(**{
+        column: Subquery(source.values(COPIED_FIELDS[column])[:1])
+        for column in columns
+    })
+    compression.bump('pins')
+
+
+def listing(filters=None, category=None):
+    """Registry queryset of the pins matching ``filters`` (of one ``category``), in per-category list order."""
+    queryset = PinRegistry.objects.all()
+    if filters is not None:
+        queryset = queryset.filter(filters)
+    if category is not None:
+        return queryset.filter(category=category).order_by(*CATEGORY_LIST_ORDER)
+    return queryset.order_by(*LIST_ORDER)
+
+
+def search(filters, per_category=10):
+    """
+    (category, pin_id) of the best ``per_category`` matches of ``filters`` in
+    each category, all sorted by rating, in one query.
+    """
+    return (
+        PinRegistry.objects
+        .filter(filters)
+        .annotate(category_rank=Window(
+            RowNumber(),
+            partition_by=[F('category')],
+            order_by=CATEGORY_LIST_ORDER
+        ))
+        .filter(category_rank__lte=per_category)
+        .order_by(Coalesce('rating', Value(0), output_field=DecimalField()).desc(), *LIST_ORDER)
+        .values_list('category', 'pin_id')
+    )
+
+
+def _upsert(category, batch):
+    unique_fields = ['category', 'pin_id']
+    key = partition_key()
+    if key:
+        # Rows of pins that changed partition (or have no key: NULLs never
+        # conflict) would not match the upsert: delete them so it inserts them afresh.
+        current = dict(
+            PinRegistry.objects.filter(category=category, pin_id__in=[row.pin_id for row in batch])
+            .values_list('pin_id', key)
+        )
+        moved = [
+            row.pin_id for row in batch
+            if row.pin_id in current and (current[row.pin_id] != getattr(row, key) or getattr(row, key) is None)
+        ]
+        if moved:
+            PinRegistry.objects.filter(category=category, pin_id__in=moved).delete()
+        unique_fields.append(key)
+    PinRegistry.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=[*COPIED_FIELDS, 'geohash']
+    )
+
+
+def rebuild():
+    """
+    Refresh the whole registry from the pin tables in place: drop the rows
+    of pins that no longer exist, then upsert every pin in batches. Lookups
+    keep working throughout and fragments of unchanged pins survive.
+    Returns (upserted, deleted).
+    """
+    deleted = 0
+    for category, model in PIN_CATEGORIES.items():
+        deleted += PinRegistry.objects.filter(category=category).exclude(
+            Exists(model.objects.filter(pk=OuterRef('pin_id')))
+        ).delete()[0]
+
+    upserted = 0
+    for category, model in PIN_CATEGORIES.items():
+        batch = []
+        pins = model.objects.order_by().only('pk', *COPIED_FIELDS.values())
+        for pin in pins.iterator(chunk_size=BATCH_SIZE):
+            batch.append(PinRegistry(category=category, pin_id=pin.pk, **registry_entry(pin)))
+            if len(batch) >= BATCH_SIZE:
+                _upsert(category, batch)
+                upserted += len(batch)
+                batch = []
+        if batch:
+            _upsert(category, batch)
+            upserted += len(batch)
+    compression.bump('pins')
+    return upserted, deleted
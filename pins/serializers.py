@@ -18,7 +18,8 @@ class PinSerializer(serializers.ModelSerializer):
     class Meta:
         fields = [
             'id', 'name', 'type', 'city_name', 'latitude', 'longitude',
-            'description', 'header_image', 'icon', 'rating', 'link', 'tags'
+            'description', 'header_image', 'icon', 'rating', 'link', 'tags',
+            'social_post_count', 'faq_count'
         ]
     
     def get_latitude(self, obj):
@@ -31,7 +32,8 @@ class PinSerializer(serializers.ModelSerializer):
         return obj._meta.model_name
     
     def get_tags(self, obj):
-        return [tag.name for tag in obj.tags.all()]
+        # Denormalized copy of the taggit names, see pins.tagging
+        return obj.tag_names
 
 
 class MainAttractionSerializer(PinSerializer):
@@ -109,31 +111,20 @@ class DetailedPinSerializer(PinSerializer):
         fields = PinSerializer.Meta.fields + ['slug', 'created_by_name', 'social_posts', 'marker_icon']
     
     def get_social_posts(self, obj):
-        # Get social posts related to this pin
-        model_name = obj._meta.model_name
-        field_mapping = {
-            'mainattraction': 'mainattraction',
-            'thingstodo': 'thingsToDo',
-            'placestovisit': 'placestovisit',
-            'placestoeat': 'placesToEat',
-            'market': 'market',
-            'countryinfo': 'countryinfo',
-            'destinationguide': 'DestinationGuide',
-            'placeinformation': 'placeinformation',
-            'travelhacks': 'travelhacks',
-            'festivals': 'Festivals',
-            'famousphotopoint': 'famousphotopoint',
-            'activities': 'activites',
-            'hotel': 'hotel'
-        }
-        
-        field_name = field_mapping.get(model_name)
-        if field_name:
-            from social.models import SocialPost
-            filter_kwargs = {field_name: obj, 'published': True}
-            posts = SocialPost.objects.filter(**filter_kwargs).select_related('platform').prefetch_related('tags')
-            return SocialPostSerializer(posts, many=True).data
-        return []
+        # Social posts aggregated by pins.loaders in the pin query itself
+        if hasattr(obj, 'social_posts_data'):
+            from .loaders import format_social_posts
+            return format_social_posts(obj.social_posts_data)
+
+        # Get social posts linked to this pin
+        from social.models import SocialPost
+        from .models import CATEGORY_BY_MODEL
+        posts = SocialPost.objects.filter(
+            links__target_type=CATEGORY_BY_MODEL[obj._meta.concrete_model],
+            links__target_id=obj.pk,
+            published=True
+        ).select_related('platform')
+        return SocialPostSerializer(posts, many=True).data
 
 
 class DetailedMainAttractionSerializer(DetailedPinSerializer):
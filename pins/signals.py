@@ -0,0 +1,192 @@
+"""Signal receivers keeping the pin side tables in sync with their sources."""
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.expressions import Combinable
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from taggit.models import Tag, TaggedItem
+
+from location.models import State, City, Specialzone
+from unfotour import compression
+from .models import PIN_MODELS, CATEGORY_BY_MODEL
+from . import aggregates, bundles, fragments, regions, registry, tagging, versioning, zones
+
+
+# Fields whose previous value is loaded before save, per sender.
+TRACKED_FIELDS = {
+    model: (
+        'pin', 'city_id', 'state_id', 'country_id', 'published',
+        'version', 'social_post_count', 'faq_count', 'tag_names'
+    )
+    for model in PIN_MODELS
+}
+TRACKED_FIELDS[Tag] = ('name',)
+TRACKED_FIELDS[Specialzone] = ('geometry',)
+TRACKED_FIELDS[City] = ('state_id', 'name')
+TRACKED_FIELDS[State] = ('country_id',)
+TRACKED_FIELDS[get_user_model()] = ('username',)
+
+
+def remember_tracked_fields(sender, instance, raw=False, **kwargs):
+    """Load the stored values of the tracked fields so post_save can tell what changed."""
+    instance._tracked_state = None
+    if raw or not instance.pk:
+        return
+    instance._tracked_state = (
+        sender._default_manager
+        .filter(pk=instance.pk)
+        .order_by()
+        .values(*TRACKED_FIELDS[sender])
+        .first()
+    )
+
+
+def field_changed(instance, name):
+    """Return True if ``name`` differs from the stored value (or the row is new)."""
+    state = getattr(instance, '_tracked_state', None)
+    if state is None:
+        return True
+    return state[name] != getattr(instance, name)
+
+
+def pin_saving(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if field_changed(instance, 'city_id'):
+        regions.assign_region(instance)
+
+    # Continue from the stored denormalized columns: they may have changed since this instance was loaded.
+    # The version is incremented by the UPDATE itself, so concurrent saves never write the same one.
+    state = instance._tracked_state
+    if state is not None:
+        instance.version = F('version') + 1
+        instance.social_post_count = state['social_post_count']
+        instance.faq_count = state['faq_count']
+        instance.tag_names = state['tag_names']
+
+
+def pin_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if isinstance(instance.version, Combinable):
+        # Load the version the UPDATE wrote (see pin_saving)
+        instance.refresh_from_db(fields=['version'])
+    if created or field_changed(instance, 'pin'):
+        zones.sync_pin(instance)
+    registry.sync_pin(instance)
+    fragments.render(CATEGORY_BY_MODEL[sender], [instance.pk])
+
+    state = instance._tracked_state
+    bundles.mark_stale([instance.city_id, state and state['city_id']])
+    if created or any(field_changed(instance, name) for name in ('published', 'city_id', 'state_id', 'country_id')):
+        before = state and (state['city_id'], state['state_id'], state['country_id'], state['published'])
+        _count_regions(sender, before, _regions(instance))
+
+
+def _regions(pin):
+    return pin.city_id, pin.state_id, pin.country_id, pin.published
+
+
+def _count_regions(model, before=None, after=None):
+    """Move a pin's count from its previous regions to its current ones."""
+    aggregates.apply(aggregates.pin_deltas(CATEGORY_BY_MODEL[model], before, after))
+
+
+def pin_deleted(sender, instance, **kwargs):
+    zones.clear_pin(instance)
+    registry.clear_pin(instance)
+    bundles.mark_stale([instance.city_id])
+    _count_regions(sender, before=_regions(instance))
+
+
+def pins_retagged(model, pks):
+    """Refresh the tag arrays of some pins and everything rendered from them (touch re-renders their fragments and bundles)."""
+    tagging.sync(model, pks)
+    versioning.touch(model, pks)
+
+
+def pin_tags_changed(sender, instance, action, **kwargs):
+    model = type(instance)
+    if model in CATEGORY_BY_MODEL and action.startswith('post_'):
+        pins_retagged(model, [instance.pk])
+        instance.tag_names = model.objects.values_list('tag_names', flat=True).get(pk=instance.pk)
+
+
+def _retag_pins(rows):
+    for model, pks in rows.items():
+        if model in CATEGORY_BY_MODEL:
+            pins_retagged(model, pks)
+
+
+def tag_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    if field_changed(instance, 'name'):
+        _retag_pins(tagging.tagged_rows(instance))
+
+
+def remember_tagged_rows(sender, instance, **kwargs):
+    """Collect the rows carrying a tag before its TaggedItems are cascaded away."""
+    instance._tagged_rows = tagging.tagged_rows(instance)
+
+
+def tag_deleted(sender, instance, **kwargs):
+    _retag_pins(getattr(instance, '_tagged_rows', {}))
+
+
+def zone_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created or field_changed(instance, 'geometry'):
+        zones.sync_zone(instance)
+    # Zone pin lists carry the zone name
+    compression.bump('pins')
+
+
+def zone_deleted(sender, instance, **kwargs):
+    compression.bump('pins')
+
+
+def city_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    if field_changed(instance, 'state_id'):
+        regions.city_moved(instance)
+    if field_changed(instance, 'name'):
+        versioning.touch_city(instance)
+        bundles.mark_stale([instance.pk])
+
+
+def state_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    if field_changed(instance, 'country_id'):
+        regions.state_moved(instance)
+
+
+def creator_saved(sender, instance, created, raw=False, **kwargs):
+    """Pin details show their creator's username."""
+    if raw or created:
+        return
+    if field_changed(instance, 'username'):
+        for model in PIN_MODELS:
+            versioning.touch(model, list(model.objects.filter(created_by=instance).values_list('pk', flat=True)))
+
+
+for sender in TRACKED_FIELDS:
+    pre_save.connect(remember_tracked_fields, sender=sender)
+
+for model in PIN_MODELS:
+    pre_save.connect(pin_saving, sender=model)
+    post_save.connect(pin_saved, sender=model)
+    post_delete.connect(pin_deleted, sender=model)
+
+m2m_changed.connect(pin_tags_changed, sender=TaggedItem)
+post_save.connect(tag_saved, sender=Tag)
+pre_delete.connect(remember_tagged_rows, sender=Tag)
+post_delete.connect(tag_deleted, sender=Tag)
+
+post_save.connect(zone_saved, sender=Specialzone)
+post_delete.connect(zone_deleted, sender=Specialzone)
+post_save.connect(city_saved, sender=City)
+post_save.connect(state_saved, sender=State)
+post_save.connect(creator_saved, sender=get_user_model())
@@ -0,0 +1,48 @@
+"""
+Denormalized tag name arrays.
+
+Pins and social posts carry a sorted ``tag_names`` array next to their
+taggit relation so tag output and tag filters (``tag_names__contains``,
+served by a GIN index) never join through the generic TaggedItem table.
+Arrays are recomputed from taggit whenever tags are added, removed,
+renamed or deleted.
+"""
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from taggit.models import TaggedItem
+
+from social.models import SocialPost
+from .loaders import tag_names
+from .models import PIN_MODELS
+from . import registry
+
+TAGGED_MODELS = (*PIN_MODELS, SocialPost)
+
+
+def sync(model, pks):
+    """Recompute the tag arrays of some rows of ``model``."""
+    if pks:
+        model.objects.filter(pk__in=pks).update(tag_names=tag_names(model))
+        if model in PIN_MODELS:
+            registry.copy_columns(model, ['tag_names'], pks)
+
+
+def tagged_rows(tag):
+    """Return {model: [pk, ...]} of the rows carrying ``tag``."""
+    rows = defaultdict(list)
+    items = TaggedItem.objects.filter(tag=tag).values_list('content_type_id', 'object_id')
+    for content_type_id, object_id in items:
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model in TAGGED_MODELS:
+            rows[model].append(object_id)
+    return rows
+
+
+def backfill():
+    """Fix every row whose tag array differs from taggit. Returns {model: [fixed pk, ...]}."""
+    fixed = {}
+    for model in TAGGED_MODELS:
+        fixed[model] = list(model.objects.exclude(tag_names=tag_names(model)).values_list('pk', flat=True))
+        sync(model, fixed[model])
+    return fixed
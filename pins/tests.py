@@ -1,3 +1,645 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from taggit.models import Tag
+
+from direction.models import CTAButton, CTACategory
+from location.models import Country, State, City, Specialzone
+from social.models import PostPlatform, SocialPost, SocialPostLink
+from . import aggregates, bundles, duplicates, listing, partitioning, registry
+from .management.commands.pin_index_report import suggest
+from .models import CATEGORY_BY_MODEL, PIN_CATEGORIES, CityBundle, MainAttraction, PinRegistry, PinZoneMembership, ThingsToDo
+from .views import MODEL_MAPPING
+
+
+class PinTestCase(TestCase):
+    """Two published pins of a city, with tags, social posts and CTA buttons."""
+
+    @classmethod
+    def setUpTestData(cls):
+        square = Polygon(((77, 28), (78, 28), (78, 29), (77, 29), (77, 28)), srid=4326)
+        country = Country.objects.create(name="India", geometry=square)
+        state = State.objects.create(country=country, name="Delhi", geometry=MultiPolygon(square))
+        city = City.objects.create(state=state, name="New Delhi", geometry=square)
+
+        cls.pin = MainAttraction.objects.create(
+            name="Red Fort",
+            city=city,
+            pin=Point(77.24, 28.65, srid=4326),
+            published=True
+        )
+        cls.pin.tags.add("historic", "monument")
+
+        cls.other_pin = ThingsToDo.objects.create(
+            name="Rickshaw Ride",
+            city=city,
+            pin=Point(77.23, 28.66, srid=4326),
+            published=True
+        )
+
+        platform = PostPlatform.objects.create(name="YouTube", code="YT")
+        for i in range(5):
+            post = SocialPost.objects.create(
+                name=f"Post {i}",
+                link=f"https://youtube.com/watch?v={i}",
+                platform=platform,
+                published=True
+            )
+            SocialPostLink.objects.create(post=post, target_type="main-attractions", target_id=cls.pin.pk)
+            post.tags.add("travel", f"tag{i}")
+
+        tickets = CTACategory.objects.create(name="Tickets")
+        for rank in (2, 1):
+            CTAButton.objects.create(
+                text=f"Button {rank}",
+                url="https://example.com",
+                mainattraction=cls.pin,
+                category=tickets,
+                btn_ranking=rank
+            )
+
+    def setUp(self):
+        cache.clear()
+
+
+class PinDetailQueryCountTests(PinTestCase):
+    """The pin detail endpoint must cost a fixed number of queries."""
+
+    def test_detail_query_count(self):
+        url = reverse("pin_by_slug", args=[self.pin.slug])
+
+        # Registry lookup + pin with city, creator, tags and social posts + CTA buttons
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        # CTA buttons now come from the per-pin cache
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        pin = response.json()["pin"]
+        self.assertEqual(pin["city_name"], "New Delhi")
+        self.assertEqual(pin["tags"], ["historic", "monument"])
+        self.assertEqual(len(pin["social_posts"]), 5)
+        self.assertEqual(pin["social_post_count"], 5)
+        self.assertEqual(pin["social_posts"][0]["platform"]["code"], "YT")
+        self.assertEqual(len(pin["social_posts"][0]["tags"]), 2)
+
+        [tickets] = response.json()["cta_categories"]
+        self.assertEqual([button["text"] for button in tickets["buttons"]], ["Button 1", "Button 2"])
+
+    def test_not_modified_skips_loading(self):
+        url = reverse("pin_by_slug", args=[self.pin.slug])
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_batch_query_count(self):
+        url = reverse("pins_batch")
+        slugs = [self.other_pin.slug, "unknown-slug", self.pin.slug]
+
+        # Registry lookup + one query per category + CTA buttons for both pins
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {"slugs": ",".join(slugs)})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([entry["pin"]["slug"] for entry in data["pins"]], [self.other_pin.slug, self.pin.slug])
+        self.assertEqual(data["missing"], ["unknown-slug"])
+        self.assertEqual(len(data["pins"][1]["pin"]["social_posts"]), 5)
+        self.assertEqual(data["pins"][0]["cta_categories"], [])
+
+        response = self.client.post(url, {"slugs": slugs}, content_type="application/json")
+        self.assertEqual(response.json()["total_count"], 2)
+
+        response = self.client.post(url, slugs, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+class PinVersionTests(PinTestCase):
+    """Pin detail ETags change with everything the payload renders, per format."""
+
+    def test_etag_per_format(self):
+        url = reverse("pin_by_slug", args=[self.pin.slug])
+        etag = self.client.get(url)["ETag"]
+        self.assertNotEqual(self.client.get(url, {"format": "json"})["ETag"], etag)
+
+        response = self.client.get(url, {"format": "json"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_platform_and_creator_changes(self):
+        url = reverse("pin_by_slug", args=[self.pin.slug])
+        etag = self.client.get(url)["ETag"]
+
+        platform = PostPlatform.objects.get(code="YT")
+        platform.name = "YouTube Shorts"
+        platform.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["pin"]["social_posts"][0]["platform"]["name"], "YouTube Shorts")
+
+        user = User.objects.create(username="editor")
+        MainAttraction.objects.filter(pk=self.pin.pk).update(created_by=user)
+        etag = self.client.get(url)["ETag"]
+        user.username = "chief-editor"
+        user.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        stale = MainAttraction.objects.get(pk=self.pin.pk)
+        version = stale.version
+
+        self.pin.save()
+        stale.save()
+
+        self.assertEqual(self.pin.version, version + 1)
+        self.assertEqual(stale.version, version + 2)
+        self.assertEqual(registry.resolve(self.pin.slug)["version"], version + 2)
+
+
+class TagArrayTests(PinTestCase):
+    """The denormalized tag arrays follow taggit."""
+
+    def test_tag_arrays_follow_taggit(self):
+        url = reverse("all_pins")
+        self.assertEqual(
+            [pin["id"] for pin in self.client.get(url, {"tag": "monument"}).json()["pins"]],
+            [self.pin.pk]
+        )
+
+        # Cached pin lists are invalidated on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.get(name="monument").delete()
+            tag = Tag.objects.get(name="historic")
+            tag.name = "heritage"
+            tag.save()
+
+        self.pin.refresh_from_db()
+        self.assertEqual(self.pin.tag_names, ["heritage"])
+        self.assertEqual(self.client.get(url, {"tag": "monument"}).json()["pins"], [])
+
+
+class ListSerializerParityTests(SimpleTestCase):
+    """The values() list path renders the same JSON as each category's list serializer."""
+
+    def test_every_category(self):
+        city = City(pk=1, name="New Delhi")
+        for category, model in PIN_CATEGORIES.items():
+            instances, rows = [], []
+            for pk, rating in ((1, Decimal("4.5")), (2, None)):
+                values = {
+                    "id": pk, "name": f"Pin {pk}", "description": "", "header_image": None, "icon": "pin",
+                    "rating": rating, "link": "https://example.com", "social_post_count": pk, "faq_count": 0,
+                }
+                pin = model(city=city, pin=Point(77.2 + pk / 7, 28.6, srid=4326), tag_names=["heritage"], **values)
+                instances.append(pin)
+                rows.append({
+                    **values,
+                    "city_name": city.name,
+                    "latitude": pin.pin.y,
+                    "longitude": pin.pin.x,
+                    "tag_names": pin.tag_names,
+                })
+            with self.subTest(category=category):
+                self.assertEqual(
+                    json.dumps(MODEL_MAPPING[category]["list_serializer"](instances, many=True).data),
+                    json.dumps(listing.serialize_rows(rows, model))
+                )
+
+
+class PinListTests(PinTestCase):
+    """List endpoints are served from the registry and its stored fragments."""
+
+    def test_all_pins_single_query(self):
+        url = reverse("all_pins")
+        self.client.get(url)
+        cache.clear()
+
+        # One registry query, every fragment already rendered
+        with self.assertNumQueries(1):
+            data = self.client.get(url).json()
+
+        self.assertEqual([pin["category"] for pin in data["pins"]], ["main-attractions", "things-to-do"])
+        self.assertEqual(data["pins"][0]["social_post_count"], 5)
+        self.assertEqual(data["pins"][0]["tags"], ["historic", "monument"])
+
+    def test_values_path_matches_serializer(self):
+        for model, pin in ((MainAttraction, self.pin), (ThingsToDo, self.other_pin)):
+            queryset = model.objects.filter(pk=pin.pk)
+            serializer = MODEL_MAPPING[CATEGORY_BY_MODEL[model]]["list_serializer"]
+            self.assertEqual(
+                json.dumps(listing.serialize_pins(queryset)),
+                json.dumps(serializer(queryset.select_related("city"), many=True).data)
+            )
+
+
+class RegionKeyTests(PinTestCase):
+    """Pins, and their registry rows, carry the state and country of their city."""
+
+    def region_keys(self):
+        return {
+            keys
+            for model in (MainAttraction, ThingsToDo, PinRegistry)
+            for keys in model.objects.filter(city=self.pin.city_id).values_list("state_id", "country_id")
+        }
+
+    def test_keys_follow_city_and_state_moves(self):
+        city = self.pin.city
+        india = city.state.country
+        self.assertEqual(self.region_keys(), {(city.state_id, india.pk)})
+
+        square = Polygon.from_bbox((85, 27, 86, 28))
+        nepal = Country.objects.create(name="Nepal", geometry=square)
+        bagmati = State.objects.create(country=nepal, name="Bagmati", geometry=MultiPolygon(square))
+        city.state = bagmati
+        city.save()
+        self.assertEqual(self.region_keys(), {(bagmati.pk, nepal.pk)})
+
+        bagmati.country = india
+        bagmati.save()
+        self.assertEqual(self.region_keys(), {(bagmati.pk, india.pk)})
+
+        url = reverse("search_pins")
+        data = self.client.get(url, {"q": "red", "country": india.pk}).json()
+        self.assertEqual([pin["name"] for pin in data["results"]], ["Red Fort"])
+        self.assertEqual(self.client.get(url, {"q": "red", "country": nepal.pk}).json()["results"], [])
+        data = self.client.get(url, {"q": "red", "state": bagmati.pk}).json()
+        self.assertEqual([pin["name"] for pin in data["results"]], ["Red Fort"])
+
+
+class ZoneMembershipTests(PinTestCase):
+    """Zone membership follows pins as they move and zones as their geometry changes."""
+
+    def members(self, zone):
+        return set(PinZoneMembership.objects.filter(zone=zone).values_list("category", "pin_id"))
+
+    def test_membership_follows_moves(self):
+        zone = Specialzone.objects.create(name="Old Delhi", geometry=Polygon.from_bbox((77.2, 28.6, 77.3, 28.7)))
+        self.assertEqual(self.members(zone), {("main-attractions", self.pin.pk), ("things-to-do", self.other_pin.pk)})
+
+        self.pin.pin = Point(77.5, 28.5, srid=4326)
+        self.pin.save()
+        self.assertEqual(self.members(zone), {("things-to-do", self.other_pin.pk)})
+
+        zone.geometry = Polygon.from_bbox((77.4, 28.4, 77.6, 28.6))
+        zone.save()
+        self.assertEqual(self.members(zone), {("main-attractions", self.pin.pk)})
+
+        data = self.client.get(reverse("zone_pins", args=[zone.pk])).json()
+        self.assertEqual([pin["name"] for pin in data["pins"]], ["Red Fort"])
+        self.assertEqual(data["zone"], "Old Delhi")
+
+
+class DuplicateScanTests(SimpleTestCase):
+    """Candidates are pins within the distance whose names are similar enough, across grid cells."""
+
+    # 0.0001 degree of latitude is about 11 meters
+    POINTS = [
+        ("main-attractions", 1, "Red Fort", 77.2, 28.6),
+        ("things-to-do", 2, "Red  fort!", 77.2, 28.60027),
+        ("hotels", 3, "Red Fort", 77.2, 28.60063),
+        ("things-to-do", 4, "Jama Masjid", 77.2, 28.6001),
+        ("restaurants", 5, "Red Fort Gate", 77.2002, 28.6),
+    ]
+
+    def scan(self, similarity, cells_per_chunk=1, distance=50):
+        grid = duplicates.build_grid(self.POINTS, cell_size=distance)
+        found = []
+        for unit in duplicates.split_grid(grid, cells_per_chunk):
+            found.extend(duplicates.find_in_chunk((unit, distance, similarity)))
+        return sorted(tuple(sorted((pin_id_a, pin_id_b))) for _, pin_id_a, _, _, pin_id_b, _, _, _ in found)
+
+    def test_thresholds(self):
+        self.assertEqual(self.scan(0.8), [(1, 2), (2, 3)])
+        self.assertEqual(self.scan(0.7), [(1, 2), (1, 5), (2, 3), (2, 5)])
+        self.assertEqual(self.scan(0.8, cells_per_chunk=1000), self.scan(0.8))
+        self.assertEqual(self.scan(0.8, distance=100), [(1, 2), (1, 3), (2, 3)])
+
+    def test_distance_is_great_circle(self):
+        self.assertAlmostEqual(duplicates.haversine(77.2, 28.6, 77.2, 28.60027), 30.0, delta=0.1)
+
+
+class CityAuditTests(TransactionTestCase):
+    """The audit reports pins outside their city polygon and reassigns them to the one containing them."""
+
+    def test_audit_and_fix(self):
+        country = Country.objects.create(name="India", geometry=Polygon.from_bbox((77, 27, 79, 29)))
+        cities = []
+        for name, x in (("New Delhi", 77), ("Agra", 78)):
+            square = Polygon.from_bbox((x, 27, x + 1, 28))
+            state = State.objects.create(country=country, name=name, geometry=MultiPolygon(square))
+            cities.append(City.objects.create(state=state, name=name, geometry=square))
+        delhi, agra = cities
+        inside = MainAttraction.objects.create(name="Red Fort", city=delhi, pin=Point(77.5, 27.5, srid=4326))
+        outside = ThingsToDo.objects.create(name="Taj Walk", city=delhi, pin=Point(78.5, 27.5, srid=4326))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "audit.csv")
+            call_command("audit_pin_cities", workers=2, chunk_size=1, fix=True, output=path, stdout=StringIO())
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(
+            [(row["category"], row["pin_id"], row["suggested_city_id"], row["fixed"]) for row in rows],
+            [("things-to-do", str(outside.pk), str(agra.pk), "True")]
+        )
+        outside.refresh_from_db()
+        self.assertEqual((outside.city_id, outside.state_id), (agra.pk, agra.state_id))
+        self.assertEqual(PinRegistry.objects.get(category="things-to-do", pin_id=outside.pk).city_id, agra.pk)
+        inside.refresh_from_db()
+        self.assertEqual(inside.city_id, delhi.pk)
+
+
+class CityBundleTests(PinTestCase):
+    """Bundles are rebuilt once the change that made them stale commits."""
+
+    def test_rebuilt_after_commit(self):
+        city_id = self.pin.city_id
+        bundles.build(city_id)
+        MainAttraction.objects.filter(pk=self.pin.pk).update(name="Lal Qila")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bundles.mark_stale([city_id])
+            self.assertTrue(CityBundle.objects.get(pk=city_id).stale)
+
+        bundle = CityBundle.objects.get(pk=city_id)
+        self.assertFalse(bundle.stale)
+        data = json.loads(gzip.decompress(bytes(bundle.data)))
+        self.assertIn("Lal Qila", [pin["name"] for pin in data["pins"]])
+
+
+class RegistryReadModelTests(PinTestCase):
+    """Registry rows mirror the pin tables through saves, unpublishes and deletes."""
+
+    def assertMirrors(self, pin):
+        pin.refresh_from_db()
+        row = PinRegistry.objects.get(category=CATEGORY_BY_MODEL[type(pin)], pin_id=pin.pk)
+        entry = registry.registry_entry(pin)
+        self.assertEqual({column: getattr(row, column) for column in entry}, entry)
+
+    def test_rows_follow_pins(self):
+        self.assertMirrors(self.pin)
+        self.assertMirrors(self.other_pin)
+
+        self.pin.name = "Lal Qila"
+        self.pin.rating = Decimal("4.50")
+        self.pin.pin = Point(77.241, 28.656, srid=4326)
+        self.pin.save()
+        self.assertMirrors(self.pin)
+
+        self.other_pin.rating = Decimal("4.90")
+        self.other_pin.save()
+        published = Q(published=True)
+        self.assertEqual(
+            list(registry.listing(published).values_list("name", flat=True)), ["Lal Qila", "Rickshaw Ride"]
+        )
+        self.assertEqual(list(registry.search(Q(name__icontains="a"))), [
+            ("things-to-do", self.other_pin.pk), ("main-attractions", self.pin.pk)
+        ])
+
+        self.other_pin.published = False
+        self.other_pin.save()
+        self.assertEqual(list(registry.listing(published, "things-to-do")), [])
+        self.assertIsNone(registry.resolve(self.other_pin.slug))
+        self.assertEqual(registry.resolve(self.other_pin.slug, published=False)["pin_id"], self.other_pin.pk)
+
+        slug = self.pin.slug
+        self.pin.delete()
+        self.assertEqual(registry.resolve_many([slug, self.other_pin.slug], published=False), {
+            self.other_pin.slug: ("things-to-do", self.other_pin.pk)
+        })
+
+
+class IndexReportTests(PinTestCase):
+    """pin_index_report replays the read queries against sample rows and reports their plans."""
+
+    def test_report(self):
+        out = StringIO()
+        call_command("pin_index_report", "--query", "all_pins", "--query", "pin_by_slug", stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual([query["name"] for query in report["queries"]], ["all_pins", "pin_by_slug"])
+        all_pins, by_slug = report["queries"]
+        self.assertEqual(all_pins["rows"], 2)
+        self.assertEqual(by_slug["rows"], 1)
+        self.assertIn(self.pin.slug, by_slug["params"])
+        self.assertEqual(report["summary"]["queries"], 2)
+        for query in report["queries"]:
+            self.assertGreaterEqual(query["execution_ms"], 0)
+            self.assertEqual(query["high_buffers"], False)
+
+    def test_unknown_query(self):
+        with self.assertRaisesMessage(CommandError, "Unknown queries: nope"):
+            call_command("pin_index_report", "--query", "nope", stdout=StringIO())
+
+
+class RegistryRebuildTests(PinTestCase):
+    """Rebuilding the registry updates rows in place and only drops those of removed pins."""
+
+    def test_rebuild_in_place(self):
+        rows = PinRegistry.objects.filter(category="main-attractions", pin_id=self.pin.pk)
+        before = set(PinRegistry.objects.values_list("category", "pin_id", "id"))
+        fragment = rows.get().fragment
+        rows.update(name="Stale")
+        PinRegistry.objects.create(
+            slug="gone", category="hotels", pin_id=999999, city_id=self.pin.city_id, point=self.pin.pin
+        )
+
+        self.assertEqual(registry.rebuild(), (2, 1))
+
+        row = rows.get()
+        self.assertEqual(row.name, "Red Fort")
+        self.assertEqual(bytes(row.fragment), bytes(fragment))
+        self.assertEqual(set(PinRegistry.objects.values_list("category", "pin_id", "id")), before)
+        self.assertEqual(registry.resolve(self.pin.slug)["pin_id"], self.pin.pk)
+
+
+class RegionPinCountTests(PinTestCase):
+    """Region counts follow pin creates, publishes and deletes through deltas."""
+
+    def test_region_counts_follow_pins(self):
+        city = self.pin.city
+        url = reverse("region_pin_counts", args=["state", city.state_id])
+        with self.assertNumQueries(1):
+            data = self.client.get(url).json()
+        self.assertEqual(data["counts"], {"main-attractions": 1, "things-to-do": 1})
+
+        self.other_pin.published = False
+        self.other_pin.save()
+        MainAttraction.objects.create(name="Qutub Minar", city=city, pin=Point(77.18, 28.52, srid=4326), published=True)
+        self.pin.delete()
+
+        data = self.client.get(reverse("region_pin_counts", args=["country", city.state.country_id])).json()
+        self.assertEqual(data["counts"], {"main-attractions": 1})
+        data = self.client.get(reverse("region_pin_counts", args=["city", city.pk]), {"all": "1"}).json()
+        self.assertEqual(data["counts"], {"main-attractions": 1, "things-to-do": 1})
+        self.assertEqual(data["total_count"], 2)
+
+        # The applied deltas match an exact recount
+        self.assertEqual(aggregates.refresh_all(), {level: (0, 0) for level in aggregates.LEVELS})
+
+
+class IndexSuggestionTests(SimpleTestCase):
+    """pin_index_report suggests indexes from the conditions and sort keys of EXPLAIN nodes."""
+
+    scan = {"Relation Name": "pin_registry", "Filter": "(published AND ((category)::text = 'hotels'::text))"}
+
+    def test_filters(self):
+        self.assertEqual(suggest(self.scan), [
+            ("filter: equality columns", "CREATE INDEX CONCURRENTLY ON pin_registry (category) WHERE published;")
+        ])
+        self.assertEqual(suggest({
+            "Relation Name": "pin_registry",
+            "Index Cond": "(city_id = ANY ('{1,2}'::bigint[]))",
+            "Filter": "((upper((name)::text) ~~ '%FORT%'::text) AND (tag_names @> '{heritage}'::character varying[]) "
+                      "AND st_within(point, '0103'::geometry))",
+        }), [
+            ("filter: equality columns", "CREATE INDEX CONCURRENTLY ON pin_registry (city_id);"),
+            (
+                "filter: substring match (needs the pg_trgm extension)",
+                "CREATE INDEX CONCURRENTLY ON pin_registry USING gin (upper(name) gin_trgm_ops);"
+            ),
+            ("filter: array containment", "CREATE INDEX CONCURRENTLY ON pin_registry USING gin (tag_names);"),
+            ("filter: spatial predicate", "CREATE INDEX CONCURRENTLY ON pin_registry USING gist (point);"),
+        ])
+        self.assertEqual(suggest({"Node Type": "Hash"}), [])
+
+    def test_sorts(self):
+        sort = {"Sort Key": ["pin_registry.rating DESC NULLS LAST", "pin_registry.name"]}
+        self.assertEqual(suggest(self.scan, sort), [(
+            "sort: index in query order",
+            "CREATE INDEX CONCURRENTLY ON pin_registry (category, rating DESC NULLS LAST, name) WHERE published;"
+        )])
+        # Expression keys (such as the category rank) cannot be copied into an index
+        sort = {"Sort Key": ["(CASE WHEN ((category)::text = 'hotels'::text) THEN 0 ELSE NULL::integer END)"]}
+        self.assertEqual(suggest(self.scan, sort), [])
+
+
+class GeohashTests(SimpleTestCase):
+    """Geohashes match PostGIS ST_GeoHash and cover bbox filters."""
+
+    def test_encode(self):
+        self.assertEqual(partitioning.encode_geohash(Point(-5.6, 42.6), 5), "ezs42")
+        self.assertEqual(partitioning.encode_geohash(Point(10.40744, 57.64911), 11), "u4pruydqqvj")
+        self.assertEqual(len(partitioning.encode_geohash(Point(77.24, 28.65))), partitioning.GEOHASH_PRECISION)
+        self.assertEqual(partitioning.encode_geohash(None), "")
+
+    def test_cells(self):
+        delhi = Polygon.from_bbox((77, 28, 78, 29))
+        self.assertEqual(partitioning.geohash_cells(delhi, 1), ["t"])
+        self.assertEqual(partitioning.geohash_cells(Polygon.from_bbox((-1, -1, 1, 1)), 1), ["7", "e", "k", "s"])
+        self.assertEqual(
+            partitioning.geohash_cells(delhi, 2),
+            sorted({partitioning.encode_geohash(Point(x, y), 2) for x in (77, 78) for y in (28, 29)})
+        )
+        self.assertIsNone(partitioning.geohash_cells(Polygon.from_bbox((-180, -90, 180, 90)), 2))
+
+    def test_filter_only_when_partitioned_by_geohash(self):
+        delhi = Polygon.from_bbox((77, 28, 78, 29))
+        self.assertIsNone(partitioning.geohash_filter(delhi))
+        with self.settings(PIN_REGISTRY_PARTITIONING="geohash", PIN_REGISTRY_GEOHASH_PRECISION=1):
+            self.assertEqual(str(partitioning.geohash_filter(delhi)), str(Q(geohash__gte="t", geohash__lt="u")))
+
+
+class PartitionKeyTests(SimpleTestCase):
+    """Unique definitions are widened with the partition key, replacing the previous one."""
+
+    def test_with_key(self):
+        index = "CREATE UNIQUE INDEX registry_pin ON public.pin_registry USING btree (category, pin_id)"
+        self.assertEqual(
+            partitioning._with_key(index, "country_id"),
+            "CREATE UNIQUE INDEX registry_pin ON public.pin_registry USING btree (category, pin_id, country_id)"
+        )
+        self.assertEqual(
+            partitioning._with_key("UNIQUE (category, pin_id, geohash)", "country_id", "geohash"),
+            "UNIQUE (category, pin_id, country_id)"
+        )
+        self.assertEqual(partitioning._with_key("UNIQUE (slug, country_id)", "country_id"), "UNIQUE (slug, country_id)")
+        self.assertEqual(
+            partitioning._with_key("CREATE UNIQUE INDEX s ON t USING btree (slug) WHERE (published)", "geohash"),
+            "CREATE UNIQUE INDEX s ON t USING btree (slug, geohash) WHERE (published)"
+        )
+
+
+def _restore_plain_registry():
+    """Put back the plain registry a ``repartition(keep_old=True)`` kept as pin_registry_old."""
+    table, old = partitioning.TABLE, partitioning.OLD
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {table} CASCADE")
+        cursor.execute(f"ALTER TABLE {old} RENAME TO {table}")
+        constraints, indexes = partitioning._table_objects(cursor, table)
+        for name, _ in constraints:
+            cursor.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {name} TO {name.removesuffix('_old')}")
+        for name, _ in indexes:
+            cursor.execute(f"ALTER INDEX {name} RENAME TO {name.removesuffix('_old')}")
+        cursor.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {old}_pkey TO {table}_pkey")
+        cursor.execute(f"ALTER SEQUENCE {old}_id_seq RENAME TO {table}_id_seq")
+        cursor.execute(f"DROP TABLE {partitioning.SLUGS}")
+        cursor.execute(f"DROP FUNCTION {partitioning.SLUG_GUARD}()")
+
+
+@override_settings(PIN_REGISTRY_PARTITIONING="country")
+class RegistryPartitioningTests(TransactionTestCase):
+    """A registry partitioned by country keeps one row per pin, in its country's partition."""
+
+    def setUp(self):
+        self.cities = []
+        for name, x in (("India", 77), ("Nepal", 85)):
+            square = Polygon.from_bbox((x, 27, x + 1, 28))
+            country = Country.objects.create(name=name, geometry=square)
+            state = State.objects.create(country=country, name=name, geometry=MultiPolygon(square))
+            self.cities.append(City.objects.create(state=state, name=name, geometry=square))
+        self.pin = MainAttraction.objects.create(
+            name="Red Fort", city=self.cities[0], pin=Point(77.5, 27.5, srid=4326), published=True
+        )
+        partitioning.repartition("country", batch_size=1, keep_old=True, log=lambda message: None)
+        self.addCleanup(_restore_plain_registry)
+
+    def partition_rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT tableoid::regclass::text, pin_id FROM {partitioning.TABLE}")
+            return cursor.fetchall()
+
+    def test_swap(self):
+        self.assertEqual(partitioning.current_scheme(), "LIST (country_id)")
+        self.assertEqual(self.partition_rows(), [(f"{partitioning.TABLE}_c{self.pin.country_id}", self.pin.pk)])
+        self.assertEqual(registry.resolve(self.pin.slug)["pin_id"], self.pin.pk)
+
+    def test_pin_moves_partition(self):
+        self.pin.city = self.cities[1]
+        self.pin.pin = Point(85.5, 27.5, srid=4326)
+        self.pin.save()
+
+        self.assertEqual(self.partition_rows(), [(f"{partitioning.TABLE}_c{self.pin.country_id}", self.pin.pk)])
+        entry = registry.resolve(self.pin.slug)
+        self.assertEqual((entry["category"], entry["pin_id"]), ("main-attractions", self.pin.pk))
+
+        PinRegistry.objects.update(country_id=self.cities[0].state.country_id)
+        self.assertEqual(registry.rebuild(), (1, 0))
+        self.assertEqual(self.partition_rows(), [(f"{partitioning.TABLE}_c{self.pin.country_id}", self.pin.pk)])
+
+    def test_slugs_stay_unique(self):
+        nepal = self.cities[1]
+        with self.assertRaises(IntegrityError):
+            PinRegistry.objects.create(
+                slug=self.pin.slug, category="hotels", pin_id=self.pin.pk,
+                city_id=nepal.pk, country_id=nepal.state.country_id, point=self.pin.pin
+            )
 
-# Create your tests here.
@@ -1,9 +1,15 @@
 from django.urls import path
-from .views import search_pins, get_pin_by_slug, geocode_nominatim_proxy
+from .views import get_all_pins, get_pins_by_type, search_pins, get_pin_by_slug, get_pins_batch, get_zone_pins, get_region_pin_counts, get_city_bundle, geocode_nominatim_proxy
 
 urlpatterns = [
+    path('api/all/', get_all_pins, name='all_pins'),
     path('api/search/', search_pins, name='search_pins'),
+    path('api/pins/batch/', get_pins_batch, name='pins_batch'),
+    path('api/pins/<slug:table_name>/', get_pins_by_type, name='pins_by_type'),
     path('api/pin/<slug:slug>/', get_pin_by_slug, name='pin_by_slug'),
+    path('api/zones/<int:zone_id>/pins/', get_zone_pins, name='zone_pins'),
+    path('api/regions/<str:level>/<int:region_id>/counts/', get_region_pin_counts, name='region_pin_counts'),
+    path('api/city/<int:city_id>/bundle/', get_city_bundle, name='city_bundle'),
     # Proxy for Nominatim geocoding to avoid browser CORS issues
     path('geocode/nominatim/', geocode_nominatim_proxy, name='geocode_nominatim_root'),
     path('geocode/nominatim/<path:subpath>', geocode_nominatim_proxy, name='geocode_nominatim'),
@@ -0,0 +1,96 @@
+"""
+Per-pin content versions used for ETag / Last-Modified on pin detail responses.
+
+A pin's version is bumped when the pin itself is saved (see pins.signals)
+and whenever a row rendered with it changes: its tags, its city name, its
+creator's username, or a SocialPost (or its PostPlatform), CTAButton or
+FAQ linked to it. The registry row mirrors the
+version so conditional requests are answered from a single lookup, and
+the bundles of the touched pins' cities are marked stale since they
+render the same data.
+"""
+from collections import defaultdict
+
+from django.db.models import F
+from django.utils import timezone
+
+from unfotour import compression
+from .models import PIN_MODELS, CATEGORY_BY_MODEL, PinRegistry
+from . import bundles, fragments
+
+
+def touch(model, pks):
+    """Bump the version of the given pins of ``model``."""
+    if not pks:
+        return
+    now = timezone.now()
+    model.objects.filter(pk__in=pks).update(version=F('version') + 1, updated_at=now)
+    rows = PinRegistry.objects.filter(category=CATEGORY_BY_MODEL[model], pin_id__in=pks)
+    rows.update(version=F('version') + 1, updated_at=now)
+    compression.bump('pins')
+    fragments.render_after_commit(rows)
+    bundles.mark_stale(rows.filter(published=True).order_by().values_list('city_id', flat=True).distinct())
+
+
+def touch_city(city):
+    """Bump the version of every pin in a city."""
+    now = timezone.now()
+    for model in PIN_MODELS:
+        model.objects.filter(city=city).update(version=F('version') + 1, updated_at=now)
+    rows = PinRegistry.objects.filter(city=city)
+    rows.update(version=F('version') + 1, updated_at=now)
+    compression.bump('pins')
+    fragments.render_after_commit(rows)
+
+
+def pin_link_fields(model):
+    """Foreign key fields of ``model`` pointing at a pin model."""
+    return [
+        field for field in model._meta.concrete_fields
+        if field.is_relation and field.related_model in CATEGORY_BY_MODEL
+    ]
+
+
+def linked_pins(model, values):
+    """Yield (pin model, pk) for the pin foreign keys set in ``values`` (attname -> value)."""
+    for field in pin_link_fields(model):
+        pk = values.get(field.attname)
+        if pk is not None:
+            yield field.related_model, pk
+
+
+def touch_links(links):
+    """Bump every pin in an iterable of (pin model, pk) pairs."""
+    grouped = defaultdict(set)
+    for model, pk in links:
+        grouped[model].add(pk)
+    for model, pks in grouped.items():
+        touch(model, pks)
+
+
+def _current_links(instance):
+    return linked_pins(type(instance), instance.__dict__)
+
+
+# Receivers for models rendered alongside pins through foreign keys (CTAButton, FAQ).
+# Each app connects them for its own model; social posts use their link table instead.
+
+def remember_links(sender, instance, raw=False, **kwargs):
+    """Remember which pins the stored row pointed at, in case the save moves it."""
+    instance._previous_pin_links = []
+    if raw or not instance.pk:
+        return
+    attnames = [field.attname for field in pin_link_fields(sender)]
+    previous = sender._default_manager.filter(pk=instance.pk).values(*attnames).first()
+    if previous:
+        instance._previous_pin_links = list(linked_pins(sender, previous))
+
+
+def related_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    touch_links([*_current_links(instance), *getattr(instance, '_previous_pin_links', [])])
+
+
+def related_deleted(sender, instance, **kwargs):
+    touch_links(_current_links(instance))
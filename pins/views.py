@@ -1,7 +1,15 @@
 from django.shortcuts import render
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.contrib.gis.geos import Polygon
+from django.db.models import Q
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 from .models import (
     MainAttraction, ThingsToDo, PlacesToVisit, PlacesToEat, Market, CountryInfo,
     DestinationGuide, PlaceInformation, TravelHacks, Festivals, FamousPhotoPoint, Activities, Hotel
@@ -16,9 +24,19 @@ from .serializers import (
     DetailedDestinationGuideSerializer, DetailedPlaceInformationSerializer, DetailedTravelHacksSerializer,
     DetailedFestivalsSerializer, DetailedFamousPhotoPointSerializer, DetailedActivitiesSerializer, DetailedHotelSerializer
 )
+from location.models import Specialzone
+from unfotour import compression
+from unfotour.compression import precompressed
+from unfotour.renderers import FastJSONRenderer
+from direction.buttons import buttons_for_pin, buttons_for_pins
+from . import aggregates, bundles, fragments, loaders, partitioning, registry, zones
+
+import gzip
+import re
+from collections import defaultdict
 
 import requests
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from urllib.parse import urljoin
 from django.conf import settings
 
@@ -141,7 +159,85 @@ MODEL_MAPPING = {
 }
 
 
+def _parse_bbox(value):
+    """Parse ``min_lon,min_lat,max_lon,max_lat`` into a polygon, or None if malformed."""
+    try:
+        bbox = Polygon.from_bbox([float(part) for part in value.split(',')])
+    except (TypeError, ValueError):
+        return None
+    bbox.srid = 4326
+    return bbox
+
+
+def _pin_list_filters(request):
+    """Build the published/search/tag/bbox registry filters of the list endpoints, or None if a parameter is invalid."""
+    filters = Q(published=True)
+    search = request.GET.get('search', '').strip()
+    if search:
+        filters &= Q(name__icontains=search)
+    tags = [tag for tag in request.GET.getlist('tag') if tag]
+    if tags:
+        # Served by the GIN index on the denormalized tag array
+        filters &= Q(tag_names__contains=tags)
+    bbox = request.GET.get('bbox')
+    if bbox:
+        bbox = _parse_bbox(bbox)
+        if bbox is None:
+            return None
+        filters &= Q(point__within=bbox)
+        # Prunes the partitions outside the viewport when the registry is partitioned by geohash
+        cells = partitioning.geohash_filter(bbox)
+        if cells is not None:
+            filters &= cells
+    return filters
+
+
+# Pin payloads are rendered with orjson unless ?format=json asks for the stock renderer
+PIN_RENDERERS = [FastJSONRenderer, JSONRenderer]
+
+_negotiation = DefaultContentNegotiation()
+_pin_renderers = [renderer() for renderer in PIN_RENDERERS]
+
+
+@precompressed('pins')
 @api_view(['GET'])
+@renderer_classes(PIN_RENDERERS)
+def get_all_pins(request):
+    """Get all published pins from all categories for map display."""
+    filters = _pin_list_filters(request)
+    if filters is None:
+        return Response({'error': 'Invalid table name or query parameters'}, status=400)
+
+    # One registry query stitched from the stored per-pin fragments; only changed pins are rendered
+    results = fragments.for_registry(registry.listing(filters))
+
+    return HttpResponse(fragments.json_object(
+        pins=fragments.json_array(results),
+        total_count=len(results)
+    ), content_type='application/json')
+
+
+@precompressed('pins')
+@api_view(['GET'])
+@renderer_classes(PIN_RENDERERS)
+def get_pins_by_type(request, table_name):
+    """Get published pins of a single category."""
+    config = MODEL_MAPPING.get(table_name)
+    filters = _pin_list_filters(request)
+    if config is None or filters is None:
+        return Response({'error': 'Invalid table name or query parameters'}, status=400)
+
+    pins = fragments.for_registry(registry.listing(filters, category=table_name))
+    return HttpResponse(fragments.json_object(
+        pins=fragments.json_array(pins),
+        total_count=len(pins),
+        table_name=table_name
+    ), content_type='application/json')
+
+
+@precompressed('pins')
+@api_view(['GET'])
+@renderer_classes(PIN_RENDERERS)
 def search_pins(request):
     """Search pins by name across all models."""
     query = request.GET.get('q', '').strip()
@@ -149,77 +245,31 @@ def search_pins(request):
     if not query:
         return Response({'error': 'Query parameter q is required'}, status=400)
     
-    from django.db.models import Q
     search_filter = Q(name__icontains=query)
     base_filter = {'published': True}
+
+    # Optional region scoping through the denormalized keys on the registry
+    for param in ('country', 'state'):
+        value = request.GET.get(param)
+        if value:
+            if not value.isdigit():
+                return Response({'error': f'Query parameter {param} must be an id'}, status=400)
+            base_filter[f'{param}_id'] = int(value)
     
-    results = []
-    
-    # Search across all models
-    for key, config in MODEL_MAPPING.items():
-        model = config['model']
-        serializer = config['list_serializer']
-        
-        pins = model.objects.filter(search_filter, **base_filter).select_related('city').prefetch_related('tags')[:10]
-        serialized = serializer(pins, many=True).data
-        
-        for pin in serialized:
-            pin['category'] = key
-        
-        results.extend(serialized)
-    
-    # Sort by rating
-    results.sort(key=lambda x: float(x['rating']) if x['rating'] else 0, reverse=True)
+    # Top 10 per category, all categories in one registry query, sorted by rating
+    matches = list(registry.search(search_filter & Q(**base_filter), per_category=10))
+    results = fragments.for_pins(matches[:20])  # Limit to top 20
     
-    return Response({
-        'query': query,
-        'results': results[:20],  # Limit to top 20
-        'total_found': len(results)
-    })
+    return HttpResponse(fragments.json_object(
+        query=query,
+        results=fragments.json_array(results),
+        total_found=len(matches)
+    ), content_type='application/json')
 
 
-@api_view(['GET'])
-def get_pin_by_slug(request, slug):
-    """Get pin details by slug with social posts and CTA buttons."""
-    
-    # Map slug prefixes to MODEL_MAPPING keys
-    slug_to_key_mapping = {
-        'mainattraction': 'main-attractions',
-        'thingstodo': 'things-to-do', 
-        'placestovisit': 'places-to-visit',
-        'placestoeat': 'places-to-eat',
-        'market': 'markets',
-        'countryinfo': 'country-info',
-        'destinationguide': 'destination-guides',
-        'placeinformation': 'place-information',
-        'travelhacks': 'travel-hacks',
-        'festivals': 'festivals',
-        'famousphotopoint': 'famous-photo-points',
-        'activities': 'activities',
-        'hotel': 'hotels'
-    }
-    
-    # Find matching model by slug prefix
-    model_config = None
-    model_key = None
-    
-    for slug_prefix, key in slug_to_key_mapping.items():
-        if slug.startswith(slug_prefix + '-'):
-            model_config = MODEL_MAPPING[key]
-            model_key = key
-            break
-    
-    if not model_config:
-        return Response({'error': 'Invalid slug or unsupported pin type'}, status=400)
-    
-    # Get pin by slug
-    try:
-        pin = model_config['model'].objects.get(slug=slug, published=True)
-    except model_config['model'].DoesNotExist:
-        return Response({'error': 'Pin not found'}, status=404)
-    
-    # Use detailed serializer
-    serializer = model_config['detail_serializer'](pin)
+def _pin_detail_payload(pin, model_key, cta_categories):
+    """Build the detail payload of a pin loaded with loaders.pin_detail_queryset."""
+    serializer = MODEL_MAPPING[model_key]['detail_serializer'](pin)
     pin_data = serializer.data
     
     # Add CTA buttons
@@ -251,8 +301,202 @@ def get_pin_by_slug(request, slug):
             'icon': 'navigation'
         })
     
-    return Response({
+    return {
         'pin': pin_data,
         'category': model_key,
-        'cta_buttons': cta_buttons
-    })
\ No newline at end of file
+        'cta_buttons': cta_buttons,
+        # Buttons managed in the admin (direction.CTAButton), grouped by category
+        'cta_categories': cta_categories
+    }
+
+
+def _pin_entry(request, slug):
+    """Resolve a slug through the registry once per request."""
+    request = getattr(request, '_request', request)
+    entries = request.__dict__.setdefault('_pin_entries', {})
+    if slug not in entries:
+        entries[slug] = registry.resolve(slug)
+    return entries[slug]
+
+
+def _pin_format(request):
+    """The renderer format (and media type parameters) DRF will negotiate for ``request``."""
+    try:
+        renderer, media_type = _negotiation.select_renderer(Request(request), _pin_renderers)
+    except (Http404, NotAcceptable):
+        # The view answers these itself
+        return 'none'
+    parameters = re.sub(r'[^\w=.-]', '', media_type.partition(';')[2])
+    return f'{renderer.format}-{parameters}' if parameters else renderer.format
+
+
+def _pin_etag(request, slug):
+    # Each renderer encodes the payload differently, so the format is part of the tag
+    entry = _pin_entry(request, slug)
+    if entry:
+        return f"{entry['category']}-{entry['pin_id']}-{entry['version']}-{_pin_format(request)}"
+
+
+def _pin_last_modified(request, slug):
+    entry = _pin_entry(request, slug)
+    if entry:
+        return entry['updated_at']
+
+
+@cache_control(no_cache=True)
+@condition(etag_func=_pin_etag, last_modified_func=_pin_last_modified)
+@api_view(['GET'])
+@renderer_classes(PIN_RENDERERS)
+def get_pin_by_slug(request, slug):
+    """Get pin details by slug with social posts and CTA buttons.
+
+    Responses carry a strong ETag and Last-Modified derived from the pin's
+    version, so revalidations are answered with 304 before any serialization.
+    """
+    
+    # Resolve the slug through the global registry (single unique-index lookup)
+    entry = _pin_entry(request, slug)
+    if entry is None:
+        return Response({'error': 'Pin not found'}, status=404)
+
+    model_key, pin_id = entry['category'], entry['pin_id']
+    model_config = MODEL_MAPPING[model_key]
+
+    # Pin, city, creator, tags and social posts in a single query
+    pin = loaders.load_pin_detail(model_config['model'], pin_id)
+    if pin is None:
+        return Response({'error': 'Pin not found'}, status=404)
+    
+    return Response(_pin_detail_payload(pin, model_key, buttons_for_pin(model_key, pin.pk)))
+
+
+BATCH_MAX_SLUGS = 100
+
+
+@api_view(['GET', 'POST'])
+@renderer_classes(PIN_RENDERERS)
+def get_pins_batch(request):
+    """Get the details of many pins by slug in one response.
+
+    Slugs come from ``?slugs=a,b,c`` or a JSON body ``{"slugs": [...]}``.
+    The cost is one registry lookup, one query per category involved and
+    one query for the CTA buttons not already cached, whatever the batch size.
+    """
+    if request.method == 'POST':
+        if not isinstance(request.data, dict):
+            return Response({'error': 'Body must be a JSON object with a slugs list'}, status=400)
+        slugs = request.data.get('slugs', [])
+        if not isinstance(slugs, list):
+            return Response({'error': 'slugs must be a list'}, status=400)
+    else:
+        slugs = request.GET.get('slugs', '').split(',')
+    slugs = list(dict.fromkeys(str(slug).strip() for slug in slugs if str(slug).strip()))
+
+    if not slugs:
+        return Response({'error': 'No slugs provided'}, status=400)
+    if len(slugs) > BATCH_MAX_SLUGS:
+        return Response({'error': f'At most {BATCH_MAX_SLUGS} slugs per request'}, status=400)
+
+    entries = registry.resolve_many(slugs)
+
+    pin_ids = defaultdict(list)
+    for category, pin_id in entries.values():
+        pin_ids[category].append(pin_id)
+
+    pins = {}
+    for category, ids in pin_ids.items():
+        for pin_id, pin in loaders.load_pin_details(MODEL_MAPPING[category]['model'], ids).items():
+            pins[(category, pin_id)] = pin
+
+    cta_categories = buttons_for_pins(pins)
+
+    results = []
+    missing = []
+    for slug in slugs:
+        pin = pins.get(entries.get(slug))
+        if pin is None:
+            missing.append(slug)
+            continue
+        category = entries[slug][0]
+        results.append(_pin_detail_payload(pin, category, cta_categories[(category, pin.pk)]))
+
+    return Response({
+        'pins': results,
+        'missing': missing,
+        'total_count': len(results)
+    })
+
+
+@precompressed('pins')
+@api_view(['GET'])
+@renderer_classes(PIN_RENDERERS)
+def get_zone_pins(request, zone_id):
+    """List published pins inside a special zone from the precomputed membership table."""
+    zone = get_object_or_404(Specialzone, pk=zone_id)
+
+    results = fragments.for_registry(zones.zone_pins(zone))
+
+    return HttpResponse(fragments.json_object(
+        zone=zone.name,
+        pins=fragments.json_array(results),
+        total_count=len(results)
+    ), content_type='application/json')
+
+
+@api_view(['GET'])
+def get_region_pin_counts(request, level, region_id):
+    """Published pin counts per category of a country, state or city, from the maintained aggregates.
+
+    ``?all=1`` counts unpublished pins too.
+    """
+    if level not in aggregates.LEVELS:
+        return Response({'error': 'Invalid region level'}, status=400)
+
+    counts = aggregates.region_counts(level, region_id, published=request.GET.get('all') != '1')
+    return Response({
+        'level': level,
+        'region_id': region_id,
+        'counts': counts,
+        'total_count': sum(counts.values())
+    })
+
+
+def _city_bundle(request, city_id):
+    """Load the bundle of a city once per request."""
+    bundles_by_city = request.__dict__.setdefault('_city_bundles', {})
+    if city_id not in bundles_by_city:
+        bundles_by_city[city_id] = bundles.get(city_id)
+    return bundles_by_city[city_id]
+
+
+def _city_bundle_etag(request, city_id):
+    bundle = _city_bundle(request, city_id)
+    if bundle:
+        return f'W/"city-{city_id}-{bundle.built_generation}"'
+
+
+def _city_bundle_last_modified(request, city_id):
+    bundle = _city_bundle(request, city_id)
+    if bundle:
+        return bundle.built_at
+
+
+@cache_control(no_cache=True)
+@condition(etag_func=_city_bundle_etag, last_modified_func=_city_bundle_last_modified)
+@require_GET
+def get_city_bundle(request, city_id):
+    """Get every published pin, FAQ and social post of a city from its prebuilt bundle.
+
+    The stored gzip blob becomes the gzip variant of the precompressed
+    cache, so serving a bundle costs a single primary key lookup.
+    """
+    bundle = _city_bundle(request, city_id)
+    if bundle is None:
+        return JsonResponse({'error': 'City not found'}, status=404)
+
+    def build():
+        data = bytes(bundle.data)
+        return 'application/json', gzip.decompress(data), data
+
+    entry = compression.cached(f'precompressed:bundle:{city_id}:{bundle.built_generation}', build)
+    return compression.respond(request, entry, 'bundles')
@@ -0,0 +1,76 @@
+"""Maintenance of the pin <-> special zone membership table."""
+from django.db.models import Exists, OuterRef, Q
+
+from location import boundaries
+from .models import PIN_CATEGORIES, CATEGORY_BY_MODEL, PinZoneMembership
+from . import registry
+
+BATCH_SIZE = 1000
+
+
+def _bulk_insert(memberships):
+    """Insert memberships from an iterable in bounded batches."""
+    batch = []
+    for membership in memberships:
+        batch.append(membership)
+        if len(batch) >= BATCH_SIZE:
+            PinZoneMembership.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        PinZoneMembership.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def clear_pin(pin):
+    """Remove every membership of a single pin."""
+    category = CATEGORY_BY_MODEL[pin._meta.concrete_model]
+    PinZoneMembership.objects.filter(category=category, pin_id=pin.pk).delete()
+
+
+def sync_pin(pin):
+    """Recompute the zones containing a single pin."""
+    clear_pin(pin)
+    if pin.pin is None:
+        return
+
+    category = CATEGORY_BY_MODEL[pin._meta.concrete_model]
+    zone_ids = boundaries.containing('specialzone', pin.pin)
+    _bulk_insert(
+        PinZoneMembership(zone_id=zone_id, category=category, pin_id=pin.pk)
+        for zone_id in zone_ids
+    )
+
+
+def sync_zone(zone):
+    """
+    Recompute every membership of a single zone across all pin tables.
+
+    Pins are matched against the zone's subdivided pieces, so each spatial
+    index probe only deals with a small polygon, with one query per table.
+    """
+    PinZoneMembership.objects.filter(zone=zone).delete()
+
+    inside = boundaries.intersects('specialzone', zone.pk, OuterRef('pin'))
+    for category, model in PIN_CATEGORIES.items():
+        pin_ids = model.objects.filter(inside).order_by().values_list('pk', flat=True)
+        _bulk_insert(
+            PinZoneMembership(zone_id=zone.pk, category=category, pin_id=pin_id)
+            for pin_id in pin_ids.iterator(chunk_size=BATCH_SIZE)
+        )
+
+
+def zone_pins(zone, published=True):
+    """
+    Registry queryset of the pins of a zone, in list order.
+
+    Membership is matched on (category, pin_id) through the precomputed
+    table, so no spatial work happens at read time.
+    """
+    members = PinZoneMembership.objects.filter(
+        zone=zone,
+        category=OuterRef('category'),
+        pin_id=OuterRef('pin_id')
+    )
+    filters = Q(Exists(members))
+    if published:
+        filters &= Q(published=True)
+    return registry.listing(filters)
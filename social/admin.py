@@ -1,14 +1,45 @@
+from django import forms
 from django.contrib import admin
-from unfold.admin import ModelAdmin
+from unfold.admin import ModelAdmin, TabularInline
 
-from .models import PostPlatform, SocialPost
+from .models import TARGET_MODELS, PostPlatform, SocialPost, SocialPostLink
 
 @admin.register(PostPlatform)
 class PostPlatformAdmin(ModelAdmin):
     pass
 
 
+class SocialPostLinkForm(forms.ModelForm):
+    class Meta:
+        model = SocialPostLink
+        fields = ("target_type", "target_id")
+
+    def clean(self):
+        cleaned_data = super().clean()
+        target_type = cleaned_data.get("target_type")
+        target_id = cleaned_data.get("target_id")
+        model = TARGET_MODELS.get(target_type)
+        if model is not None and target_id is not None and not model.objects.filter(pk=target_id).exists():
+            self.add_error("target_id", f"No {target_type} with id {target_id}")
+        return cleaned_data
+
+
+class SocialPostLinkInline(TabularInline):
+    model = SocialPostLink
+    form = SocialPostLinkForm
+    fields = ("target_type", "target_id", "target")
+    readonly_fields = ("target",)
+    extra = 1
+
+    @admin.display(description="Linked to")
+    def target(self, link):
+        # Names the row behind the typed id, so a wrong id is visible before saving again
+        model = TARGET_MODELS.get(link.target_type)
+        if model is None or link.target_id is None:
+            return "-"
+        return model.objects.filter(pk=link.target_id).first() or "missing"
+
 
 @admin.register(SocialPost)
 class SocialPostAdmin(ModelAdmin):
-    pass
+    inlines = [SocialPostLinkInline]
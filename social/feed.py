@@ -0,0 +1,101 @@
+"""
+Keyset-paginated social post feeds.
+
+Pages are ordered by (created_at, post id) descending and continue from an
+opaque cursor holding the last row's key, so a pin or place page is a
+single seek into social_link_feed_idx no matter how deep the reader has
+scrolled. A map viewport page starts from the published registry pins
+inside the viewport (spatial index) and seeks social_link_feed_idx once
+per pin for at most a page of its links: the cost follows the number of
+pins in view, never the size of the post table, and an empty viewport
+costs one spatial probe.
+
+Place feeds only hold the posts linked to the place itself, not those of
+the pins inside it.
+"""
+import base64
+import binascii
+
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+
+from pins.models import PinRegistry
+from .models import SocialPost, SocialPostLink
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def encode_cursor(created_at, post_id):
+    raw = f"{created_at.isoformat()}|{post_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (created_at, post_id) from a cursor; raise ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, post_id = raw.rsplit('|', 1)
+        created_at = parse_datetime(created_at)
+        post_id = int(post_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError('Invalid cursor') from exc
+    if created_at is None:
+        raise ValueError('Invalid cursor')
+    return created_at, post_id
+
+
+def _after(queryset, cursor, id_field):
+    """Restrict an ordered queryset to the rows after a cursor."""
+    if cursor is None:
+        return queryset
+    created_at, post_id = cursor
+    # created_at <= x is the index range; the exclusion only drops the ties already served
+    return (
+        queryset
+        .filter(created_at__lte=created_at)
+        .exclude(created_at=created_at, **{f'{id_field}__gte': post_id})
+    )
+
+
+def target_page(target_type, target_id, cursor=None, limit=DEFAULT_LIMIT):
+    """Return the (post_id, created_at) keys of one page of posts linked to a pin or place."""
+    links = SocialPostLink.objects.filter(target_type=target_type, target_id=target_id, published=True)
+    links = _after(links, cursor, 'post_id')
+    return list(links.order_by('-created_at', '-post_id').values_list('post_id', 'created_at')[:limit])
+
+
+def bbox_page(bbox, cursor=None, limit=DEFAULT_LIMIT):
+    """Return the (post_id, created_at) keys of one page of posts linked to published pins inside a polygon."""
+    after, params = '', []
+    if cursor is not None:
+        after = 'AND (l.created_at, l.post_id) < (%s, %s)'
+        params = list(cursor)
+    with connection.cursor() as db:
+        # Each pin contributes at most a page of its newest links, so the merged page is exact
+        db.execute(
+            f'''
+            SELECT l.post_id, l.created_at
+            FROM {PinRegistry._meta.db_table} AS r
+            CROSS JOIN LATERAL (
+                SELECT l.post_id, l.created_at
+                FROM {SocialPostLink._meta.db_table} AS l
+                WHERE l.target_type = r.category AND l.target_id = r.pin_id AND l.published {after}
+                ORDER BY l.created_at DESC, l.post_id DESC
+                LIMIT %s
+            ) AS l
+            WHERE r.published AND ST_Within(r.point, ST_GeomFromEWKT(%s))
+            GROUP BY l.post_id, l.created_at
+            ORDER BY l.created_at DESC, l.post_id DESC
+            LIMIT %s
+            ''',
+            [*params, limit, bbox.ewkt, limit]
+        )
+        return db.fetchall()
+
+
+def load_posts(keys):
+    """Load the posts of a page in order, with platforms joined and tags prefetched in bulk."""
+    posts = SocialPost.objects.filter(pk__in=[post_id for post_id, _ in keys])
+    posts = {post.pk: post for post in posts.select_related('platform')}
+    return [posts[post_id] for post_id, _ in keys if post_id in posts]
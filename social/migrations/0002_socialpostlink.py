@@ -0,0 +1,174 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+# SocialPost foreign key name -> link target type.
+LINK_FIELDS = {
+    'country': 'country',
+    'state': 'state',
+    'city': 'city',
+    'specialzone': 'specialzone',
+    'mainattraction': 'main-attractions',
+    'thingsToDo': 'things-to-do',
+    'placestovisit': 'places-to-visit',
+    'placesToEat': 'places-to-eat',
+    'market': 'markets',
+    'countryinfo': 'country-info',
+    'DestinationGuide': 'destination-guides',
+    'placeinformation': 'place-information',
+    'travelhacks': 'travel-hacks',
+    'Festivals': 'festivals',
+    'famousphotopoint': 'famous-photo-points',
+    'activites': 'activities',
+    'hotel': 'hotels',
+}
+
+
+def copy_links(apps, schema_editor):
+    SocialPost = apps.get_model('social', 'SocialPost')
+    SocialPostLink = apps.get_model('social', 'SocialPostLink')
+    attnames = [f'{name}_id' for name in LINK_FIELDS]
+    rows = SocialPost.objects.order_by().values_list('pk', 'published', 'created_at', *attnames)
+    SocialPostLink.objects.bulk_create(
+        (
+            SocialPostLink(
+                post_id=pk, target_type=target_type, target_id=target_id,
+                published=published, created_at=created_at
+            )
+            for pk, published, created_at, *target_ids in rows.iterator(chunk_size=1000)
+            for target_type, target_id in zip(LINK_FIELDS.values(), target_ids)
+            if target_id is not None
+        ),
+        batch_size=1000
+    )
+
+
+def restore_links(apps, schema_editor):
+    """
+    Copy the links back into the restored foreign keys. A foreign key holds
+    a single target, so a post linked to several targets of one type keeps
+    the oldest link; every dropped link is reported.
+    """
+    SocialPost = apps.get_model('social', 'SocialPost')
+    SocialPostLink = apps.get_model('social', 'SocialPostLink')
+    for name, target_type in LINK_FIELDS.items():
+        target_model = SocialPost._meta.get_field(name).related_model
+        links = SocialPostLink.objects.filter(
+            target_type=target_type,
+            target_id__in=target_model.objects.values('pk')
+        )
+        SocialPost.objects.filter(pk__in=links.values('post_id')).update(**{
+            f'{name}_id': Subquery(links.filter(post_id=OuterRef('pk')).order_by('pk').values('target_id')[:1])
+        })
+
+        crowded = (
+            links.order_by().values('post_id')
+            .annotate(links=Count('pk')).filter(links__gt=1)
+            .values_list('post_id', 'links')
+        )
+        for post_id, count in crowded:
+            print(f"\n  Post {post_id} keeps 1 of its {count} {target_type} links", end="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SocialPostLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_type', models.CharField(choices=[('country', 'Country'), ('state', 'State'), ('city', 'City'), ('specialzone', 'Specialzone'), ('main-attractions', 'Main Attractions'), ('things-to-do', 'Things To Do'), ('places-to-visit', 'Places To Visit'), ('places-to-eat', 'Places To Eat'), ('markets', 'Markets'), ('country-info', 'Country Info'), ('destination-guides', 'Destination Guides'), ('place-information', 'Place Information'), ('travel-hacks', 'Travel Hacks'), ('festivals', 'Festivals'), ('famous-photo-points', 'Famous Photo Points'), ('activities', 'Activities'), ('hotels', 'Hotels')], max_length=32)),
+                ('target_id', models.BigIntegerField()),
+                ('published', models.BooleanField(default=False, editable=False)),
+                ('created_at', models.DateTimeField(editable=False, null=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='links', to='social.socialpost')),
+            ],
+            options={
+                'db_table': 'social_post_links',
+            },
+        ),
+        migrations.RunPython(copy_links, restore_links),
+        migrations.AddIndex(
+            model_name='socialpostlink',
+            index=models.Index(fields=['target_type', 'target_id', 'published', 'created_at'], name='social_link_target_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='socialpostlink',
+            constraint=models.UniqueConstraint(fields=('post', 'target_type', 'target_id'), name='unique_social_post_link'),
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='DestinationGuide',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='Festivals',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='activites',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='city',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='country',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='countryinfo',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='famousphotopoint',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='hotel',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='mainattraction',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='market',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='placeinformation',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='placesToEat',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='placestovisit',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='specialzone',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='state',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='thingsToDo',
+        ),
+        migrations.RemoveField(
+            model_name='socialpost',
+            name='travelhacks',
+        ),
+    ]
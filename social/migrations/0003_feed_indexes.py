@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0002_socialpostlink'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='socialpostlink',
+            name='social_link_target_idx',
+        ),
+        migrations.AddIndex(
+            model_name='socialpost',
+            index=models.Index(fields=['published', 'created_at', 'id'], name='social_post_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialpostlink',
+            index=models.Index(fields=['target_type', 'target_id', 'published', 'created_at', 'post'], name='social_link_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:54
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import migrations, models
+from django.db.models import OuterRef
+
+
+def _tag_names(TaggedItem, app_label, model_name):
+    return ArraySubquery(
+        TaggedItem.objects
+        .filter(content_type__app_label=app_label, content_type__model=model_name, object_id=OuterRef('pk'))
+        .order_by('tag__name')
+        .values('tag__name')
+    )
+
+
+def fill_tag_names(apps, schema_editor):
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    for model_name in ('SocialPost',):
+        model = apps.get_model('social', model_name)
+        model.objects.update(tag_names=_tag_names(TaggedItem, 'social', model_name.lower()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0003_feed_indexes'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='socialpost',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.RunPython(fill_tag_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='socialpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='social_post_tags_gin'),
+        ),
+    ]
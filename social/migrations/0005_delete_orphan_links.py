@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# Link target type -> (app label, model name)
+TARGET_MODELS = {
+    'country': ('location', 'Country'),
+    'state': ('location', 'State'),
+    'city': ('location', 'City'),
+    'specialzone': ('location', 'Specialzone'),
+    'main-attractions': ('pins', 'MainAttraction'),
+    'things-to-do': ('pins', 'ThingsToDo'),
+    'places-to-visit': ('pins', 'PlacesToVisit'),
+    'places-to-eat': ('pins', 'PlacesToEat'),
+    'markets': ('pins', 'Market'),
+    'country-info': ('pins', 'CountryInfo'),
+    'destination-guides': ('pins', 'DestinationGuide'),
+    'place-information': ('pins', 'PlaceInformation'),
+    'travel-hacks': ('pins', 'TravelHacks'),
+    'festivals': ('pins', 'Festivals'),
+    'famous-photo-points': ('pins', 'FamousPhotoPoint'),
+    'activities': ('pins', 'Activities'),
+    'hotels': ('pins', 'Hotel'),
+}
+
+
+def delete_orphan_links(apps, schema_editor):
+    SocialPostLink = apps.get_model('social', 'SocialPostLink')
+    for target_type, (app_label, model_name) in TARGET_MODELS.items():
+        targets = apps.get_model(app_label, model_name).objects.values('pk')
+        SocialPostLink.objects.filter(target_type=target_type).exclude(target_id__in=targets).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('location', '0002_boundarypiece'),
+        ('pins', '0018_region_pin_counts'),
+        ('social', '0004_tag_names'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_orphan_links, migrations.RunPython.noop),
+    ]
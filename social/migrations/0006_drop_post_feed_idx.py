@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('social', '0005_delete_orphan_links'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='socialpost',
+            name='social_post_feed_idx',
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from taggit.managers import TaggableManager
 from location.models import Country,State,City,Specialzone  
-from pins.models import MainAttraction,ThingsToDo,PlacesToVisit,PlacesToEat,Market,CountryInfo,DestinationGuide,PlaceInformation,TravelHacks,Festivals, FamousPhotoPoint, Activities, Hotel
+from pins.models import PIN_CATEGORIES
 
 class PostPlatform(models.Model):
     """
@@ -42,25 +44,15 @@ class SocialPost(models.Model):
 
     tags = TaggableManager(blank=True)
 
-    published = models.BooleanField(default=False)
+    # Sorted copy of the tag names, kept in sync with taggit (see pins.tagging)
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
 
-    country = models.ForeignKey(Country, on_delete=models.CASCADE, blank=True, null=True)
-    state = models.ForeignKey(State, on_delete=models.CASCADE, blank=True, null=True)
-    city = models.ForeignKey(City, on_delete=models.CASCADE, blank=True, null=True)
-    specialzone = models.ForeignKey(Specialzone, on_delete=models.CASCADE, blank=True, null=True)
-    mainattraction = models.ForeignKey(MainAttraction, on_delete=models.CASCADE, blank=True, null=True)
-    thingsToDo = models.ForeignKey(ThingsToDo, on_delete=models.CASCADE, blank=True, null=True)
-    placestovisit = models.ForeignKey(PlacesToVisit, on_delete=models.CASCADE, blank=True, null=True)
-    placesToEat = models.ForeignKey(PlacesToEat, on_delete=models.CASCADE, blank=True, null=True)
-    market = models.ForeignKey(Market, on_delete=models.CASCADE, blank=True, null=True)
-    countryinfo = models.ForeignKey(CountryInfo, on_delete=models.CASCADE, blank=True, null=True)
-    DestinationGuide = models.ForeignKey(DestinationGuide, on_delete=models.CASCADE, blank=True, null=True)
-    placeinformation = models.ForeignKey(PlaceInformation, on_delete=models.CASCADE, blank=True, null=True)
-    travelhacks = models.ForeignKey(TravelHacks, on_delete=models.CASCADE, blank=True, null=True)
-    Festivals = models.ForeignKey(Festivals, on_delete=models.CASCADE, blank=True, null=True)
-    famousphotopoint = models.ForeignKey(FamousPhotoPoint, on_delete=models.CASCADE, blank=True, null=True)
-    activites = models.ForeignKey(Activities, on_delete=models.CASCADE, blank=True, null=True)
-    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, blank=True, null=True)
+    published = models.BooleanField(default=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -68,6 +60,71 @@ class SocialPost(models.Model):
     class Meta:
         db_table = "social_posts"
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(
+                fields=["tag_names"],
+                name="social_post_tags_gin"
+            )
+        ]
 
     def __str__(self):
         return self.name
+
+
+
+# Kinds of rows a social post can be linked to: places plus every pin category.
+PLACE_TARGETS = {
+    "country": Country,
+    "state": State,
+    "city": City,
+    "specialzone": Specialzone,
+}
+TARGET_MODELS = {**PLACE_TARGETS, **PIN_CATEGORIES}
+
+
+class SocialPostLink(models.Model):
+    """
+    Link between a social post and any pin or place.
+
+    ``published`` and ``created_at`` mirror the post so the posts of a
+    target are read with a single range scan of the target index.
+    """
+
+    post = models.ForeignKey(
+        SocialPost,
+        on_delete=models.CASCADE,
+        related_name="links"
+    )
+
+    target_type = models.CharField(
+        max_length=32,
+        choices=[(key, key.replace("-", " ").title()) for key in TARGET_MODELS]
+    )
+    target_id = models.BigIntegerField()
+
+    published = models.BooleanField(default=False, editable=False)
+    created_at = models.DateTimeField(null=True, editable=False)
+
+    class Meta:
+        db_table = "social_post_links"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "target_type", "target_id"],
+                name="unique_social_post_link"
+            )
+        ]
+        indexes = [
+            # post_id breaks created_at ties, so feeds page through it with keyset cursors
+            models.Index(
+                fields=["target_type", "target_id", "published", "created_at", "post"],
+                name="social_link_feed_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.post} -> {self.target_type}:{self.target_id}"
+
+    def save(self, *args, **kwargs):
+        self.published = self.post.published
+        self.created_at = self.post.created_at
+        super().save(*args, **kwargs)
@@ -20,4 +20,5 @@ class SocialPostSerializer(serializers.ModelSerializer):
         ]
     
     def get_tags(self, obj):
-        return [tag.name for tag in obj.tags.all()]
\ No newline at end of file
+        # Denormalized copy of the taggit names, see pins.tagging
+        return obj.tag_names
\ No newline at end of file
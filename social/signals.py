@@ -0,0 +1,120 @@
+"""Keep link denormalization, tag arrays, pin versions and counts, and city bundles current when social posts change."""
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from taggit.models import Tag, TaggedItem
+
+from pins import bundles, counters, tagging, versioning
+from pins.models import PIN_CATEGORIES
+from pins.signals import field_changed
+from .models import TARGET_MODELS, PostPlatform, SocialPost, SocialPostLink
+
+TARGET_TYPES = {model: target_type for target_type, model in TARGET_MODELS.items()}
+
+
+def touch_targets(targets):
+    """Refresh whatever renders posts for the given (target_type, target_id) pairs."""
+    targets = list(targets)
+    pins = [
+        (PIN_CATEGORIES[target_type], target_id)
+        for target_type, target_id in targets
+        if target_type in PIN_CATEGORIES
+    ]
+    counters.recount(pins)
+    versioning.touch_links(pins)
+    bundles.mark_stale(target_id for target_type, target_id in targets if target_type == 'city')
+
+
+def post_targets(post):
+    return post.links.values_list('target_type', 'target_id')
+
+
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    # Keep the copies used by the target index in line with the post, and
+    # undo a stale in-memory tag array written back by this save
+    instance.links.update(published=instance.published, created_at=instance.created_at)
+    tagging.sync(SocialPost, [instance.pk])
+    touch_targets(post_targets(instance))
+
+
+def platform_saved(sender, instance, created, raw=False, **kwargs):
+    """Posts are rendered with their platform's name, code and website."""
+    if raw or created:
+        return
+    touch_targets(
+        SocialPostLink.objects
+        .filter(post__platform=instance)
+        .values_list('target_type', 'target_id')
+        .distinct()
+    )
+
+
+def posts_retagged(pks):
+    """Refresh the tag arrays of some posts and whatever renders them."""
+    if not pks:
+        return
+    tagging.sync(SocialPost, pks)
+    touch_targets(SocialPostLink.objects.filter(post__in=pks).values_list('target_type', 'target_id'))
+
+
+def post_tags_changed(sender, instance, action, **kwargs):
+    if isinstance(instance, SocialPost) and action.startswith('post_'):
+        posts_retagged([instance.pk])
+        instance.tag_names = SocialPost.objects.values_list('tag_names', flat=True).get(pk=instance.pk)
+
+
+def tag_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    if field_changed(instance, 'name'):
+        posts_retagged(tagging.tagged_rows(instance).get(SocialPost))
+
+
+def tag_deleted(sender, instance, **kwargs):
+    # pins.signals collected the tagged rows before the delete cascaded
+    posts_retagged(getattr(instance, '_tagged_rows', {}).get(SocialPost))
+
+
+def remember_target(sender, instance, raw=False, **kwargs):
+    """Remember the stored target of a link, in case the save moves it."""
+    instance._previous_target = None
+    if raw or not instance.pk:
+        return
+    instance._previous_target = (
+        SocialPostLink.objects
+        .filter(pk=instance.pk)
+        .values_list('target_type', 'target_id')
+        .first()
+    )
+
+
+def link_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    targets = [(instance.target_type, instance.target_id)]
+    if getattr(instance, '_previous_target', None):
+        targets.append(instance._previous_target)
+    touch_targets(targets)
+
+
+def link_deleted(sender, instance, **kwargs):
+    touch_targets([(instance.target_type, instance.target_id)])
+
+
+def target_deleted(sender, instance, **kwargs):
+    """Drop the links of a deleted pin or place (there is no foreign key to cascade them)."""
+    SocialPostLink.objects.filter(target_type=TARGET_TYPES[sender], target_id=instance.pk).delete()
+
+
+post_save.connect(post_saved, sender=SocialPost)
+post_save.connect(platform_saved, sender=PostPlatform)
+m2m_changed.connect(post_tags_changed, sender=TaggedItem)
+post_save.connect(tag_saved, sender=Tag)
+post_delete.connect(tag_deleted, sender=Tag)
+
+pre_save.connect(remember_target, sender=SocialPostLink)
+post_save.connect(link_saved, sender=SocialPostLink)
+post_delete.connect(link_deleted, sender=SocialPostLink)
+
+for model in TARGET_MODELS.values():
+    post_delete.connect(target_deleted, sender=model)
@@ -1,3 +1,117 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from location.models import Country, State, City
+from pins.models import MainAttraction
+from .admin import SocialPostLinkForm
+from .feed import bbox_page, decode_cursor, encode_cursor, target_page
+from .models import SocialPost, SocialPostLink
+
+
+class FeedCursorTests(SimpleTestCase):
+    """Feed cursors round-trip and reject anything malformed."""
+
+    def test_round_trip(self):
+        created_at = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42)), (created_at, 42))
+
+    def test_malformed(self):
+        for cursor in ("", "not base64!", encode_cursor(timezone.now(), 1)[:-4], "MjAyNHwx"):
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+class FeedPageTests(TestCase):
+    """Keyset pages cover every post exactly once, ties on created_at included."""
+
+    @classmethod
+    def setUpTestData(cls):
+        square = Polygon(((77, 28), (78, 28), (78, 29), (77, 29), (77, 28)), srid=4326)
+        cls.country = Country.objects.create(name="India", geometry=square)
+
+        now = timezone.now()
+        # Three posts share a timestamp, so pages must break ties on the post id
+        timestamps = [now, now, now, now - timedelta(hours=1), now - timedelta(hours=2)]
+        for i, created_at in enumerate(timestamps):
+            post = SocialPost.objects.create(name=f"Post {i}", link=f"https://example.com/{i}", published=True)
+            SocialPostLink.objects.create(post=post, target_type="country", target_id=cls.country.pk)
+            SocialPostLink.objects.filter(post=post).update(published=True, created_at=created_at)
+
+    def test_pages_follow_cursors(self):
+        expected = list(
+            SocialPostLink.objects
+            .order_by("-created_at", "-post_id")
+            .values_list("post_id", "created_at")
+        )
+
+        seen, cursor = [], None
+        while True:
+            page = target_page("country", self.country.pk, cursor, limit=2)
+            if not page:
+                break
+            seen.extend(page)
+            cursor = decode_cursor(encode_cursor(page[-1][1], page[-1][0]))
+
+        self.assertEqual(seen, expected)
+
+
+class BboxFeedTests(TestCase):
+    """Viewport feeds hold the posts of the published pins inside the viewport, each once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        square = Polygon(((77, 28), (78, 28), (78, 29), (77, 29), (77, 28)), srid=4326)
+        country = Country.objects.create(name="India", geometry=square)
+        state = State.objects.create(country=country, name="Delhi", geometry=MultiPolygon(square))
+        city = City.objects.create(state=state, name="New Delhi", geometry=square)
+        inside, other_inside, outside = [
+            MainAttraction.objects.create(name=name, city=city, pin=Point(x, 28.5, srid=4326), published=True)
+            for name, x in (("Red Fort", 77.2), ("India Gate", 77.3), ("Taj Mahal", 77.9))
+        ]
+
+        now = timezone.now()
+        cls.expected = []
+        for i, pins in enumerate([[inside, other_inside], [outside], [inside], [other_inside]]):
+            post = SocialPost.objects.create(name=f"Post {i}", link=f"https://example.com/{i}", published=True)
+            for pin in pins:
+                SocialPostLink.objects.create(post=post, target_type="main-attractions", target_id=pin.pk)
+            SocialPostLink.objects.filter(post=post).update(published=True, created_at=now - timedelta(minutes=i))
+            if outside not in pins:
+                cls.expected.append(post.pk)
+
+        cls.viewport = Polygon.from_bbox((77.0, 28.0, 77.5, 29.0))
+        cls.viewport.srid = 4326
+
+    def test_pages_follow_cursors(self):
+        seen, cursor = [], None
+        while True:
+            page = bbox_page(self.viewport, cursor, limit=2)
+            if not page:
+                break
+            seen.extend(post_id for post_id, _ in page)
+            cursor = (page[-1][1], page[-1][0])
+
+        self.assertEqual(seen, self.expected)
+
+    def test_empty_viewport(self):
+        empty = Polygon.from_bbox((10.0, 10.0, 11.0, 11.0))
+        empty.srid = 4326
+        self.assertEqual(bbox_page(empty), [])
+
+
+class LinkFormTests(TestCase):
+    """Admin link rows must point at an existing target."""
+
+    def test_unknown_target_rejected(self):
+        square = Polygon(((77, 28), (78, 28), (78, 29), (77, 29), (77, 28)), srid=4326)
+        country = Country.objects.create(name="India", geometry=square)
+
+        form = SocialPostLinkForm(data={"target_type": "country", "target_id": country.pk + 1})
+        self.assertFalse(form.is_valid())
+        self.assertIn("target_id", form.errors)
+
+        form = SocialPostLinkForm(data={"target_type": "country", "target_id": country.pk})
+        self.assertTrue(form.is_valid())
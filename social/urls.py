@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import get_social_feed
+
+urlpatterns = [
+    path('api/social/feed/', get_social_feed, name='social_feed'),
+]
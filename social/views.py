@@ -1,3 +1,53 @@
-from django.shortcuts import render
+from django.contrib.gis.geos import Polygon
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
 
-# Create your views here.
+from . import feed
+from .models import TARGET_MODELS
+from .serializers import SocialPostSerializer
+
+
+@api_view(['GET'])
+def get_social_feed(request):
+    """Get published social posts, newest first, for a pin or place or a map viewport.
+
+    Filter with ``type`` (a pin category or ``country``, ``state``, ``city``,
+    ``specialzone``) and ``id``, or with ``bbox=min_lon,min_lat,max_lon,max_lat``
+    for posts linked to pins in the viewport. Pass the returned
+    ``next_cursor`` as ``cursor`` to get the next page.
+    """
+    try:
+        limit = min(int(request.GET.get('limit', feed.DEFAULT_LIMIT)), feed.MAX_LIMIT)
+        cursor = request.GET.get('cursor')
+        cursor = feed.decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return Response({'error': 'Invalid limit or cursor'}, status=400)
+    if limit < 1:
+        return Response({'error': 'Invalid limit or cursor'}, status=400)
+
+    target_type = request.GET.get('type')
+    target_id = request.GET.get('id', '')
+    bbox = request.GET.get('bbox')
+
+    # One extra row tells whether another page exists
+    if target_type:
+        if target_type not in TARGET_MODELS or not target_id.isdigit():
+            return Response({'error': 'Invalid type or id'}, status=400)
+        keys = feed.target_page(target_type, int(target_id), cursor, limit + 1)
+    elif bbox:
+        try:
+            bbox = Polygon.from_bbox([float(value) for value in bbox.split(',')])
+        except (TypeError, ValueError):
+            return Response({'error': 'bbox must be min_lon,min_lat,max_lon,max_lat'}, status=400)
+        bbox.srid = 4326
+        keys = feed.bbox_page(bbox, cursor, limit + 1)
+    else:
+        return Response({'error': 'Provide type and id, or bbox'}, status=400)
+
+    has_more = len(keys) > limit
+    keys = keys[:limit]
+
+    return Response({
+        'results': SocialPostSerializer(feed.load_posts(keys), many=True).data,
+        'next_cursor': feed.encode_cursor(*reversed(keys[-1])) if has_more else None
+    })
@@ -0,0 +1,216 @@
+"""
+Precompressed response cache.
+
+Large, highly compressible payloads (pin lists, boundaries, city bundles)
+are compressed once when they are cached and kept as identity, gzip and,
+when the ``brotli`` package is installed, brotli variants. Requests are
+answered with the best variant their ``Accept-Encoding`` allows, so no
+response is compressed on the way out.
+
+List views opt in with ``@precompressed('<namespace>')``: the cache key is
+the request path and query string plus the namespace generation, which
+``bump`` advances after commit whenever the underlying data changes.
+Views with their own version (boundaries, bundles) call ``cached`` and
+``respond`` directly with a key that already carries it.
+
+Every response adds its identity and sent sizes to per-namespace counters
+in the cache; ``python manage.py precompressed_stats`` reports the bytes
+saved.
+
+Generations and counters live in the default cache, so it must be shared
+by every worker process: with a process-local backend a ``bump`` would
+only retire the responses cached by its own process. The ``unfotour.E001``
+system check refuses to start with one.
+"""
+import gzip
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+# Preferred first when the client weighs several encodings equally.
+ENCODINGS = ('br', 'gzip', 'identity')
+
+TIMEOUT = getattr(settings, 'PRECOMPRESSED_CACHE_TIMEOUT', 60 * 60)
+
+# Payloads this small gain nothing from compression.
+MIN_SIZE = 1024
+
+STAT_FIELDS = ('responses', 'identity_bytes', 'sent_bytes')
+
+# Cache backends whose entries are only visible to the process that wrote them.
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get('default', {}).get('BACKEND', PROCESS_LOCAL_BACKENDS[0])
+    if backend not in PROCESS_LOCAL_BACKENDS:
+        return []
+    return [checks.Error(
+        f'The default cache ({backend}) is local to each process.',
+        hint=(
+            'Cache invalidations (precompressed responses, CTA buttons, FAQ generations) would not '
+            'reach the other workers. Configure a shared backend such as Redis or Memcached '
+            '(CACHE_BACKEND / CACHE_LOCATION), or silence unfotour.E001 for single-process runs.'
+        ),
+        id='unfotour.E001',
+    )]
+
+
+def compress(payload, gzip_data=None):
+    """Return {encoding: bytes} for a payload. ``gzip_data`` reuses an existing gzip copy."""
+    variants = {'identity': payload}
+    if len(payload) < MIN_SIZE:
+        return variants
+    variants['gzip'] = gzip_data if gzip_data is not None else gzip.compress(payload, compresslevel=9)
+    if brotli is not None:
+        variants['br'] = brotli.compress(payload, mode=brotli.MODE_TEXT)
+    return variants
+
+
+def _weights(accept_encoding):
+    """Parse an Accept-Encoding header into {coding: q}."""
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def negotiate(accept_encoding, available):
+    """Pick the encoding to send among ``available`` for an Accept-Encoding header."""
+    weights = _weights(accept_encoding or '')
+    default = weights.get('*', 0.0)
+    best, best_q = 'identity', 0.0
+    for encoding in ENCODINGS:
+        if encoding not in available:
+            continue
+        # Unlisted identity stays acceptable, but any listed coding beats it
+        q = weights.get(encoding, 0.001 if encoding == 'identity' else default)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def record(namespace, identity_bytes, sent_bytes):
+    """Add a response to the namespace counters."""
+    for field, value in zip(STAT_FIELDS, (1, identity_bytes, sent_bytes)):
+        key = f'precompressed:stats:{namespace}:{field}'
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            # First response since the counter expired or was evicted
+            if not cache.add(key, value, timeout=None):
+                cache.incr(key, value)
+
+
+def stats(namespace):
+    """Return {responses, identity_bytes, sent_bytes, saved_bytes} of a namespace."""
+    values = cache.get_many([f'precompressed:stats:{namespace}:{field}' for field in STAT_FIELDS])
+    result = {
+        field: values.get(f'precompressed:stats:{namespace}:{field}', 0)
+        for field in STAT_FIELDS
+    }
+    result['saved_bytes'] = result['identity_bytes'] - result['sent_bytes']
+    return result
+
+
+def generation(namespace):
+    return cache.get_or_set(f'precompressed:generation:{namespace}', 0, timeout=None)
+
+
+def bump(namespace):
+    """Invalidate the cached responses of a namespace once the current transaction commits."""
+    def advance():
+        key = f'precompressed:generation:{namespace}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+    transaction.on_commit(advance)
+
+
+def cached(key, build, timeout=TIMEOUT):
+    """
+    Return the cached entry of ``key``, building it on a miss.
+
+    ``build`` returns ``(content_type, payload)`` or ``(content_type, payload,
+    gzip_data)``, or None for nothing to cache.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        built = build()
+        if built is None:
+            return None
+        content_type, payload, *gzip_data = built
+        entry = {'content_type': content_type, 'variants': compress(payload, *gzip_data)}
+        cache.set(key, entry, timeout)
+    return entry
+
+
+def respond(request, entry, namespace, status=200):
+    """Build the response of a cached entry in the encoding the request prefers."""
+    variants = entry['variants']
+    encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING'), variants)
+    response = HttpResponse(variants[encoding], content_type=entry['content_type'], status=status)
+    if encoding != 'identity':
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    record(namespace, len(variants['identity']), len(variants[encoding]))
+    return response
+
+
+def precompressed(namespace, timeout=TIMEOUT):
+    """Cache the successful GET responses of a view as precompressed variants."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+
+            query = '&'.join(sorted(request.GET.urlencode().split('&')))
+            digest = hashlib.sha1(f'{request.path}?{query}'.encode()).hexdigest()
+            key = f'precompressed:{namespace}:{generation(namespace)}:{digest}'
+            uncached = []
+
+            def build():
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render') and not response.is_rendered:
+                    response.render()
+                if response.status_code != 200 or response.streaming or response.has_header('Content-Encoding'):
+                    uncached.append(response)
+                    return None
+                return response['Content-Type'], response.content
+
+            entry = cached(key, build, timeout)
+            if entry is None:
+                return uncached[0]
+            return respond(request, entry, namespace)
+        return wrapper
+    return decorator
@@ -0,0 +1,60 @@
+"""
+Faster JSON rendering for the REST API.
+
+FastJSONRenderer produces the same documents as DRF's JSONRenderer but
+encodes with orjson when it is installed (falling back to the stdlib
+encoder otherwise). Containers, strings, numbers and UUIDs are encoded
+natively; Decimal, datetimes and GEOS geometries (as GeoJSON) go through
+a small hook that keeps DRF's representations.
+
+Views opt in with ``@renderer_classes([FastJSONRenderer, JSONRenderer])``;
+any other view can be switched per request with ``?format=fastjson``.
+"""
+import json
+
+from django.contrib.gis.geos import GEOSGeometry, Point
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """Encode what orjson leaves to us exactly like DRF's JSONEncoder, plus GEOS geometries."""
+    if isinstance(obj, Point):
+        return {'type': 'Point', 'coordinates': list(obj.coords)}
+    if isinstance(obj, GEOSGeometry):
+        return json.loads(obj.json)
+    return _drf_encoder.default(obj)
+
+
+class _FallbackEncoder(JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, GEOSGeometry):
+            return _default(obj)
+        return super().default(obj)
+
+
+class FastJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'fastjson'
+    charset = None
+
+    if orjson is not None:
+        # Datetimes go through _default so they keep DRF's "Z" suffix
+        _options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is not None:
+            return orjson.dumps(data, default=_default, option=self._options)
+        return json.dumps(
+            data, cls=_FallbackEncoder, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+        ).encode()
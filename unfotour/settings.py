@@ -57,6 +57,8 @@ CSRF_TRUSTED_ORIGINS = [
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
+        # Selected with ?format=fastjson; pin endpoints prefer it (see unfotour.renderers)
+        'unfotour.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -66,6 +68,18 @@ REST_FRAMEWORK = {
 
 
 
+# Cache shared by every worker process: response generations and counters,
+# cached CTA buttons and FAQ generations must be seen by all of them.
+# A process-local backend fails the unfotour.E001 system check; single-process
+# runs (tests, runserver) can set CACHE_BACKEND to LocMemCache and silence it.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.redis.RedisCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "redis://127.0.0.1:6379/1"),
+    }
+}
+
+
 # Application definition
 
 INSTALLED_APPS = [
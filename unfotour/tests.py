@@ -0,0 +1,133 @@
+import datetime
+import gzip
+import json
+import uuid
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.contrib.gis.geos import Point, Polygon
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from . import compression, renderers
+from .compression import negotiate, precompressed
+from .renderers import FastJSONRenderer
+
+LOCAL_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+ALL = ("identity", "gzip", "br")
+
+
+class NegotiateTests(SimpleTestCase):
+    """The best available encoding the Accept-Encoding header allows is picked."""
+
+    def test_preferences(self):
+        cases = [
+            ("gzip, br", ALL, "br"),
+            ("gzip", ALL, "gzip"),
+            ("br;q=0.5, gzip;q=0.8", ALL, "gzip"),
+            ("gzip;q=0, br;q=0", ALL, "identity"),
+            ("*", ALL, "br"),
+            ("*;q=0.5, gzip", ALL, "gzip"),
+            ("br", ("identity", "gzip"), "identity"),
+            ("gzip;q=bad", ALL, "identity"),
+            ("", ALL, "identity"),
+            (None, ALL, "identity"),
+        ]
+        for header, available, expected in cases:
+            with self.subTest(header=header, available=available):
+                self.assertEqual(negotiate(header, available), expected)
+
+
+def _counting_view(calls):
+    @precompressed("tests")
+    def view(request):
+        calls.append(request.path)
+        return HttpResponse(b'{"pins": [' + b'"pin",' * 500 + b'"pin"]}', content_type="application/json")
+    return view
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class PrecompressedTests(SimpleTestCase):
+    """Responses are built once per generation and sent in the negotiated encoding."""
+
+    def setUp(self):
+        compression.cache.clear()
+        self.calls = []
+        self.view = _counting_view(self.calls)
+        self.factory = RequestFactory()
+
+    def test_hit_after_miss(self):
+        first = self.view(self.factory.get("/api/all/", {"b": "2", "a": "1"}, HTTP_ACCEPT_ENCODING="gzip"))
+        second = self.view(self.factory.get("/api/all/", {"a": "1", "b": "2"}))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(first["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(first.content), second.content)
+        self.assertFalse(second.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", second["Vary"])
+        self.assertEqual(compression.stats("tests")["responses"], 2)
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class PrecompressedInvalidationTests(TestCase):
+    """bump() retires the cached responses of a namespace once the transaction commits."""
+
+    def test_bump_after_commit(self):
+        compression.cache.clear()
+        calls = []
+        view = _counting_view(calls)
+        request = RequestFactory().get("/api/all/")
+
+        view(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            compression.bump("tests")
+            view(request)
+            self.assertEqual(len(calls), 1)
+
+        view(request)
+        self.assertEqual(len(calls), 2)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """FastJSONRenderer documents match JSONRenderer's, with and without orjson."""
+
+    payload = {
+        "query": "Qutub Mīnār",
+        "results": [
+            {
+                "id": 1,
+                "rating": Decimal("4.25"),
+                "latitude": 28.524578,
+                "tags": ["heritage"],
+                "link": None,
+                "published": True,
+            }
+        ],
+        "created_at": datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+        "opened_on": datetime.date(2026, 1, 2),
+        "opens_at": datetime.time(9, 30),
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        7: "non-string key",
+    }
+
+    def assertSameDocument(self):
+        stock = JSONRenderer().render(self.payload)
+        fast = FastJSONRenderer().render(self.payload)
+        self.assertEqual(json.loads(fast), json.loads(stock))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    @skipIf(renderers.orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        self.assertSameDocument()
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertSameDocument()
+
+    def test_geometries(self):
+        square = Polygon.from_bbox((77, 28, 78, 29))
+        data = json.loads(FastJSONRenderer().render({"point": Point(77.2, 28.6), "area": square}))
+        self.assertEqual(data["point"], {"type": "Point", "coordinates": [77.2, 28.6]})
+        self.assertEqual(data["area"], json.loads(square.json))
@@ -20,5 +20,8 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/account/', include('account.urls')),
+    path('', include('location.urls')),
     path('', include('pins.urls')),
+    path('', include('faq.urls')),
+    path('', include('social.urls')),
 ]